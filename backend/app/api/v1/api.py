@@ -3,7 +3,7 @@ API v1 路由配置
 """
 
 from fastapi import APIRouter
-from app.api.v1.endpoints import patients, anesthesia, qa, tts, videos
+from app.api.v1.endpoints import patients, anesthesia, qa, tts, videos, exports
 
 api_router = APIRouter()
 
@@ -13,3 +13,4 @@ api_router.include_router(anesthesia.router, prefix="/anesthesia", tags=["anesth
 api_router.include_router(qa.router, prefix="/qa", tags=["Q&A"])
 api_router.include_router(tts.router, prefix="/tts", tags=["Text-to-Speech"])
 api_router.include_router(videos.router, prefix="/videos", tags=["Videos"])
+api_router.include_router(exports.router, prefix="/export", tags=["export"])
@@ -2,8 +2,9 @@
 Anesthesia guidelines-related API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from sqlalchemy import select, or_
+from sqlalchemy.orm import Session, load_only
 from typing import List, Optional, Union
 from datetime import date
 
@@ -14,14 +15,48 @@ from app.schemas.anesthesia import (
     AnesthesiaGuidelineCreate, AnesthesiaGuidelineUpdate, AnesthesiaGuidelineResponse,
     AnesthesiaGuidelineTemplateCreate, AnesthesiaGuidelineTemplateUpdate,
     AnesthesiaGuidelineTemplateResponse, GenerateGuidelineRequest,
-    AnesthesiaGuidelineWithPatient, LanguageEnum
+    AnesthesiaGuidelineWithPatient, AnesthesiaGuidelineSummary, AnesthesiaGuidelineGroupResponse,
+    LanguageEnum, GUIDELINE_SUMMARY_FIELDS, GUIDELINE_TRANSLATION_FIELDS
 )
 from app.schemas.patient import PaginatedResponse
 from app.services.anesthesia_service import AnesthesiaGuidelineService
+from app.core.responses import FastJSONResponse, serialize_rows, paginated_content, row_to_dict
+from app.core.compression import precompressed_cache, precompressed_response
 from math import ceil
 
 router = APIRouter()
 
+FIELDS_DESCRIPTION = "Comma-separated columns to return, or 'summary' for list views"
+
+
+def _guideline_projection(fields: Optional[str]) -> Optional[List[str]]:
+    """Resolve the fields= query parameter to a list of guideline columns"""
+    if not fields:
+        return None
+    if fields.strip() == "summary":
+        return GUIDELINE_SUMMARY_FIELDS
+
+    columns = set(AnesthesiaGuideline.__table__.columns.keys())
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in columns]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+
+    # id is always returned so clients can link to the full guideline
+    if "id" not in requested:
+        requested.insert(0, "id")
+    return requested
+
+
+def _project(query, projection: Optional[List[str]]):
+    """Only load the projected columns from the database"""
+    if projection is None:
+        return query
+    return query.options(load_only(*[getattr(AnesthesiaGuideline, name) for name in projection]))
+
 
 @router.post("/guidelines/generate", response_model=Union[AnesthesiaGuidelineResponse, List[AnesthesiaGuidelineResponse]], status_code=status.HTTP_201_CREATED)
 async def generate_guideline(request: GenerateGuidelineRequest, db: Session = Depends(get_db)):
@@ -46,14 +81,21 @@ async def generate_guideline(request: GenerateGuidelineRequest, db: Session = De
         )
 
 
-@router.get("/guidelines", response_model=PaginatedResponse[AnesthesiaGuidelineResponse])
+@router.get(
+    "/guidelines",
+    response_model=Union[PaginatedResponse[AnesthesiaGuidelineResponse], PaginatedResponse[AnesthesiaGuidelineSummary]],
+    response_class=FastJSONResponse
+)
 async def get_guidelines(
     page: int = 1,
     size: int = 100,
     language: Optional[LanguageEnum] = Query(None, description="Filter by language"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
     """Get all anesthesia guidelines with pagination"""
+    projection = _guideline_projection(fields)
+
     # Calculate offset
     skip = (page - 1) * size
 
@@ -66,22 +108,19 @@ async def get_guidelines(
     total = query.count()
 
     # Get guidelines for current page
-    guidelines = query.offset(skip).limit(size).all()
+    guidelines = _project(query, projection).offset(skip).limit(size).all()
 
     # Calculate total pages
     pages = ceil(total / size) if size > 0 else 0
 
-    return PaginatedResponse(
-        items=guidelines,
-        total=total,
-        page=page,
-        size=size,
-        pages=pages
-    )
+    # Rows are serialized directly, skipping per-item model validation
+    items = serialize_rows(guidelines, AnesthesiaGuidelineResponse, projection)
+    return FastJSONResponse(paginated_content(items, total, page, size, pages))
 
 
 @router.get("/guidelines/{guideline_id}", response_model=AnesthesiaGuidelineResponse)
 async def get_guideline(
+    request: Request,
     guideline_id: int, 
     language: Optional[LanguageEnum] = Query(None, description="Language preference"),
     db: Session = Depends(get_db)
@@ -112,7 +151,60 @@ async def get_guideline(
         # Return the original guideline if no language specified
         guideline = original_guideline
 
-    return guideline
+    # Every update bumps the version column, so all workers build the same key;
+    # created_at tells apart a new row that reuses a deleted row's id
+    cache_key = f"guideline:{guideline.id}:{guideline.version}:{guideline.created_at}"
+    render = lambda: FastJSONResponse(serialize_rows([guideline], AnesthesiaGuidelineResponse)[0]).body
+    return precompressed_response(request, precompressed_cache, cache_key, render, "application/json")
+
+
+@router.get("/guidelines/{guideline_id}/group", response_model=AnesthesiaGuidelineGroupResponse)
+async def get_guideline_group(
+    request: Request,
+    guideline_id: int,
+    db: Session = Depends(get_db)
+):
+    """Get every language version of a guideline in one call"""
+    # Single indexed query: the requested row plus all rows sharing its group_id
+    group_id_subquery = select(AnesthesiaGuideline.group_id).where(
+        AnesthesiaGuideline.id == guideline_id
+    ).scalar_subquery()
+    rows = db.query(AnesthesiaGuideline).filter(
+        or_(
+            AnesthesiaGuideline.id == guideline_id,
+            AnesthesiaGuideline.group_id == group_id_subquery
+        )
+    ).all()
+
+    requested = next((row for row in rows if row.id == guideline_id), None)
+    if not requested:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Anesthesia guideline not found"
+        )
+
+    def render() -> bytes:
+        # Keep the newest row per language in case a group was regenerated
+        translations = {}
+        for row in sorted(rows, key=lambda r: r.id):
+            translations[row.language] = row_to_dict(row, GUIDELINE_TRANSLATION_FIELDS)
+        content = {
+            "group_id": requested.group_id,
+            "requested_id": requested.id,
+            "requested_language": requested.language,
+            "patient_id": requested.patient_id,
+            "anesthesia_type": requested.anesthesia_type,
+            "surgery_date": requested.surgery_date,
+            "surgeon_name": requested.surgeon_name,
+            "anesthesiologist_name": requested.anesthesiologist_name,
+            "translations": translations
+        }
+        return FastJSONResponse(content).body
+
+    # The group document is rebuilt only when one of its rows is added, updated or deleted
+    version = ",".join(f"{row.id}.{row.version}.{row.created_at}" for row in sorted(rows, key=lambda r: r.id))
+    cache_key = f"guideline-group:{requested.group_id or requested.id}:{requested.id}:{version}"
+    return precompressed_response(request, precompressed_cache, cache_key, render, "application/json")
 
 
 @router.put("/guidelines/{guideline_id}", response_model=AnesthesiaGuidelineResponse)
@@ -135,6 +227,8 @@ async def update_guideline(
     update_data = guideline_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(guideline, field, value)
+    # Incremented in SQL so concurrent updates from different workers never share a version
+    guideline.version = AnesthesiaGuideline.version + 1
     
     db.commit()
     db.refresh(guideline)
@@ -159,13 +253,20 @@ async def delete_guideline(guideline_id: int, db: Session = Depends(get_db)):
     db.commit()
 
 
-@router.get("/guidelines/patient/{patient_id}", response_model=List[AnesthesiaGuidelineResponse])
+@router.get(
+    "/guidelines/patient/{patient_id}",
+    response_model=Union[List[AnesthesiaGuidelineResponse], List[AnesthesiaGuidelineSummary]],
+    response_class=FastJSONResponse
+)
 async def get_patient_guidelines(
     patient_id: int, 
     language: Optional[LanguageEnum] = Query(None, description="Filter by language"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
     """Get all anesthesia guidelines for a specific patient"""
+    projection = _guideline_projection(fields)
+
     # Check if patient exists
     patient = db.query(Patient).filter(Patient.id == patient_id).first()
     if not patient:
@@ -179,12 +280,12 @@ async def get_patient_guidelines(
     if language:
         query = query.filter(AnesthesiaGuideline.language == language.value)
     
-    guidelines = query.all()
+    guidelines = _project(query, projection).all()
     
-    return guidelines
+    return FastJSONResponse(serialize_rows(guidelines, AnesthesiaGuidelineResponse, projection))
 
 
-@router.get("/guidelines/by-date", response_model=List[AnesthesiaGuidelineResponse])
+@router.get("/guidelines/by-date", response_model=List[AnesthesiaGuidelineResponse], response_class=FastJSONResponse)
 async def get_guidelines_by_date(
     surgery_date: date = Query(..., description="Surgery date"),
     language: Optional[LanguageEnum] = Query(None, description="Filter by language"),
@@ -198,7 +299,7 @@ async def get_guidelines_by_date(
     
     guidelines = query.all()
 
-    return guidelines
+    return FastJSONResponse(serialize_rows(guidelines, AnesthesiaGuidelineResponse))
 
 
 @router.get("/templates", response_model=List[AnesthesiaGuidelineTemplateResponse])
@@ -0,0 +1,43 @@
+"""
+Bulk export API endpoints
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+
+from app.services.export_service import (
+    EXPORT_MODELS, EXPORT_FORMATS, MEDIA_TYPES, DEFAULT_BATCH_SIZE, export_stream
+)
+
+router = APIRouter()
+
+
+@router.get("/{entity}")
+async def export_entity(
+    entity: str,
+    format: str = Query("ndjson", description="ndjson or csv"),
+    updated_since: Optional[datetime] = Query(None, description="Only rows updated at or after this time"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=10000, description="Rows fetched per round trip"),
+):
+    """Stream all rows of an entity as NDJSON or CSV"""
+    if entity not in EXPORT_MODELS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown export entity. Use one of: {', '.join(EXPORT_MODELS)}"
+        )
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format. Use one of: {', '.join(EXPORT_FORMATS)}"
+        )
+
+    # The sync generator is iterated in the thread pool by StreamingResponse
+    filename = f"{entity}.{format}"
+    return StreamingResponse(
+        export_stream(entity, format, batch_size, updated_since),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -2,9 +2,10 @@
 Patient-related API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from sqlalchemy.orm import Session
 from typing import List, Optional
+import io
 
 from app.core.database import get_db
 from app.models.patient import Patient, MedicalHistory, SurgeryRecord
@@ -12,9 +13,14 @@ from app.schemas.patient import (
     PatientCreate, PatientUpdate, PatientResponse, PatientDetailResponse,
     PatientSearchRequest, MedicalHistoryCreate, MedicalHistoryUpdate,
     MedicalHistoryResponse, SurgeryRecordCreate, SurgeryRecordUpdate,
-    SurgeryRecordResponse, PaginatedResponse, LanguageEnum
+    SurgeryRecordResponse, PaginatedResponse, LanguageEnum, PatientImportResult
 )
 from app.services.medical_multilingual_service import medical_multilingual_service
+from app.services.patient_search_service import search_patients_by_name
+from app.services.patient_import_service import (
+    SUPPORTED_FORMATS, DEFAULT_BATCH_SIZE, detect_format, iter_records, import_patients
+)
+from app.core.responses import FastJSONResponse, serialize_rows, paginated_content
 from math import ceil
 
 router = APIRouter()
@@ -42,7 +48,33 @@ async def create_patient(patient: PatientCreate, db: Session = Depends(get_db)):
     return db_patient
 
 
-@router.get("/", response_model=PaginatedResponse[PatientResponse])
+@router.post("/import", response_model=PatientImportResult)
+def import_patients_bulk(
+    file: UploadFile = File(..., description="CSV or NDJSON file of patients"),
+    format: Optional[str] = Query(None, description="csv or ndjson (detected from the file name if omitted)"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=10000, description="Rows per insert batch"),
+    db: Session = Depends(get_db)
+):
+    """Bulk import patients from a streamed CSV or NDJSON upload"""
+    # Sync handler: parsing and inserts run in the thread pool, not on the event loop
+    import_format = format or detect_format(file.filename)
+    if import_format not in SUPPORTED_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported import format. Use one of: {', '.join(SUPPORTED_FORMATS)}"
+        )
+
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = import_patients(db, iter_records(stream, import_format), batch_size=batch_size)
+    finally:
+        # Leave the underlying upload file to FastAPI
+        stream.detach()
+
+    return report.to_dict()
+
+
+@router.get("/", response_model=PaginatedResponse[PatientResponse], response_class=FastJSONResponse)
 async def get_patients(page: int = 1, size: int = 100, db: Session = Depends(get_db)):
     """Get all patients with pagination"""
     # Calculate offset
@@ -57,13 +89,9 @@ async def get_patients(page: int = 1, size: int = 100, db: Session = Depends(get
     # Calculate total pages
     pages = ceil(total / size) if size > 0 else 0
 
-    return PaginatedResponse(
-        items=patients,
-        total=total,
-        page=page,
-        size=size,
-        pages=pages
-    )
+    # Rows are serialized directly, skipping per-item model validation
+    items = serialize_rows(patients, PatientResponse)
+    return FastJSONResponse(paginated_content(items, total, page, size, pages))
 
 
 @router.get("/{patient_id}", response_model=PatientDetailResponse)
@@ -181,6 +209,17 @@ async def search_patient(search_request: PatientSearchRequest, db: Session = Dep
     )
 
 
+@router.get("/search/name", response_model=List[PatientResponse])
+async def search_patients_name(
+    q: str = Query(..., min_length=1, max_length=100, description="Full or partial patient name"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
+    db: Session = Depends(get_db)
+):
+    """Fuzzy patient name search (prefix, accent-insensitive, typo-tolerant), best match first"""
+    patients = search_patients_by_name(db, q, limit)
+    return FastJSONResponse(serialize_rows(patients, PatientResponse))
+
+
 @router.get("/{patient_id}/medical-history", response_model=MedicalHistoryResponse)
 async def get_patient_medical_history(
     patient_id: int, 
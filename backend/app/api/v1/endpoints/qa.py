@@ -3,10 +3,17 @@
 基于 RAG 的麻醉知识问答
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Header, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
-from app.services.rag_service import get_rag_system
+from typing import List, Literal, Optional
+import hmac
+import json
+from app.utils.common_questions import COMMON_QUESTIONS
+from app.core.config import settings
+from app.services.rag_service import (
+    get_rag_system, is_rag_ready, get_rag_status, start_rag_warmup, reingest_knowledge, chat_sessions
+)
 
 router = APIRouter()
 
@@ -14,6 +21,23 @@ router = APIRouter()
 class QuestionRequest(BaseModel):
     question: str
     language: str = "en"  # en, zh-TW, es, fr
+    # vector, bm25 or hybrid; defaults to RAG_RETRIEVAL_MODE
+    retrieval_mode: Optional[Literal["vector", "bm25", "hybrid"]] = None
+    # chat session: "" starts a new one, then send back the returned session_id
+    session_id: Optional[str] = None
+
+
+class BatchQuestion(BaseModel):
+    question: str
+    language: Optional[str] = None  # defaults to the batch language
+
+
+class BatchQuestionRequest(BaseModel):
+    questions: List[BatchQuestion]
+    language: str = "en"
+    retrieval_mode: Optional[Literal["vector", "bm25", "hybrid"]] = None
+    # concurrent LLM generations; capped at RAG_BATCH_CONCURRENCY
+    concurrency: Optional[int] = None
 
 
 class QuestionResponse(BaseModel):
@@ -22,112 +46,223 @@ class QuestionResponse(BaseModel):
     category: str
     confidence: str
     suggested_action: str
+    session_id: Optional[str] = None
+
+
+# 根据语言返回建议
+LANG_SUGGESTIONS = {
+    "en": {
+        "doctor": "Please discuss this with your anesthesiologist",
+        "ai": "This question has been answered by AI"
+    },
+    "es": {
+        "doctor": "Por favor, consulte con su anestesiólogo",
+        "ai": "Esta pregunta ha sido respondida por IA"
+    },
+    "fr": {
+        "doctor": "Veuillez en discuter avec votre anesthésiste",
+        "ai": "Cette question a été répondue par l'IA"
+    },
+    "zh-TW": {
+        "doctor": "請與麻醉醫師討論此問題",
+        "ai": "此問題已由AI回答"
+    }
+}
+
+
+def get_suggested_action(language: str, needs_doctor: bool) -> str:
+    """根据语言返回建议"""
+    suggestions = LANG_SUGGESTIONS.get(language, LANG_SUGGESTIONS["en"])
+    return suggestions["doctor"] if needs_doctor else suggestions["ai"]
+
+
+# RAG 尚未就绪时的快速回复
+WARMING_UP_MESSAGES = {
+    "en": "The assistant is still starting up. Please try again in a moment, or ask your anesthesiologist.",
+    "es": "El asistente se está iniciando. Inténtelo de nuevo en un momento o consulte a su anestesiólogo.",
+    "fr": "L'assistant est en cours de démarrage. Veuillez réessayer dans un instant ou consulter votre anesthésiste.",
+    "zh-TW": "助理正在啟動中，請稍後再試，或直接詢問您的麻醉醫師。",
+}
 
 
 @router.post("/ask", response_model=QuestionResponse)
 async def ask_question(request: QuestionRequest):
     """患者提问接口 - 支持多语言"""
+    if not is_rag_ready():
+        # 不在请求中同步初始化，确保预热在后台进行
+        start_rag_warmup()
+        return QuestionResponse(
+            answer=WARMING_UP_MESSAGES.get(request.language, WARMING_UP_MESSAGES["en"]),
+            needs_doctor=True,
+            category="unavailable",
+            confidence="low",
+            suggested_action=get_suggested_action(request.language, True)
+        )
+
     try:
         rag = get_rag_system()
-        result = rag.answer_question(
+        result = await rag.aanswer_question(
             question=request.question,
-            language=request.language
+            language=request.language,
+            retrieval_mode=request.retrieval_mode,
+            session_id=request.session_id
         )
 
-        # 根据语言返回建议
-        lang_suggestions = {
-            "en": {
-                "doctor": "Please discuss this with your anesthesiologist",
-                "ai": "This question has been answered by AI"
-            },
-            "es": {
-                "doctor": "Por favor, consulte con su anestesiólogo",
-                "ai": "Esta pregunta ha sido respondida por IA"
-            },
-            "fr": {
-                "doctor": "Veuillez en discuter avec votre anesthésiste",
-                "ai": "Cette question a été répondue par l'IA"
-            },
-            "zh-TW": {
-                "doctor": "請與麻醉醫師討論此問題",
-                "ai": "此問題已由AI回答"
-            }
-        }
-
-        suggestions = lang_suggestions.get(request.language, lang_suggestions["en"])
-        suggested_action = suggestions["doctor"] if result["needs_doctor"] else suggestions["ai"]
+        suggested_action = get_suggested_action(request.language, result["needs_doctor"])
 
         return QuestionResponse(
             answer=result["answer"],
             needs_doctor=result["needs_doctor"],
             category=result["category"],
             confidence=result["confidence"],
-            suggested_action=suggested_action
+            suggested_action=suggested_action,
+            session_id=result.get("session_id")
         )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def format_sse(event: dict) -> str:
+    """编码为 Server-Sent Events 格式"""
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'], ensure_ascii=False)}\n\n"
+
+
+@router.post("/ask/stream")
+async def ask_question_stream(request: QuestionRequest):
+    """
+    流式问答接口 (Server-Sent Events)
+
+    事件顺序: meta (category, needs_doctor, confidence, source_documents, suggested_action,
+    使用会话时的 session_id) -> 多个 token -> done；出错时发送 error
+    """
+    async def event_stream():
+        if not is_rag_ready():
+            start_rag_warmup()
+            message = WARMING_UP_MESSAGES.get(request.language, WARMING_UP_MESSAGES["en"])
+            yield format_sse({"event": "meta", "data": {
+                "needs_doctor": True,
+                "category": "unavailable",
+                "confidence": "low",
+                "source_documents": 0,
+                "suggested_action": get_suggested_action(request.language, True)
+            }})
+            yield format_sse({"event": "token", "data": {"text": message}})
+            yield format_sse({"event": "done", "data": {}})
+            return
+
+        rag = get_rag_system()
+        async for event in rag.astream_answer(
+            request.question, request.language, request.retrieval_mode, request.session_id
+        ):
+            if event["event"] == "meta":
+                event["data"]["suggested_action"] = get_suggested_action(
+                    request.language, event["data"]["needs_doctor"]
+                )
+            yield format_sse(event)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/ask/batch")
+async def ask_questions_batch(request: BatchQuestionRequest):
+    """
+    批量问答接口 (NDJSON)
+
+    所有问题的嵌入一次计算、检索一次矩阵运算，LLM 生成有并发上限。
+    每行一个 JSON：按完成顺序返回 type=result（index、source、回答字段、suggested_action、
+    timing），最后一行为 type=summary
+    """
+    if not request.questions:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No questions provided")
+    if len(request.questions) > settings.RAG_BATCH_MAX_QUESTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.RAG_BATCH_MAX_QUESTIONS} questions per batch"
+        )
+    if not is_rag_ready():
+        start_rag_warmup()
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="RAG system is still initializing")
+
+    items = [(item.question, item.language or request.language) for item in request.questions]
+    concurrency = min(request.concurrency or settings.RAG_BATCH_CONCURRENCY, settings.RAG_BATCH_CONCURRENCY)
+
+    async def ndjson_stream():
+        rag = get_rag_system()
+        async for line in rag.abatch_answer(items, request.retrieval_mode, concurrency):
+            if line["type"] == "result":
+                line["suggested_action"] = get_suggested_action(line["language"], line["needs_doctor"])
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(
+        ndjson_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.delete("/sessions/{session_id}")
+async def end_session(session_id: str):
+    """结束聊天会话，释放对话历史"""
+    if not chat_sessions.end(session_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+    return {"ended": session_id}
+
+
 @router.get("/common-questions")
 async def get_common_questions(language: str = "en"):
     """获取常见问题列表"""
+    return {"questions": COMMON_QUESTIONS.get(language, COMMON_QUESTIONS["en"])}
 
-    questions = {
-        "en": [
-            "Is general anesthesia safe?",
-            "Will I wake up during surgery?",
-            "What are the side effects of anesthesia?",
-            "How long should I fast before surgery?",
-            "How long does it take to wake up?",
-            "Will anesthesia affect my memory?",
-            "Can I have anesthesia if I have allergies?",
-            "What's the difference between spinal and epidural?",
-            "Will I feel pain during surgery?",
-            "What happens in the recovery room?"
-        ],
-        "es": [
-            "¿Es segura la anestesia general?",
-            "¿Me despertaré durante la cirugía?",
-            "¿Cuáles son los efectos secundarios?",
-            "¿Cuánto tiempo debo ayunar?",
-            "¿Cuánto tiempo tarda en despertar?",
-            "¿Qué es la anestesia espinal?",
-            "¿Puedo tener anestesia si tengo alergias?",
-            "¿Sentiré dolor durante la cirugía?"
-        ],
-        "fr": [
-            "L'anesthésie générale est-elle sûre?",
-            "Vais-je me réveiller pendant la chirurgie?",
-            "Quels sont les effets secondaires?",
-            "Combien de temps dois-je jeûner?",
-            "Combien de temps faut-il pour se réveiller?",
-            "L'anesthésie affectera-t-elle ma mémoire?"
-        ],
-        "zh-TW": [
-            "全身麻醉安全嗎？",
-            "我會在手術中醒來嗎？",
-            "麻醉後會有什麼副作用？",
-            "麻醉前需要禁食多久？",
-            "醒來需要多長時間？",
-            "麻醉會影響記憶嗎？",
-            "脊髓麻醉和硬膜外麻醉有什麼區別？",
-            "什麼情況下不能使用全身麻醉？"
-        ]
-    }
 
-    return {"questions": questions.get(language, questions["en"])}
+@router.post("/admin/reingest")
+async def reingest(x_admin_token: Optional[str] = Header(None)):
+    """
+    重新导入知识库（内置知识库 + 知识目录中的 .md/.txt），不需要重启
+
+    只嵌入新增或变更的片段，删除已移除的片段
+    """
+    if not settings.RAG_ADMIN_TOKEN:
+        # 未配置管理令牌时不开放管理接口
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(
+        x_admin_token.encode("utf-8"), settings.RAG_ADMIN_TOKEN.encode("utf-8")
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+    if not is_rag_ready():
+        start_rag_warmup()
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="RAG system is still initializing")
+
+    try:
+        return await reingest_knowledge()
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
 
 
 @router.get("/health")
 async def health_check():
-    """健康检查"""
+    """健康检查（不会触发同步初始化）"""
     try:
+        status = get_rag_status()
+        if not is_rag_ready():
+            start_rag_warmup()
+            return {
+                "status": "unhealthy" if status["state"] in ("failed", "degraded") else "initializing",
+                "warmup": status
+            }
+
         rag = get_rag_system()
         return {
             "status": "healthy",
             "vectorstore_en": rag.vectorstore_en is not None,
-            "llm_available": rag.llm is not None
+            "loaded_languages": sorted(rag.language_indexes),
+            "chat_sessions": chat_sessions.stats(),
+            "llm_available": rag.llm is not None,
+            "warmup": status
         }
     except Exception as e:
         return {
@@ -3,8 +3,7 @@
 支持视频上传、字幕生成、翻译等功能
 """
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
@@ -12,8 +11,10 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.models.video import Video, Subtitle, Translation
 from app.utils.subtitle_generator import generate_webvtt, generate_srt
+from app.core.compression import precompressed_cache, precompressed_response
+from app.services.subtitle_translation_jobs import subtitle_translation_jobs
+from app.services.translation_service import SUPPORTED_LANGUAGES
 import os
-import tempfile
 import shutil
 
 router = APIRouter()
@@ -206,7 +207,7 @@ async def create_subtitle(request: SubtitleRequest):
 
 
 @router.get("/{video_id}/subtitles/download")
-async def download_subtitles(video_id: int, format: str = "vtt", language: str = "ja"):
+async def download_subtitles(request: Request, video_id: int, format: str = "vtt", language: str = "ja"):
     """
     下载字幕文件（VTT 或 SRT 格式）
     """
@@ -219,66 +220,80 @@ async def download_subtitles(video_id: int, format: str = "vtt", language: str =
         ]
 
         # Generate subtitle file
-        temp_dir = tempfile.gettempdir()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
         if format == "vtt":
-            filename = f"subtitles_{language}_{timestamp}.vtt"
-            file_path = os.path.join(temp_dir, filename)
-            generate_webvtt(subtitles, file_path)
+            filename = f"subtitles_{video_id}_{language}.vtt"
+            render = lambda: generate_webvtt(subtitles).encode("utf-8")
             media_type = "text/vtt"
         else:  # srt
-            filename = f"subtitles_{language}_{timestamp}.srt"
-            file_path = os.path.join(temp_dir, filename)
-            generate_srt(subtitles, file_path)
+            filename = f"subtitles_{video_id}_{language}.srt"
+            render = lambda: generate_srt(subtitles).encode("utf-8")
             media_type = "text/plain"
 
-        return FileResponse(
-            path=file_path,
-            media_type=media_type,
-            filename=filename
+        # 字幕内容是固定的示例数据，压缩结果按视频、语言和格式缓存复用
+        cache_key = f"subtitles:{video_id}:{language}:{format}"
+        return precompressed_response(
+            request, precompressed_cache, cache_key, render, media_type, filename=filename
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to download subtitles: {str(e)}")
 
 
-@router.post("/{video_id}/translate")
-async def translate_subtitles(video_id: int, target_language: str):
+@router.post("/{video_id}/translate", status_code=202)
+async def translate_subtitles(
+    video_id: int,
+    target_language: str,
+    retranslate: bool = False,
+    db: Session = Depends(get_db)
+):
     """
-    翻译视频字幕到目标语言
+    翻译视频字幕到目标语言（后台任务）
+
+    立即返回任务信息，用 GET /{video_id}/translate/{job_id} 查询进度。
+    默认从最后一个已翻译的字幕序号继续；retranslate=true 为全部字幕生成新版本
     """
-    try:
-        # Mock translation
-        translations = [
-            {
-                "id": 1,
-                "subtitle_id": 1,
-                "original_text": "全身麻酔は非常に安全な医療処置です。",
-                "translated_text": "General anesthesia is a very safe medical procedure.",
-                "target_language": target_language,
-                "status": "completed"
-            },
-            {
-                "id": 2,
-                "subtitle_id": 2,
-                "original_text": "手術中は完全に意識がなくなり、痛みを感じることはありません。",
-                "translated_text": "During surgery, you will be completely unconscious and will not feel any pain.",
-                "target_language": target_language,
-                "status": "completed"
-            }
-        ]
+    if target_language not in SUPPORTED_LANGUAGES:
+        raise HTTPException(status_code=400, detail=f"Unsupported target language: {target_language}")
+    if db.query(Video.id).filter(Video.id == video_id).first() is None:
+        raise HTTPException(status_code=404, detail=f"Video {video_id} not found")
 
+    try:
+        job = subtitle_translation_jobs.start(video_id, target_language, retranslate)
         return {
             "success": True,
-            "video_id": video_id,
-            "target_language": target_language,
-            "translations": translations,
-            "total": len(translations)
+            "job": job.to_dict()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
 
 
+@router.get("/{video_id}/translate")
+async def list_translation_jobs(video_id: int):
+    """
+    列出视频的字幕翻译任务
+    """
+    jobs = [job.to_dict() for job in subtitle_translation_jobs.list_jobs(video_id)]
+    return {
+        "success": True,
+        "video_id": video_id,
+        "jobs": jobs,
+        "total": len(jobs)
+    }
+
+
+@router.get("/{video_id}/translate/{job_id}")
+async def get_translation_job(video_id: int, job_id: str):
+    """
+    查询字幕翻译任务进度
+    """
+    job = subtitle_translation_jobs.get(job_id)
+    if job is None or job.video_id != video_id:
+        raise HTTPException(status_code=404, detail=f"Translation job {job_id} not found")
+    return {
+        "success": True,
+        "job": job.to_dict()
+    }
+
+
 @router.get("/{video_id}/info")
 async def get_video_info(video_id: int):
     """
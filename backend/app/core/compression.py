@@ -0,0 +1,279 @@
+"""
+Response compression
+gzip/brotli middleware with a minimum-size threshold, plus a cache of
+precompressed bodies for immutable artifacts
+"""
+
+import gzip
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Media types that are already compressed or must reach the client unbuffered
+DEFAULT_EXCLUDED_MEDIA_TYPES = (
+    "text/event-stream",
+    "image/",
+    "video/",
+    "audio/",
+    "application/zip",
+    "application/gzip",
+)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def compress_bytes(data: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 5) -> bytes:
+    """Compress a complete body"""
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=gzip_level)
+
+
+class _StreamCompressor:
+    """Incremental compressor that flushes after every chunk"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """
+    gzip/brotli compression middleware
+
+    Small bodies (below minimum_size) are sent as-is. Streaming responses are
+    compressed chunk by chunk and flushed so clients receive data as it is
+    produced. Responses that already carry a Content-Encoding (for example
+    precompressed artifacts) are passed through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        excluded_media_types: Sequence[str] = DEFAULT_EXCLUDED_MEDIA_TYPES
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.excluded_media_types = tuple(excluded_media_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Per-request state for CompressionMiddleware"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream_send = send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_StreamCompressor] = None
+        self.passthrough = False
+
+    def _should_skip(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return True
+        media_type = headers.get("content-type", "")
+        return media_type.startswith(self.middleware.excluded_media_types)
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Hold the headers until the first body chunk tells us the size
+            self.start_message = message
+            self.passthrough = self._should_skip(Headers(raw=message["headers"]))
+            return
+
+        if message_type != "http.response.body":
+            await self.downstream_send(message)
+            return
+
+        if self.passthrough:
+            if self.start_message is not None:
+                await self.downstream_send(self.start_message)
+                self.start_message = None
+            await self.downstream_send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start_message = self.start_message
+            self.start_message = None
+            headers = MutableHeaders(raw=start_message["headers"])
+
+            if not more_body:
+                # Complete body in a single message
+                if len(body) < self.middleware.minimum_size:
+                    await self.downstream_send(start_message)
+                    await self.downstream_send(message)
+                    return
+                body = compress_bytes(
+                    body, self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+                )
+                headers["Content-Encoding"] = self.encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                await self.downstream_send(start_message)
+                await self.downstream_send({"type": "http.response.body", "body": body})
+                return
+
+            # Streaming body: size is unknown, compress incrementally
+            self.compressor = _StreamCompressor(
+                self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+            )
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            await self.downstream_send(start_message)
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self.downstream_send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+
+class PrecompressedCache:
+    """
+    LRU cache of rendered artifacts and their compressed variants
+
+    Entries are keyed by the caller; the key must change whenever the
+    artifact content changes (e.g. include an updated_at or version).
+    """
+
+    def __init__(self, max_entries: int = 256, gzip_level: int = 9, brotli_quality: int = 11):
+        self.max_entries = max_entries
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, render: Callable[[], bytes], encoding: Optional[str]) -> Dict[str, Any]:
+        """Return {"body", "etag"} for the requested encoding, rendering on a miss"""
+        variant = encoding or "identity"
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if variant in entry:
+                    return {"body": entry[variant], "etag": entry["etag"]}
+
+        if entry is None:
+            identity = render()
+            entry = {
+                "identity": identity,
+                "etag": '"' + hashlib.sha1(identity).hexdigest() + '"',
+            }
+        if variant not in entry:
+            # Immutable artifacts are compressed once at maximum ratio
+            entry[variant] = compress_bytes(entry["identity"], variant, self.gzip_level, self.brotli_quality)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return {"body": entry[variant], "etag": entry["etag"]}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def precompressed_response(
+    request: Request,
+    cache: PrecompressedCache,
+    key: str,
+    render: Callable[[], bytes],
+    media_type: str,
+    filename: Optional[str] = None
+) -> Response:
+    """Serve an immutable artifact from the precompressed cache"""
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+    cached = cache.get(key, render, encoding)
+
+    headers = {"ETag": cached["etag"], "Vary": "Accept-Encoding"}
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    if request.headers.get("if-none-match") == cached["etag"]:
+        return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=cached["body"], media_type=media_type, headers=headers)
+
+
+def _build_shared_cache() -> PrecompressedCache:
+    from app.core.config import settings
+    return PrecompressedCache(max_entries=settings.PRECOMPRESSED_CACHE_SIZE)
+
+
+# Shared cache for subtitle exports and guideline documents
+precompressed_cache = _build_shared_cache()
@@ -43,6 +43,58 @@ class Settings(BaseSettings):
     USE_LOCAL_LLM: bool = config("USE_LOCAL_LLM", default=False, cast=bool)
     OLLAMA_URL: str = config("OLLAMA_URL", default="http://localhost:11434")
     OLLAMA_MODEL: str = config("OLLAMA_MODEL", default="qwen2.5:7b")
+    # Subtitle translation memory: minimum similarity for a fuzzy suggestion (1.0 = none).
+    # Only segments with the same words are reused automatically; fuzzy matches need review.
+    TRANSLATION_MEMORY_THRESHOLD: float = config("TRANSLATION_MEMORY_THRESHOLD", default=0.92, cast=float)
+    # Batched subtitle translation: source tokens and segments per prompt
+    TRANSLATION_BATCH_TOKENS: int = config("TRANSLATION_BATCH_TOKENS", default=800, cast=int)
+    TRANSLATION_BATCH_SIZE: int = config("TRANSLATION_BATCH_SIZE", default=40, cast=int)
+    # Background subtitle translation jobs: jobs running at once, batches in flight per job
+    TRANSLATION_MAX_JOBS: int = config("TRANSLATION_MAX_JOBS", default=1, cast=int)
+    TRANSLATION_JOB_CONCURRENCY: int = config("TRANSLATION_JOB_CONCURRENCY", default=2, cast=int)
+
+    # RAG settings
+    RAG_WARMUP_ON_STARTUP: bool = config("RAG_WARMUP_ON_STARTUP", default=True, cast=bool)
+    RAG_MAX_CONCURRENCY: int = config("RAG_MAX_CONCURRENCY", default=4, cast=int)
+    RAG_LLM_MODEL: str = config("RAG_LLM_MODEL", default="llama3:8b")
+    # ollama (small dedicated model such as nomic-embed-text), huggingface (pure CPU, local)
+    # or hashing (model-free, for offline evaluation)
+    RAG_EMBEDDING_BACKEND: str = config("RAG_EMBEDDING_BACKEND", default="ollama")
+    RAG_EMBEDDING_MODEL: str = config("RAG_EMBEDDING_MODEL", default="")
+    RAG_EMBEDDING_CACHE: bool = config("RAG_EMBEDDING_CACHE", default=True, cast=bool)
+    # numpy (in-memory, memory-mapped .npy) or chroma
+    RAG_VECTOR_BACKEND: str = config("RAG_VECTOR_BACKEND", default="numpy")
+    # vector, bm25 or hybrid (BM25 + vector fused with reciprocal rank fusion)
+    RAG_RETRIEVAL_MODE: str = config("RAG_RETRIEVAL_MODE", default="hybrid")
+    # Candidates retrieved per question, reranked and packed into this many prompt tokens
+    RAG_CONTEXT_CANDIDATES: int = config("RAG_CONTEXT_CANDIDATES", default=6, cast=int)
+    RAG_CONTEXT_TOKENS: int = config("RAG_CONTEXT_TOKENS", default=256, cast=int)
+    # Semantic answer cache (0 entries disables it)
+    RAG_ANSWER_CACHE_SIZE: int = config("RAG_ANSWER_CACHE_SIZE", default=1024, cast=int)
+    RAG_ANSWER_CACHE_TTL: int = config("RAG_ANSWER_CACHE_TTL", default=86400, cast=int)
+    RAG_ANSWER_CACHE_THRESHOLD: float = config("RAG_ANSWER_CACHE_THRESHOLD", default=0.95, cast=float)
+    # Extra knowledge documents (.md/.txt); defaults to <repo>/data/knowledge
+    RAG_KNOWLEDGE_DIR: str = config("RAG_KNOWLEDGE_DIR", default="")
+    # Languages with their own translated knowledge store (scripts/translate_knowledge.py)
+    # Comma-separated; kept as str because pydantic-settings would JSON-decode a List[str] from the env
+    RAG_KNOWLEDGE_LANGUAGES: str = config("RAG_KNOWLEDGE_LANGUAGES", default="zh-TW,fr,es")
+    # Required as X-Admin-Token on admin endpoints; admin endpoints are disabled when empty
+    RAG_ADMIN_TOKEN: str = config("RAG_ADMIN_TOKEN", default="")
+    # Regenerate stale common-question answers in the background after warm-up
+    RAG_PRECOMPUTE_COMMON_ANSWERS: bool = config("RAG_PRECOMPUTE_COMMON_ANSWERS", default=True, cast=bool)
+    # Chat sessions: open sessions kept in memory, idle timeout, history tokens kept per session
+    RAG_CHAT_MAX_SESSIONS: int = config("RAG_CHAT_MAX_SESSIONS", default=5000, cast=int)
+    RAG_CHAT_SESSION_TTL: int = config("RAG_CHAT_SESSION_TTL", default=1800, cast=int)
+    RAG_CHAT_HISTORY_TOKENS: int = config("RAG_CHAT_HISTORY_TOKENS", default=300, cast=int)
+    # Batch QA: concurrent LLM generations per batch and questions per request
+    RAG_BATCH_CONCURRENCY: int = config("RAG_BATCH_CONCURRENCY", default=2, cast=int)
+    RAG_BATCH_MAX_QUESTIONS: int = config("RAG_BATCH_MAX_QUESTIONS", default=100, cast=int)
+
+    # Compression settings
+    COMPRESSION_MINIMUM_SIZE: int = config("COMPRESSION_MINIMUM_SIZE", default=500, cast=int)
+    COMPRESSION_GZIP_LEVEL: int = config("COMPRESSION_GZIP_LEVEL", default=6, cast=int)
+    COMPRESSION_BROTLI_QUALITY: int = config("COMPRESSION_BROTLI_QUALITY", default=5, cast=int)
+    PRECOMPRESSED_CACHE_SIZE: int = config("PRECOMPRESSED_CACHE_SIZE", default=256, cast=int)
 
     # Redis settings
     REDIS_URL: str = config("REDIS_URL", default="redis://localhost:6379/0")
@@ -50,6 +102,11 @@ class Settings(BaseSettings):
     # Logging settings
     LOG_LEVEL: str = config("LOG_LEVEL", default="INFO")
 
+    @property
+    def knowledge_languages(self) -> List[str]:
+        """RAG_KNOWLEDGE_LANGUAGES as a list"""
+        return [language.strip() for language in self.RAG_KNOWLEDGE_LANGUAGES.split(",") if language.strip()]
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,64 @@
+"""
+Fast JSON response helpers for large list endpoints
+"""
+
+from typing import Any, Iterable, List, Optional, Sequence, Type
+from enum import Enum
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (falls back to the standard encoder)"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return super().render(jsonable_encoder(content))
+
+
+def response_fields(schema: Type[BaseModel]) -> List[str]:
+    """Field names exposed by a response schema"""
+    return list(schema.model_fields.keys())
+
+
+def row_to_dict(row: Any, fields: Sequence[str]) -> dict:
+    """Copy the given attributes of an ORM row into a plain dict"""
+    data = {}
+    for field in fields:
+        value = getattr(row, field, None)
+        if isinstance(value, Enum):
+            value = value.value
+        data[field] = value
+    return data
+
+
+def serialize_rows(rows: Iterable[Any], schema: Type[BaseModel], fields: Optional[Sequence[str]] = None) -> List[dict]:
+    """
+    Serialize ORM rows to dicts without per-item Pydantic validation
+
+    The rows come straight from the database, so they already satisfy the
+    response schema; only the attributes the schema exposes are copied.
+    """
+    fields = fields or response_fields(schema)
+    return [row_to_dict(row, fields) for row in rows]
+
+
+def paginated_content(items: List[dict], total: int, page: int, size: int, pages: int) -> dict:
+    """Build the PaginatedResponse payload as a plain dict"""
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": pages
+    }
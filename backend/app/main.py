@@ -11,8 +11,11 @@ from decouple import config
 from loguru import logger
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import init_db, engine
+from app.core.compression import CompressionMiddleware
 from app.api.v1.api import api_router
+from app.services.patient_search_service import init_patient_search_index
+from app.services.rag_service import start_rag_warmup
 
 
 @asynccontextmanager
@@ -21,7 +24,12 @@ async def lifespan(app: FastAPI):
     # On startup
     logger.info("Starting Anesthesia Management System...")
     await init_db()
+    init_patient_search_index(engine)
     logger.info("Database initialization completed")
+    if settings.RAG_WARMUP_ON_STARTUP:
+        # Build the RAG system in the background; the app serves requests meanwhile
+        start_rag_warmup()
+        logger.info("RAG warm-up started in background")
     yield
     # On shutdown
     logger.info("Shutting down Anesthesia Management System...")
@@ -52,6 +60,14 @@ app.add_middleware(
     allowed_hosts=settings.ALLOWED_HOSTS
 )
 
+# Configure response compression
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY
+)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
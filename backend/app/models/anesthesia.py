@@ -42,6 +42,9 @@ class AnesthesiaGuideline(Base):
     is_generated = Column(Boolean, default=False, nullable=False)
     generation_notes = Column(Text, nullable=True)
 
+    # Incremented on every update; versions cached responses across workers
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -3,7 +3,7 @@
 """
 
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Dict
 from datetime import date, datetime
 from enum import Enum
 
@@ -82,6 +82,64 @@ class AnesthesiaGuidelineResponse(AnesthesiaGuidelineBase):
         from_attributes = True
 
 
+class AnesthesiaGuidelineSummary(BaseModel):
+    """麻醉須知列表摘要模型（不含內容欄位）"""
+    id: int
+    patient_id: int
+    group_id: Optional[int] = None
+    language: LanguageEnum
+    surgery_name: str
+    surgery_date: date
+
+    class Config:
+        from_attributes = True
+
+
+# 列表摘要投影欄位
+GUIDELINE_SUMMARY_FIELDS = list(AnesthesiaGuidelineSummary.model_fields.keys())
+
+
+class AnesthesiaGuidelineTranslation(BaseModel):
+    """多語言群組中單一語言版本的內容"""
+    id: int
+    language: LanguageEnum
+    surgery_name: str
+    anesthesia_type_info: str
+    surgery_process: str
+    expected_sensations: str
+    potential_risks: str
+    pre_surgery_instructions: str
+    fasting_instructions: str
+    medication_instructions: str
+    common_questions: str
+    post_surgery_care: str
+    additional_notes: Optional[str] = None
+    is_generated: bool
+    generation_notes: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class AnesthesiaGuidelineGroupResponse(BaseModel):
+    """麻醉須知多語言群組回應模型（共用欄位只出現一次）"""
+    group_id: Optional[int] = None
+    requested_id: int
+    requested_language: LanguageEnum
+    patient_id: int
+    anesthesia_type: AnesthesiaTypeEnum
+    surgery_date: date
+    surgeon_name: Optional[str] = None
+    anesthesiologist_name: Optional[str] = None
+    translations: Dict[str, AnesthesiaGuidelineTranslation]
+
+
+# 各語言版本各自的欄位
+GUIDELINE_TRANSLATION_FIELDS = list(AnesthesiaGuidelineTranslation.model_fields.keys())
+
+
 class AnesthesiaGuidelineTemplateBase(BaseModel):
     """麻醉須知模板基礎模型"""
     template_name: str = Field(..., max_length=100, description="模板名稱")
@@ -174,3 +174,20 @@ class PatientDetailResponse(PatientResponse):
     """Detailed response model for a patient, including medical history and surgery records."""
     medical_history: Optional[MedicalHistoryResponse] = None
     surgery_records: List[SurgeryRecordResponse] = []
+
+
+class PatientImportError(BaseModel):
+    """A row rejected by the bulk import."""
+    row: int
+    health_insurance_number: Optional[str] = None
+    error: str
+
+
+class PatientImportResult(BaseModel):
+    """Summary of a bulk patient import."""
+    total_rows: int
+    created: int
+    duplicates: int
+    failed: int
+    errors: List[PatientImportError] = []
+    errors_truncated: bool = False
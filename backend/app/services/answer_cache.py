@@ -0,0 +1,110 @@
+"""
+语义答案缓存
+按 (语言, 检索模式) 分桶，以问题嵌入的余弦相似度查找已回答过的近似问题，
+命中时直接返回答案，跳过检索和 LLM 生成（needs_doctor / category 由调用方按新问题重新判断）。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+
+class SemanticAnswerCache:
+    """
+    带相似度阈值的 LRU + TTL 答案缓存
+
+    知识库或模型变化时调用 set_version()，旧版本的答案全部作废。
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 86400, threshold: float = 0.95):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self.version: Optional[str] = None
+        self._entries: "OrderedDict[Tuple[Hashable, str], Tuple[np.ndarray, dict, float]]" = OrderedDict()
+        # 按写入时间排列（_entries 按最近使用排列），过期检查遇到未过期的即可停止
+        self._created: "OrderedDict[Tuple[Hashable, str], float]" = OrderedDict()
+        # 每个分桶的向量矩阵，条目变化时重建
+        self._matrices: Dict[Hashable, Tuple[List[Tuple[Hashable, str]], np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def set_version(self, version: str):
+        """知识库/模型版本变化时清空缓存"""
+        with self._lock:
+            if version != self.version:
+                self.version = version
+                self._entries.clear()
+                self._created.clear()
+                self._matrices.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._created.clear()
+            self._matrices.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    def _expire(self, now: float):
+        # 最早写入的在最前面，遇到未过期的即可停止
+        while self._created:
+            key, created = next(iter(self._created.items()))
+            if now - created <= self.ttl_seconds:
+                break
+            self._created.popitem(last=False)
+            del self._entries[key]
+            self._matrices.pop(key[0], None)
+
+    def _matrix(self, bucket: Hashable):
+        if bucket not in self._matrices:
+            keys = [key for key in self._entries if key[0] == bucket]
+            matrix = np.stack([self._entries[key][0] for key in keys]) if keys else None
+            self._matrices[bucket] = (keys, matrix)
+        return self._matrices[bucket]
+
+    def get(self, bucket: Hashable, vector) -> Optional[dict]:
+        """返回相似度不低于阈值的最相近问题的答案"""
+        if not self.enabled:
+            return None
+        query = self._normalize(vector)
+        with self._lock:
+            self._expire(time.time())
+            keys, matrix = self._matrix(bucket)
+            if matrix is None:
+                return None
+            scores = matrix @ query
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            self._entries.move_to_end(keys[best])
+            return dict(self._entries[keys[best]][1])
+
+    def put(self, bucket: Hashable, question: str, vector, result: dict):
+        if not self.enabled:
+            return
+        key = (bucket, question.strip().lower())
+        with self._lock:
+            now = time.time()
+            self._entries[key] = (self._normalize(vector), dict(result), now)
+            self._entries.move_to_end(key)
+            self._created[key] = now
+            self._created.move_to_end(key)
+            self._matrices.pop(bucket, None)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                del self._created[evicted]
+                self._matrices.pop(evicted[0], None)
@@ -0,0 +1,107 @@
+"""
+BM25 关键词索引
+对知识库片段预先计算倒排索引，精确的药物/术语名称（如 "malignant hyperthermia"、
+"epidural"）能命中正确片段；与向量检索结果通过 RRF 融合。
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+import numpy as np
+
+STOPWORDS = frozenset("""
+a an and are as at be by can do does for from how i if in is it me my of on or
+should the to what when where which who why will with you your
+""".split())
+
+_TOKEN_RE = re.compile(r"[㐀-鿿]+|\w+")
+_CJK_RE = re.compile(r"[㐀-鿿]")
+
+
+def tokenize(text: str) -> List[str]:
+    """小写、去重音符号；中文按相邻两字切分"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    tokens = []
+    for token in _TOKEN_RE.findall(stripped):
+        if _CJK_RE.match(token):
+            tokens += [token[i:i + 2] for i in range(max(len(token) - 1, 1))]
+        elif token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+class BM25Index:
+    """
+    预计算的 BM25 倒排索引
+
+    每个 (词, 片段) 的 BM25 分数在建索引时算好，查询只需把命中词的分数累加。
+    """
+
+    def __init__(self, documents: Sequence, k1: float = 1.5, b: float = 0.75):
+        self.documents = list(documents)
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.idf: Dict[str, float] = {}
+
+        doc_tokens = [tokenize(doc.page_content) for doc in self.documents]
+        count = len(doc_tokens)
+        avg_length = sum(len(tokens) for tokens in doc_tokens) / count if count else 0.0
+
+        collected = defaultdict(list)
+        for doc_id, tokens in enumerate(doc_tokens):
+            length_norm = k1 * (1 - b + b * len(tokens) / avg_length) if avg_length else k1
+            for term, tf in Counter(tokens).items():
+                collected[term].append((doc_id, tf * (k1 + 1) / (tf + length_norm)))
+
+        for term, entries in collected.items():
+            idf = math.log(1 + (count - len(entries) + 0.5) / (len(entries) + 0.5))
+            self.idf[term] = idf
+            doc_ids = np.array([doc_id for doc_id, _ in entries], dtype=np.int32)
+            weights = np.array([weight for _, weight in entries], dtype=np.float32) * idf
+            self.postings[term] = (doc_ids, weights)
+
+    def term_weight(self, term: str) -> float:
+        """词的 IDF，索引中没有的词按只出现在 0 个片段计算"""
+        idf = self.idf.get(term)
+        if idf is None:
+            idf = math.log(1 + (len(self.documents) + 0.5) / 0.5)
+        return idf
+
+    def search_with_score(self, query: str, k: int = 4) -> List[Tuple[object, float]]:
+        scores = np.zeros(len(self.documents), dtype=np.float32)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is not None:
+                scores[posting[0]] += posting[1]
+
+        hits = np.flatnonzero(scores)
+        if len(hits) == 0:
+            return []
+        k = min(k, len(hits))
+        top = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        top = top[np.argsort(-scores[top])]
+        return [(self.documents[i], float(scores[i])) for i in top]
+
+    def search(self, query: str, k: int = 4) -> list:
+        return [doc for doc, _ in self.search_with_score(query, k)]
+
+
+def reciprocal_rank_fusion(rankings: List[list], k: int = 4, rrf_k: int = 60, key=None) -> list:
+    """
+    RRF 融合多个排序结果：score = Σ 1 / (rrf_k + rank)
+
+    key 用于识别同一文档，默认使用 page_content。
+    """
+    key = key or (lambda doc: doc.page_content)
+    scores: Dict[Hashable, float] = defaultdict(float)
+    documents = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            doc_key = key(doc)
+            scores[doc_key] += 1.0 / (rrf_k + rank)
+            documents.setdefault(doc_key, doc)
+    ordered = sorted(scores, key=lambda doc_key: -scores[doc_key])
+    return [documents[doc_key] for doc_key in ordered[:k]]
@@ -0,0 +1,191 @@
+"""
+问答会话
+聊天窗口的服务端会话：内存存储、闲置超时淘汰、会话总数上限（LRU），
+每个会话的历史按 token 预算截断，因此总内存约为 会话数上限 × 历史预算。
+追问（"那会痛吗？"）改写为带话题的独立问题后再检索。
+"""
+
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.services.bm25_index import tokenize
+from app.services.context_builder import estimate_tokens, truncate_text
+from app.utils.question_classifier import classify_question
+
+# 承接上文的开头词：出现时视为追问；
+# 指代上文的词（出现在任何位置）：只在问题很短或没有自己的话题关键词时视为追问
+FOLLOW_UP_REFERENCES = {
+    "en": ["it", "its", "that", "this", "these", "those", "they", "them"],
+    "es": ["eso", "esto", "ello"],
+    "fr": ["ça", "cela", "ceci"],
+    "zh-TW": ["它", "這個", "那個", "這樣", "那樣", "呢"],
+}
+FOLLOW_UP_LEADS = {
+    "en": ["and", "also", "what about", "how about", "what if"],
+    "es": ["y", "también", "qué tal", "entonces"],
+    "fr": ["et", "et si", "aussi", "alors"],
+    "zh-TW": ["那", "還有", "另外"],
+}
+# 独立问题至少包含的关键词数，更短的问题视为追问（如 "How long?"）
+MIN_STANDALONE_TERMS = 3
+
+_CJK_RE = re.compile(r"[㐀-鿿]")
+
+
+def _alternatives(words: List[str]) -> str:
+    # 较长的词优先；拉丁文字需要完整单词，中文不需要
+    return "|".join(
+        re.escape(word) if _CJK_RE.search(word) else rf"{re.escape(word)}(?!\w)"
+        for word in sorted(words, key=len, reverse=True)
+    )
+
+
+def _follow_up_patterns(language: str) -> Tuple[re.Pattern, re.Pattern]:
+    leads = _alternatives(FOLLOW_UP_LEADS[language])
+    references = _alternatives(FOLLOW_UP_REFERENCES[language])
+    return (
+        re.compile(rf"^[\W_]*(?:{leads})", re.IGNORECASE),
+        re.compile(rf"(?<!\w)(?:{references})", re.IGNORECASE),
+    )
+
+
+_FOLLOW_UP_PATTERNS = {language: _follow_up_patterns(language) for language in FOLLOW_UP_REFERENCES}
+_REFERENCE_TERMS = {
+    language: {term for word in words for term in tokenize(word)}
+    for language, words in FOLLOW_UP_REFERENCES.items()
+}
+
+
+def is_follow_up(question: str, language: str) -> bool:
+    """
+    问题是否依赖上文
+
+    以承接词开头、关键词太少（"How long?"），或含指代词且没有自己的话题关键词时为追问；
+    "Is it safe to drink water before surgery?" 这样有完整话题的问题不算
+    """
+    if language not in _FOLLOW_UP_PATTERNS:
+        language = "en"
+    lead, reference = _FOLLOW_UP_PATTERNS[language]
+    if lead.search(question):
+        return True
+    terms = set(tokenize(question)) - _REFERENCE_TERMS[language]
+    if len(terms) < MIN_STANDALONE_TERMS:
+        return True
+    if reference.search(question):
+        classification = classify_question(question, language)
+        return not (classification["categories"] or classification["doctor_keywords"])
+    return False
+
+
+def rewrite_follow_up(topic: str, question: str) -> str:
+    """追问改写为独立的检索问题：会话话题 + 追问"""
+    return f"{topic} {question}" if topic else question
+
+
+class ChatSession:
+    """一个会话：最近的 (问题, 回答) 与当前话题"""
+
+    __slots__ = ("id", "language", "turns", "topic", "tokens", "last_used")
+
+    def __init__(self, session_id: str, language: str):
+        self.id = session_id
+        self.language = language
+        # (问题, 回答, token 数)
+        self.turns: List[Tuple[str, str, int]] = []
+        self.topic = ""
+        self.tokens = 0
+        self.last_used = time.time()
+
+
+class ChatSessionStore:
+    """
+    线程安全的内存会话存储
+
+    按最近使用排序：超过 ttl_seconds 未使用或超过 max_sessions 时淘汰最久未用的会话
+    """
+
+    def __init__(self, max_sessions: int = 5000, ttl_seconds: float = 1800, history_tokens: int = 300):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.history_tokens = history_tokens
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _expire(self, now: float):
+        # 最久未用的在最前面，遇到未过期的即可停止
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_used <= self.ttl_seconds:
+                break
+            self._sessions.popitem(last=False)
+
+    def _touch(self, session_id: Optional[str], language: str) -> ChatSession:
+        now = time.time()
+        self._expire(now)
+        session = self._sessions.get(session_id) if session_id else None
+        if session is None:
+            # 未知或已过期的 id 不沿用，由服务端生成新 id
+            session = ChatSession(uuid.uuid4().hex, language)
+            self._sessions[session.id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        session.last_used = now
+        self._sessions.move_to_end(session.id)
+        return session
+
+    def start_turn(self, session_id: Optional[str], language: str) -> Tuple[str, List[Tuple[str, str]], str]:
+        """
+        取得（或新建）会话，返回 (会话 id, 历史 [(问题, 回答)], 当前话题)
+
+        id 未知或已过期时新建空会话，调用方应改用返回的 id
+        """
+        with self._lock:
+            session = self._touch(session_id, language)
+            return session.id, [(question, answer) for question, answer, _ in session.turns], session.topic
+
+    def add_turn(self, session_id: str, language: str, question: str, answer: str, topic: Optional[str] = None) -> bool:
+        """
+        记录一轮问答；topic 不为 None 时更新会话话题
+
+        超出历史预算时先截断过长的回答，再丢弃最早的问答。
+        生成回答期间会话已过期（或被结束）时不新建会话，丢弃这一轮并返回 False：
+        客户端只知道原来的 id，下次提问时 start_turn 会给它新的 id
+        """
+        question = truncate_text(question, self.history_tokens // 2)
+        answer = truncate_text(answer, max(self.history_tokens - estimate_tokens(question), 0))
+        tokens = estimate_tokens(question) + estimate_tokens(answer)
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                return False
+            session.last_used = now
+            self._sessions.move_to_end(session_id)
+            session.language = language
+            if topic is not None:
+                session.topic = truncate_text(topic, self.history_tokens // 2)
+            session.turns.append((question, answer, tokens))
+            session.tokens += tokens
+            while session.tokens > self.history_tokens and len(session.turns) > 1:
+                session.tokens -= session.turns.pop(0)[2]
+            return True
+
+    def end(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._expire(time.time())
+            return {
+                "sessions": len(self._sessions),
+                "history_tokens": sum(session.tokens for session in self._sessions.values()),
+            }
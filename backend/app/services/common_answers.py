@@ -0,0 +1,106 @@
+"""
+常见问题的预生成答案
+为 COMMON_QUESTIONS 中每种语言的每个问题预先生成回答并保存；
+知识库或模型变化后（版本哈希不同）旧答案不再使用，需要重新生成。
+"""
+
+import json
+import re
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+from app.utils.common_questions import COMMON_QUESTIONS
+
+STORE_PATH = Path(__file__).parent.parent.parent.parent / "data" / "common_answers.json"
+
+
+def normalize_question(question: str) -> str:
+    """忽略大小写、重音符号、标点和空白的差异"""
+    decomposed = unicodedata.normalize("NFKD", question.casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(re.findall(r"\w+", stripped))
+
+
+class CommonAnswerStore:
+    """预生成答案的存储，只提供与当前知识库版本一致的答案"""
+
+    def __init__(self, path: Path = STORE_PATH):
+        self.path = path
+        self.version: Optional[str] = None
+        self._answers: Dict[str, Dict[str, dict]] = {}
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  读取预生成答案失败: {e}")
+            return {}
+
+    def load(self, version: str):
+        """加载与 version 一致的答案，版本不同的答案被忽略"""
+        data = self._read()
+        with self._lock:
+            self.version = version
+            self._answers = data.get("answers", {}) if data.get("knowledge_version") == version else {}
+        return len(self)
+
+    def __len__(self) -> int:
+        return sum(len(answers) for answers in self._answers.values())
+
+    def get(self, language: str, question: str) -> Optional[dict]:
+        answer = self._answers.get(language, {}).get(normalize_question(question))
+        return dict(answer) if answer else None
+
+    def missing(self, languages: Iterable[str]) -> Dict[str, list]:
+        """尚未生成（或已过期）的问题"""
+        return {
+            language: [q for q in COMMON_QUESTIONS[language] if normalize_question(q) not in self._answers.get(language, {})]
+            for language in languages
+        }
+
+    def build(self, answer: Callable[[str, str], dict], languages: Optional[Iterable[str]] = None,
+              force: bool = False) -> int:
+        """
+        生成缺失的答案并保存
+
+        answer(question, language) 返回 RAG 结果；失败的回答不保存，下次重试
+        """
+        languages = list(languages or COMMON_QUESTIONS)
+        if force:
+            with self._lock:
+                for language in languages:
+                    self._answers.pop(language, None)
+
+        generated = 0
+        for language, questions in self.missing(languages).items():
+            for question in questions:
+                result = answer(question, language)
+                if result.get("category") in ("error", "unavailable") or not result.get("answer"):
+                    print(f"⚠️  生成失败 [{language}] {question}")
+                    continue
+                with self._lock:
+                    self._answers.setdefault(language, {})[normalize_question(question)] = result
+                generated += 1
+                # 每生成一个答案就保存，中断后可以继续
+                self.save()
+        return generated
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {
+                "knowledge_version": self.version,
+                "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "answers": self._answers,
+            }
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(self.path)
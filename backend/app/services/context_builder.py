@@ -0,0 +1,130 @@
+"""
+提示词上下文构建
+对检索到的候选片段：用 BM25 词权重做轻量重排、合并切分时重叠的部分（chunk_overlap）
+并去掉重复内容，再按 token 预算装入提示词。提示词越短，CPU 上的 prompt eval 越快。
+"""
+
+import math
+import re
+from typing import List, Optional, Tuple
+
+try:
+    from langchain_core.documents import Document
+except ImportError:
+    from langchain.schema import Document
+
+from app.core.config import settings
+from app.services.bm25_index import BM25Index, tokenize
+from app.services.knowledge_ingestion import CHUNK_OVERLAP
+
+# 检索排名的先验权重：词覆盖率相近时保留原检索顺序
+RANK_PRIOR_WEIGHT = 0.2
+# 至少重叠这么多字符才合并，避免误合并常见短语
+MIN_OVERLAP = 20
+
+_CJK_RE = re.compile(r"[぀-ヿ㐀-鿿가-힯]")
+_BREAK_RE = re.compile(r"\n|(?<=[.!?。！？])\s*")
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估计 token 数：中日韩文字约每字 1 个，其他文字约每 4 个字符 1 个"""
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / 4)
+
+
+def rerank(question: str, docs: List[Document], bm25: Optional[BM25Index] = None) -> List[Tuple[Document, float]]:
+    """
+    按问题词的覆盖率（BM25 IDF 加权）重排候选片段，返回 (片段, 分数)
+
+    只要有片段包含问题中的词，完全不含问题词的片段视为无关并丢弃；
+    都不含时（如跨语言检索）保持原检索顺序
+    """
+    terms = set(tokenize(question))
+    weights = {term: bm25.term_weight(term) if bm25 else 1.0 for term in terms}
+    total = sum(weights.values())
+
+    scored = []
+    for rank, doc in enumerate(docs):
+        doc_terms = set(tokenize(doc.page_content))
+        coverage = sum(weight for term, weight in weights.items() if term in doc_terms) / total if total else 0.0
+        scored.append((doc, coverage, coverage + RANK_PRIOR_WEIGHT / (rank + 1)))
+
+    if any(coverage for _, coverage, _ in scored):
+        scored = [entry for entry in scored if entry[1]]
+    scored.sort(key=lambda entry: -entry[2])
+    return [(doc, score) for doc, _, score in scored]
+
+
+def _overlap(left: str, right: str) -> int:
+    """left 结尾与 right 开头重叠的字符数"""
+    limit = min(len(left), len(right), CHUNK_OVERLAP * 2)
+    for size in range(limit, MIN_OVERLAP - 1, -1):
+        if left.endswith(right[:size]):
+            return size
+    return 0
+
+
+def merge_overlaps(docs: List[Document]) -> List[Document]:
+    """
+    合并首尾重叠的片段，丢弃被其他片段完全包含的片段
+
+    保持输入顺序，合并后的片段位于排名较前的一方
+    """
+    merged: List[Document] = []
+    for doc in docs:
+        text = doc.page_content
+        for position, kept in enumerate(merged):
+            current = kept.page_content
+            if text in current:
+                break
+            if current in text:
+                merged[position] = Document(page_content=text, metadata=kept.metadata)
+                break
+            size = _overlap(current, text)
+            if size:
+                merged[position] = Document(page_content=current + text[size:], metadata=kept.metadata)
+                break
+            size = _overlap(text, current)
+            if size:
+                merged[position] = Document(page_content=text + current[size:], metadata=kept.metadata)
+                break
+        else:
+            merged.append(doc)
+    return merged
+
+
+def truncate_text(text: str, token_budget: int) -> str:
+    """截断到预算以内，尽量在换行或句末处截断"""
+    if estimate_tokens(text) <= token_budget:
+        return text
+    end = int(len(text) * token_budget / max(estimate_tokens(text), 1))
+    while end > 0 and estimate_tokens(text[:end]) > token_budget:
+        end -= max(1, end // 20)
+    cut = text[:end]
+    breaks = [match.start() for match in _BREAK_RE.finditer(cut) if match.start() > end // 2]
+    if breaks:
+        cut = cut[:breaks[-1]]
+    return cut.rstrip()
+
+
+def pack_context(docs: List[Document], token_budget: int) -> List[Document]:
+    """按顺序装入不超过 token 预算的片段（放不下的跳过，继续尝试较短的）"""
+    packed: List[Document] = []
+    used = 0
+    for doc in docs:
+        tokens = estimate_tokens(doc.page_content)
+        if used + tokens <= token_budget:
+            packed.append(doc)
+            used += tokens
+        elif not packed:
+            # 最相关的片段本身超出预算时截断，而不是留空
+            packed.append(Document(page_content=truncate_text(doc.page_content, token_budget), metadata=doc.metadata))
+            used = token_budget
+    return packed
+
+
+def build_context(question: str, docs: List[Document], bm25: Optional[BM25Index] = None,
+                  token_budget: Optional[int] = None) -> List[Document]:
+    """重排 → 合并重叠 → 按预算装入，返回用于提示词的片段"""
+    ranked = [doc for doc, _ in rerank(question, docs, bm25)]
+    return pack_context(merge_overlaps(ranked), token_budget or settings.RAG_CONTEXT_TOKENS)
@@ -0,0 +1,238 @@
+"""
+嵌入模型服务
+可配置的嵌入后端 + 持久化的内容哈希 → 向量缓存
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from langchain_core.embeddings import Embeddings
+except ImportError:
+    from langchain.embeddings.base import Embeddings
+
+try:
+    from langchain_community.embeddings import OllamaEmbeddings, HuggingFaceEmbeddings
+except ImportError:
+    OllamaEmbeddings = None
+    HuggingFaceEmbeddings = None
+
+from app.core.config import settings
+
+DATA_DIR = Path(__file__).parent.parent.parent.parent / "data"
+
+# 各后端的默认嵌入模型
+DEFAULT_EMBEDDING_MODELS = {
+    "ollama": "nomic-embed-text",
+    "huggingface": "sentence-transformers/all-MiniLM-L6-v2",
+    "hashing": "384",
+}
+
+
+class HashingEmbeddings(Embeddings):
+    """确定性的词袋哈希嵌入，无需模型，用于离线评估和基准测试"""
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimension
+        for token in re.findall(r"\w+", text.lower()):
+            digest = hashlib.md5(token.encode("utf-8")).digest()
+            vector[int.from_bytes(digest[:4], "little") % self.dimension] += 1.0
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+def embedding_model_id() -> str:
+    """当前嵌入配置的唯一标识（后端 + 模型）"""
+    backend = settings.RAG_EMBEDDING_BACKEND
+    model = settings.RAG_EMBEDDING_MODEL or DEFAULT_EMBEDDING_MODELS.get(backend, "")
+    return f"{backend}:{model}"
+
+
+def embedding_slug() -> str:
+    """可用作目录名的嵌入标识，更换模型时向量库随之分开"""
+    return re.sub(r"[^a-zA-Z0-9]+", "_", embedding_model_id()).strip("_").lower()
+
+
+def create_base_embeddings() -> Embeddings:
+    """根据配置创建嵌入后端"""
+    backend = settings.RAG_EMBEDDING_BACKEND
+    model = settings.RAG_EMBEDDING_MODEL or DEFAULT_EMBEDDING_MODELS.get(backend)
+
+    if backend == "ollama":
+        if OllamaEmbeddings is None:
+            raise RuntimeError("langchain_community is required for Ollama embeddings")
+        return OllamaEmbeddings(model=model, base_url=settings.OLLAMA_URL)
+    if backend == "huggingface":
+        # 纯 CPU 本地模型，需要 sentence-transformers
+        if HuggingFaceEmbeddings is None:
+            raise RuntimeError("langchain_community is required for HuggingFace embeddings")
+        return HuggingFaceEmbeddings(
+            model_name=model,
+            model_kwargs={"device": "cpu"},
+            encode_kwargs={"normalize_embeddings": True}
+        )
+    if backend == "hashing":
+        return HashingEmbeddings(int(model))
+    raise ValueError(f"Unsupported embedding backend: {backend}")
+
+
+class EmbeddingCache:
+    """SQLite 持久化的 内容哈希 → float32 向量 缓存"""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        with self._lock:
+            # SQLite 单条语句的参数数量有限，分批查询
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+        return found
+
+    def put_many(self, items: Dict[str, List[float]]):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, array("f", vector).tobytes()) for key, vector in items.items()]
+            )
+            self._conn.commit()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    带缓存的嵌入包装器
+
+    文档和查询都按 (模型, 文本) 的哈希缓存：重建索引时未变更的片段、
+    重复提问都不再重新计算嵌入。查询另有进程内 LRU 缓存。
+    """
+
+    def __init__(self, base: Embeddings, model_id: str, cache: Optional[EmbeddingCache], query_cache_size: int = 1024):
+        self.base = base
+        self.model_id = model_id
+        self.cache = cache
+        self.query_cache_size = query_cache_size
+        self._query_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_id}\0{text}".encode("utf-8")).hexdigest()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        cached = self.cache.get_many(list(set(keys))) if self.cache else {}
+
+        # 只为缓存未命中的文本调用模型，且一次批量计算
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        if missing:
+            vectors = self.base.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            if self.cache:
+                self.cache.put_many(computed)
+            cached.update(computed)
+
+        return [cached[key] for key in keys]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """批量计算查询向量：缓存未命中的查询合并为一次模型调用"""
+        keys = [self._key("query\0" + text) for text in texts]
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._query_cache:
+                    found[key] = self._query_cache[key]
+        if self.cache:
+            found.update(self.cache.get_many([key for key in set(keys) if key not in found]))
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        if missing:
+            vectors = _embed_queries_uncached(self.base, list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            if self.cache:
+                self.cache.put_many(computed)
+            found.update(computed)
+
+        with self._lock:
+            for key in keys:
+                self._query_cache[key] = found[key]
+                self._query_cache.move_to_end(key)
+            while len(self._query_cache) > self.query_cache_size:
+                self._query_cache.popitem(last=False)
+        return [found[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key("query\0" + text)
+        with self._lock:
+            if key in self._query_cache:
+                self._query_cache.move_to_end(key)
+                return self._query_cache[key]
+
+        vector = None
+        if self.cache:
+            vector = self.cache.get_many([key]).get(key)
+        if vector is None:
+            vector = self.base.embed_query(text)
+            if self.cache:
+                self.cache.put_many({key: vector})
+
+        with self._lock:
+            self._query_cache[key] = vector
+            while len(self._query_cache) > self.query_cache_size:
+                self._query_cache.popitem(last=False)
+        return vector
+
+
+def _embed_queries_uncached(base: Embeddings, texts: List[str]) -> List[List[float]]:
+    if isinstance(base, HashingEmbeddings) or (HuggingFaceEmbeddings is not None and isinstance(base, HuggingFaceEmbeddings)):
+        # 这两种后端的查询与文档向量计算方式相同，可直接批量计算
+        return base.embed_documents(texts)
+    # 其他后端（包括 Ollama：带 query_instruction 前缀，且每段文本本来就是一次请求）逐个走公开的 embed_query
+    return [base.embed_query(text) for text in texts]
+
+
+def embed_queries(embedding: Embeddings, texts: List[str]) -> List[List[float]]:
+    """批量计算查询向量（与逐个 embed_query 的结果一致）"""
+    if isinstance(embedding, CachedEmbeddings):
+        return embedding.embed_queries(texts)
+    return _embed_queries_uncached(embedding, texts)
+
+
+def create_embeddings() -> Embeddings:
+    """创建已配置的（带缓存的）嵌入函数"""
+    base = create_base_embeddings()
+    if not settings.RAG_EMBEDDING_CACHE:
+        return base
+    cache = EmbeddingCache(DATA_DIR / "embedding_cache.sqlite3")
+    return CachedEmbeddings(base, embedding_model_id(), cache)
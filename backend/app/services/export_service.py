@@ -0,0 +1,118 @@
+"""
+Bulk export service
+Streams table rows as NDJSON or CSV without materializing the result set
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.patient import Patient, MedicalHistory, SurgeryRecord
+from app.models.anesthesia import AnesthesiaGuideline
+
+EXPORT_MODELS = {
+    "patients": Patient,
+    "medical-histories": MedicalHistory,
+    "surgery-records": SurgeryRecord,
+    "guidelines": AnesthesiaGuideline,
+}
+EXPORT_FORMATS = ("ndjson", "csv")
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+DEFAULT_BATCH_SIZE = 1000
+# Flush CSV and NDJSON output once this many characters are buffered
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def iter_rows(
+    db: Session,
+    entity: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    updated_since: Optional[datetime] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield table rows as dicts, fetching batch_size rows at a time
+
+    Plain columns are selected instead of ORM entities so nothing accumulates
+    in the session identity map, and stream_results asks the driver for a
+    server-side cursor where it supports one.
+    """
+    model = EXPORT_MODELS[entity]
+    stmt = select(*model.__table__.columns).order_by(model.id)
+    if updated_since is not None:
+        stmt = stmt.where(model.updated_at >= updated_since)
+    stmt = stmt.execution_options(stream_results=True, yield_per=batch_size)
+
+    for row in db.execute(stmt):
+        yield dict(row._mapping)
+
+
+def iter_ndjson(rows: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """Encode rows as NDJSON lines, yielding output in bounded chunks"""
+    lines: List[str] = []
+    size = 0
+    for row in rows:
+        line = json.dumps(row, default=_json_default, ensure_ascii=False) + "\n"
+        lines.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_SIZE:
+            yield "".join(lines)
+            lines, size = [], 0
+    if lines:
+        yield "".join(lines)
+
+
+def iter_csv(rows: Iterator[Dict[str, Any]], columns) -> Iterator[str]:
+    """Encode rows as CSV, yielding output in bounded chunks"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([
+            value.isoformat() if isinstance(value, (date, datetime)) else value
+            for value in (row[column] for column in columns)
+        ])
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_stream(
+    entity: str,
+    fmt: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    updated_since: Optional[datetime] = None
+) -> Iterator[str]:
+    """
+    Stream an entity export in the given format
+
+    Opens its own session so the export can outlive the request dependency
+    and closes it when the stream is exhausted or abandoned.
+    """
+    db = SessionLocal()
+    try:
+        rows = iter_rows(db, entity, batch_size, updated_since)
+        if fmt == "csv":
+            columns = EXPORT_MODELS[entity].__table__.columns.keys()
+            yield from iter_csv(rows, columns)
+        else:
+            yield from iter_ndjson(rows)
+    finally:
+        db.close()
@@ -0,0 +1,121 @@
+"""
+知识库增量导入
+把内置知识库和知识目录中的 Markdown / 文本文档切分为片段，按内容哈希
+与向量库对比：只嵌入新增或变更的片段，删除已移除的片段。
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+except ImportError:
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+try:
+    from langchain_core.documents import Document
+except ImportError:
+    from langchain.schema import Document
+
+from app.services.vector_index import NumpyVectorIndex
+
+KNOWLEDGE_SUFFIXES = (".md", ".markdown", ".txt")
+BUILTIN_SOURCE = "builtin:knowledge_base_en"
+
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 50
+
+
+def create_text_splitter() -> RecursiveCharacterTextSplitter:
+    return RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP,
+        separators=["\n\n", "\n", ". ", " "]
+    )
+
+
+def chunk_id(text: str) -> str:
+    """片段 id 即内容哈希，内容不变 id 不变"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def collect_sources(knowledge_dir: Optional[Path] = None) -> List[Tuple[str, str]]:
+    """返回 (来源, 文本)：内置英文知识库 + 知识目录下的 .md/.txt 文件"""
+    from app.utils.knowledge_base_en import ANESTHESIA_KNOWLEDGE_EN
+
+    sources = [(BUILTIN_SOURCE, ANESTHESIA_KNOWLEDGE_EN)]
+    if knowledge_dir and knowledge_dir.is_dir():
+        for path in sorted(knowledge_dir.rglob("*")):
+            if path.is_file() and path.suffix.lower() in KNOWLEDGE_SUFFIXES:
+                sources.append((str(path.relative_to(knowledge_dir)), path.read_text(encoding="utf-8")))
+    return sources
+
+
+def split_sources(sources: Iterable[Tuple[str, str]]) -> List[Document]:
+    """切分为片段，重复内容只保留一份"""
+    splitter = create_text_splitter()
+    documents: Dict[str, Document] = {}
+    for source, text in sources:
+        for doc in splitter.create_documents([text], metadatas=[{"source": source}]):
+            doc.metadata["id"] = chunk_id(doc.page_content)
+            documents.setdefault(doc.metadata["id"], doc)
+    return list(documents.values())
+
+
+class IngestionReport:
+    """一次导入的统计"""
+
+    def __init__(self):
+        self.sources: List[str] = []
+        self.added = 0
+        self.removed = 0
+        self.unchanged = 0
+        self.total_chunks = 0
+        self.elapsed_seconds = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "sources": self.sources,
+            "added": self.added,
+            "removed": self.removed,
+            "unchanged": self.unchanged,
+            "total_chunks": self.total_chunks,
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+        }
+
+
+def _store_ids(store) -> List[str]:
+    if isinstance(store, NumpyVectorIndex):
+        return list(store.ids)
+    # Chroma
+    return store.get(include=[])["ids"]
+
+
+def sync_vectorstore(store, documents: List[Document], report: IngestionReport):
+    """
+    让向量库与片段列表一致，返回更新后的向量库
+
+    NumPy 索引在副本上修改后整体替换，进行中的检索不受影响；Chroma 原地更新。
+    """
+    wanted = {doc.metadata["id"]: doc for doc in documents}
+    existing = set(_store_ids(store))
+
+    to_add = [doc for doc_id, doc in wanted.items() if doc_id not in existing]
+    to_remove = [doc_id for doc_id in existing if doc_id not in wanted]
+    report.added = len(to_add)
+    report.removed = len(to_remove)
+    report.unchanged = len(wanted) - len(to_add)
+    report.total_chunks = len(wanted)
+
+    if not to_add and not to_remove:
+        return store
+
+    if isinstance(store, NumpyVectorIndex):
+        store = store.copy()
+    if to_remove:
+        store.delete(ids=to_remove)
+    if to_add:
+        store.add_documents(to_add, ids=[doc.metadata["id"] for doc in to_add])
+    store.persist()
+    return store
@@ -0,0 +1,110 @@
+"""
+多语言知识库
+把英文知识片段翻译为其他语言（按片段 id 保存，只翻译新增或变更的片段），
+用于建立各语言独立的向量库和 BM25 索引。
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+try:
+    from langchain_core.documents import Document
+except ImportError:
+    from langchain.schema import Document
+
+from app.services.knowledge_ingestion import chunk_id
+
+TRANSLATED_DIR = Path(__file__).parent.parent.parent.parent / "data" / "knowledge_translated"
+
+_file_lock = threading.Lock()
+
+
+def language_slug(language: str) -> str:
+    return language.lower().replace("-", "_")
+
+
+def translations_path(language: str) -> Path:
+    return TRANSLATED_DIR / f"{language_slug(language)}.json"
+
+
+def load_translations(language: str) -> Dict[str, str]:
+    """片段 id -> 译文"""
+    path = translations_path(language)
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_translations(language: str, translations: Dict[str, str]):
+    path = translations_path(language)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _file_lock:
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(translations, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(path)
+
+
+def translated_documents(documents: List[Document], language: str) -> List[Document]:
+    """
+    当前英文片段对应的译文片段
+
+    id 为译文的内容哈希（译文更新后会重新嵌入），source_id 为英文片段 id；
+    尚未翻译的片段保留英文原文（metadata language 为 en），已删除片段的旧译文不会出现
+    """
+    translations = load_translations(language)
+    translated = []
+    for doc in documents:
+        text = translations.get(doc.metadata["id"])
+        if text:
+            translated.append(Document(
+                page_content=text,
+                metadata={**doc.metadata, "id": chunk_id(text), "source_id": doc.metadata["id"], "language": language}
+            ))
+        else:
+            translated.append(Document(page_content=doc.page_content, metadata={**doc.metadata, "language": "en"}))
+    return translated
+
+
+def translate_missing(documents: List[Document], language: str, translate: Callable[[str, str], str],
+                      progress: Callable[[int, int], None] = None) -> int:
+    """
+    翻译尚无译文的片段并保存（每个片段翻译后立即保存，中断后可继续）
+
+    同时清理已不存在的片段的译文，返回新翻译的片段数
+    """
+    translations = load_translations(language)
+    current_ids = {doc.metadata["id"] for doc in documents}
+    stale = [translated_id for translated_id in translations if translated_id not in current_ids]
+    for translated_id in stale:
+        del translations[translated_id]
+    if stale:
+        save_translations(language, translations)
+
+    pending = [doc for doc in documents if doc.metadata["id"] not in translations]
+    translated = 0
+    for index, doc in enumerate(pending, start=1):
+        text = translate(doc.page_content, language)
+        if not text or text.startswith("[Translation"):
+            print(f"⚠️  翻译失败，跳过片段 {doc.metadata['id'][:8]}")
+            continue
+        translations[doc.metadata["id"]] = text
+        save_translations(language, translations)
+        translated += 1
+        if progress:
+            progress(index, len(pending))
+    return translated
+
+
+def translations_fingerprint(languages: Iterable[str]) -> str:
+    """各语言译文文件的内容哈希，译文变化时知识库版本随之变化"""
+    digest = hashlib.sha256()
+    for language in sorted(languages):
+        path = translations_path(language)
+        if path.exists():
+            digest.update(language.encode("utf-8") + b"\0" + path.read_bytes())
+    return digest.hexdigest()[:16]
@@ -0,0 +1,216 @@
+"""
+Bulk patient import service
+Streams CSV/NDJSON records and inserts patients in batches
+"""
+
+import csv
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from loguru import logger
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.patient import Patient
+from app.schemas.patient import PatientCreate
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+DEFAULT_BATCH_SIZE = 1000
+# Keep the report bounded no matter how many rows fail
+MAX_REPORTED_ERRORS = 1000
+
+
+class RecordParseError(Exception):
+    """A single input record could not be parsed"""
+
+
+def detect_format(filename: Optional[str]) -> Optional[str]:
+    """Guess the import format from a file name"""
+    if not filename:
+        return None
+    name = filename.lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return None
+
+
+def iter_records(stream: TextIO, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (row number, record) pairs one at a time
+
+    Malformed rows are yielded as RecordParseError instances so the caller
+    can report them without stopping the import.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        row_number = 0
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as e:
+                # The reader resumes at the next line after a malformed one
+                row_number += 1
+                yield row_number, RecordParseError(f"Invalid CSV: {e}")
+                continue
+            row_number += 1
+            # Empty CSV cells mean "not provided"
+            yield row_number, {key: (value if value != "" else None) for key, value in row.items() if key}
+    elif fmt == "ndjson":
+        row_number = 0
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            row_number += 1
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_number, RecordParseError(f"Invalid JSON: {e.msg}")
+                continue
+            if not isinstance(record, dict):
+                yield row_number, RecordParseError("Each line must be a JSON object")
+                continue
+            yield row_number, record
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+class PatientImportReport:
+    """Counters and per-row errors for one import run"""
+
+    def __init__(self, max_errors: int = MAX_REPORTED_ERRORS):
+        self.total_rows = 0
+        self.created = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.errors_truncated = False
+        self.max_errors = max_errors
+
+    def add_error(self, row: int, error: str, health_insurance_number: Optional[str] = None, duplicate: bool = False):
+        if duplicate:
+            self.duplicates += 1
+        else:
+            self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({
+                "row": row,
+                "health_insurance_number": health_insurance_number,
+                "error": error
+            })
+        else:
+            self.errors_truncated = True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_rows": self.total_rows,
+            "created": self.created,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            # Duplicates are found when a batch is flushed, after later rows were parsed
+            "errors": sorted(self.errors, key=lambda error: error["row"]),
+            "errors_truncated": self.errors_truncated
+        }
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
+
+
+def _flush_batch(db: Session, batch: List[Tuple[int, PatientCreate]], report: PatientImportReport):
+    """Insert one batch after a set-based duplicate check, then commit"""
+    numbers = {patient.health_insurance_number for _, patient in batch}
+    existing = set(db.execute(
+        select(Patient.health_insurance_number).where(Patient.health_insurance_number.in_(numbers))
+    ).scalars())
+
+    rows = []
+    row_numbers = []
+    for row_number, patient in batch:
+        number = patient.health_insurance_number
+        if number in existing:
+            report.add_error(row_number, "Health insurance number already exists", number, duplicate=True)
+            continue
+        # Also catches repeats inside the same batch
+        existing.add(number)
+        rows.append(patient.dict())
+        row_numbers.append(row_number)
+
+    if not rows:
+        return
+
+    try:
+        db.execute(insert(Patient), rows)
+        db.commit()
+        report.created += len(rows)
+    except IntegrityError:
+        # Another writer inserted a conflicting row; retry one by one
+        db.rollback()
+        for row_number, row in zip(row_numbers, rows):
+            try:
+                db.execute(insert(Patient), [row])
+                db.commit()
+                report.created += 1
+            except IntegrityError:
+                db.rollback()
+                report.add_error(
+                    row_number, "Health insurance number already exists",
+                    row["health_insurance_number"], duplicate=True
+                )
+
+
+def import_patients(
+    db: Session,
+    records: Iterable[Tuple[int, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> PatientImportReport:
+    """
+    Import patients from (row number, record) pairs
+
+    Only one batch is held in memory at a time, and every batch is committed
+    on its own, so memory stays flat regardless of input size. Input that is
+    not valid UTF-8 stops the import after the rows read so far.
+    """
+    report = PatientImportReport()
+    batch: List[Tuple[int, PatientCreate]] = []
+
+    try:
+        for row_number, record in records:
+            report.total_rows += 1
+            if isinstance(record, RecordParseError):
+                report.add_error(row_number, str(record))
+                continue
+
+            try:
+                patient = PatientCreate(**record)
+            except ValidationError as e:
+                report.add_error(row_number, _format_validation_error(e), record.get("health_insurance_number"))
+                continue
+            except TypeError as e:
+                report.add_error(row_number, str(e), record.get("health_insurance_number"))
+                continue
+
+            batch.append((row_number, patient))
+            if len(batch) >= batch_size:
+                _flush_batch(db, batch, report)
+                batch = []
+    except UnicodeDecodeError as e:
+        # The text stream cannot be read past this point
+        report.add_error(report.total_rows + 1, f"File is not valid UTF-8 ({e.reason}); import stopped")
+
+    if batch:
+        _flush_batch(db, batch, report)
+
+    logger.info(
+        f"Patient import finished: {report.created} created, "
+        f"{report.duplicates} duplicates, {report.failed} failed"
+    )
+    return report
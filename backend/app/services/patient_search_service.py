@@ -0,0 +1,216 @@
+"""
+Patient name search service
+Prefix, diacritic-insensitive and typo-tolerant search over Patient.full_name
+
+SQLite uses an FTS5 index kept in sync by triggers; PostgreSQL uses a
+pg_trgm GIN index over an unaccented, lowercased name key.
+"""
+
+import difflib
+import re
+import unicodedata
+from typing import Dict, List, Tuple
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.patient import Patient
+
+FTS_TABLE = "patients_fts"
+# Candidates fetched per index lookup for reranking
+FUZZY_CANDIDATES = 200
+# Minimum similarity for a fuzzy match to be returned
+FUZZY_MIN_SCORE = 0.6
+
+_SQLITE_SETUP = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        full_name,
+        content='patients',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON patients BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, full_name) VALUES (new.id, new.full_name);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON patients BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, full_name) VALUES ('delete', old.id, old.full_name);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF full_name ON patients BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, full_name) VALUES ('delete', old.id, old.full_name);
+        INSERT INTO {FTS_TABLE}(rowid, full_name) VALUES (new.id, new.full_name);
+    END
+    """,
+]
+
+_POSTGRES_SETUP = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    # unaccent() is only STABLE; an IMMUTABLE wrapper with a fixed dictionary can be indexed.
+    # Mirrors normalize_name: no diacritics, lowercase, punctuation collapsed to single spaces
+    """
+    CREATE OR REPLACE FUNCTION patient_name_key(value text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+        SELECT btrim(regexp_replace(lower(public.unaccent('public.unaccent'::regdictionary, value)),
+                                    '[^[:alnum:]_]+', ' ', 'g'))
+    $$
+    """,
+    "DROP INDEX IF EXISTS ix_patients_full_name_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_patients_name_key_trgm ON patients USING gin (patient_name_key(full_name) gin_trgm_ops)",
+]
+
+
+def normalize_name(value: str) -> str:
+    """Casefold, strip diacritics and collapse punctuation to single spaces"""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(re.findall(r"\w+", stripped.casefold()))
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so they match literally (with ESCAPE '\\')"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def init_patient_search_index(engine: Engine):
+    """Create the name search index for the current database backend"""
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            if dialect == "sqlite":
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:name"),
+                    {"name": FTS_TABLE}
+                ).first()
+                for statement in _SQLITE_SETUP:
+                    conn.execute(text(statement))
+                if not exists:
+                    # Index patients created before the search index existed
+                    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+            elif dialect == "postgresql":
+                for statement in _POSTGRES_SETUP:
+                    conn.execute(text(statement))
+        logger.info(f"Patient name search index ready ({dialect})")
+    except Exception as e:
+        logger.warning(f"Patient name search index unavailable, falling back to LIKE: {e}")
+
+
+def _fts_candidates(db: Session, match: str) -> List[Tuple[int, str]]:
+    # No ORDER BY: FTS5 stops after FUZZY_CANDIDATES matches instead of scoring every
+    # match (tens of thousands of rows for a common prefix); _rerank orders them instead
+    return db.execute(
+        text(f"SELECT rowid, full_name FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match LIMIT :limit"),
+        {"match": match, "limit": FUZZY_CANDIDATES}
+    ).all()
+
+
+def _sqlite_search(db: Session, normalized: str, limit: int) -> List[int]:
+    tokens = normalized.split()
+
+    # Names matching the query as typed, most specific first so exact matches are never
+    # crowded out of the capped candidate set by longer names: the name starting with
+    # the query as whole words, then as a prefix, then every token as a prefix anywhere
+    phrase = "^" + " + ".join(f'"{token}"' for token in tokens)
+    exact = [
+        phrase,
+        phrase + "*",
+        " ".join(f'"{token}"*' for token in tokens),
+    ]
+    ids: List[int] = []
+    for match in exact:
+        ids += _rerank(_fts_candidates(db, match), normalized, exclude=set(ids), limit=limit - len(ids), min_score=0.0)
+        if len(ids) >= limit:
+            return ids
+    if ids:
+        return ids
+
+    # Fuzzy stages only run when no name matches the query as typed. Short prefixes of all
+    # tokens tolerate a typo after the third (or second) letter; the candidates of both are
+    # reranked together so a closer name from the looser stage still wins
+    candidates = {}
+    for match in dict.fromkeys(_prefix_match(tokens, length, " ") for length in (3, 2)):
+        candidates.update(_fts_candidates(db, match))
+    ids = _rerank(candidates.items(), normalized, exclude=set(), limit=limit)
+    if ids:
+        return ids
+
+    # Last resort: short prefixes of any token (typo early in one of the words)
+    return _rerank(_fts_candidates(db, _prefix_match(tokens, 3, " OR ")), normalized, exclude=set(), limit=limit)
+
+
+def _prefix_match(tokens: List[str], length: int, operator: str) -> str:
+    return operator.join(f'"{prefix}"*' for prefix in sorted({token[:length] for token in tokens}))
+
+
+def _rerank(candidates, normalized: str, exclude: set, limit: int, min_score: float = FUZZY_MIN_SCORE) -> List[int]:
+    # The query is seq2, whose match index SequenceMatcher builds once and reuses;
+    # names repeat a lot, so each distinct name is scored once
+    matcher = difflib.SequenceMatcher(None, b=normalized)
+    scores: Dict[str, float] = {}
+    scored: List[Tuple[float, int]] = []
+    for patient_id, full_name in candidates:
+        if patient_id in exclude:
+            continue
+        score = scores.get(full_name)
+        if score is None:
+            matcher.set_seq1(normalize_name(full_name))
+            # quick_ratio is a cheap upper bound of ratio
+            score = matcher.ratio() if matcher.quick_ratio() >= min_score else 0.0
+            scores[full_name] = score
+        if score >= min_score:
+            scored.append((score, patient_id))
+    scored.sort(key=lambda item: -item[0])
+    return [patient_id for _, patient_id in scored[:limit]]
+
+
+def _postgres_search(db: Session, normalized: str, limit: int) -> List[int]:
+    rows = db.execute(
+        text(
+            "SELECT id FROM patients "
+            "WHERE patient_name_key(full_name) LIKE :prefix ESCAPE '\\' OR patient_name_key(full_name) % :query "
+            "ORDER BY similarity(patient_name_key(full_name), :query) DESC LIMIT :limit"
+        ),
+        {"prefix": escape_like(normalized) + "%", "query": normalized, "limit": limit}
+    ).all()
+    return [row[0] for row in rows]
+
+
+def _like_search(db: Session, query: str, limit: int) -> List[int]:
+    pattern = f"%{escape_like(query)}%"
+    rows = db.query(Patient.id).filter(Patient.full_name.ilike(pattern, escape="\\")).limit(limit).all()
+    return [row[0] for row in rows]
+
+
+def search_patients_by_name(db: Session, query: str, limit: int = 20) -> List[Patient]:
+    """Return patients whose name best matches the query, best first"""
+    normalized = normalize_name(query)
+    if not normalized:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    try:
+        if dialect == "sqlite":
+            ids = _sqlite_search(db, normalized, limit)
+        elif dialect == "postgresql":
+            ids = _postgres_search(db, normalized, limit)
+        else:
+            ids = _like_search(db, query, limit)
+    except Exception as e:
+        logger.warning(f"Name search index query failed, falling back to LIKE: {e}")
+        db.rollback()
+        ids = _like_search(db, query, limit)
+
+    if not ids:
+        return []
+
+    patients = {patient.id: patient for patient in db.query(Patient).filter(Patient.id.in_(ids)).all()}
+    return [patients[patient_id] for patient_id in ids if patient_id in patients]
@@ -4,35 +4,191 @@ RAG 问答服务模块
 """
 
 try:
-    from langchain_text_splitters import RecursiveCharacterTextSplitter
-except ImportError:
-    from langchain.text_splitter import RecursiveCharacterTextSplitter
-
-try:
-    from langchain_community.embeddings import OllamaEmbeddings
     from langchain_community.vectorstores import Chroma
     from langchain_community.llms import Ollama
 except ImportError:
     print("Warning: langchain_community not available")
-    OllamaEmbeddings = None
     Chroma = None
     Ollama = None
 
+import asyncio
+import functools
+import hashlib
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import AsyncIterator, Callable, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.answer_cache import SemanticAnswerCache
+from app.services.chat_sessions import ChatSessionStore, is_follow_up, rewrite_follow_up
+from app.services.common_answers import CommonAnswerStore
+from app.services.context_builder import build_context
+from app.services.embedding_service import create_embeddings, embed_queries, embedding_model_id, embedding_slug
+from app.services.knowledge_ingestion import IngestionReport, collect_sources, split_sources, sync_vectorstore
+from app.services.knowledge_translation import language_slug, translated_documents, translations_fingerprint
+from app.services.vector_index import NumpyVectorIndex
+from app.utils.question_classifier import classify_question
+from app.services.bm25_index import BM25Index, reciprocal_rank_fusion
+
+# 检索与 LLM 调用都是阻塞的，放到有界线程池中执行
+_rag_executor = ThreadPoolExecutor(
+    max_workers=settings.RAG_MAX_CONCURRENCY,
+    thread_name_prefix="rag"
+)
+
+
+async def run_in_rag_pool(func: Callable, *args, **kwargs):
+    """在 RAG 线程池中执行阻塞调用"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_rag_executor, functools.partial(func, *args, **kwargs))
+
+
+async def iterate_in_rag_pool(func: Callable[..., Iterator], *args) -> AsyncIterator:
+    """在 RAG 线程池中消费同步迭代器（如 llm.stream），逐项异步返回"""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    cancelled = threading.Event()
+    done = object()
+
+    def produce():
+        try:
+            for item in func(*args):
+                if cancelled.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+
+    future = loop.run_in_executor(_rag_executor, produce)
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # 客户端断开时通知生产线程停止生成
+        cancelled.set()
+
+
+# 近似问题的答案缓存
+answer_cache = SemanticAnswerCache(
+    max_entries=settings.RAG_ANSWER_CACHE_SIZE,
+    ttl_seconds=settings.RAG_ANSWER_CACHE_TTL,
+    threshold=settings.RAG_ANSWER_CACHE_THRESHOLD
+)
+
+# 常见问题的预生成答案
+common_answers = CommonAnswerStore()
+
+# 聊天窗口的会话（追问的上下文）
+chat_sessions = ChatSessionStore(
+    max_sessions=settings.RAG_CHAT_MAX_SESSIONS,
+    ttl_seconds=settings.RAG_CHAT_SESSION_TTL,
+    history_tokens=settings.RAG_CHAT_HISTORY_TOKENS
+)
+
+# 提示词中对话历史的标签
+HISTORY_LABELS = {
+    "en": ("Previous conversation", "Patient", "Assistant"),
+    "es": ("Previous conversation", "Patient", "Assistant"),
+    "fr": ("Conversation précédente", "Patient", "Assistant"),
+    "zh-TW": ("先前的對話", "病人", "助理"),
+}
+
+
+def knowledge_version(documents: list, extra: str = "") -> str:
+    """知识库片段 + 译文 + 嵌入模型 + LLM 的版本哈希"""
+    digest = hashlib.sha256()
+    digest.update(f"{embedding_model_id()}\0{settings.RAG_LLM_MODEL}\0{extra}".encode("utf-8"))
+    for doc in documents:
+        digest.update(b"\0" + doc.page_content.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _vector_candidates(bm25: Optional[BM25Index], k: int, mode: str) -> int:
+    # hybrid 两路各多取一些候选，再按排名融合
+    return k if mode == "vector" or bm25 is None else max(k * 3, 10)
+
+
+def search_documents(vectorstore, bm25: Optional[BM25Index], question: str, k: int = 3,
+                     mode: Optional[str] = None, vector_hits: Optional[list] = None) -> list:
+    """
+    按检索模式查询知识库
+
+    mode: vector（向量相似度）、bm25（关键词）或 hybrid（两者 RRF 融合），默认取配置
+    vector_hits: 已批量算好的向量检索结果（按相似度排序），提供时不再逐个查询向量库
+    """
+    mode = mode or settings.RAG_RETRIEVAL_MODE
+    candidates = _vector_candidates(bm25, k, mode)
+
+    def vector_search(n: int) -> list:
+        if vector_hits is not None:
+            return vector_hits[:n]
+        return vectorstore.similarity_search(question, k=n)
+
+    if mode == "vector" or bm25 is None:
+        return vector_search(k)
+    if mode == "bm25":
+        return bm25.search(question, k=k) or vector_search(k)
+
+    return reciprocal_rank_fusion(
+        [vector_search(candidates), bm25.search(question, k=candidates)],
+        k=k
+    )
+
+
+def search_documents_batch(vectorstore, bm25: Optional[BM25Index], questions: List[str], vectors: list,
+                           k: int = 3, mode: Optional[str] = None) -> List[list]:
+    """
+    批量检索：向量部分对所有问题做一次矩阵运算（Chroma 逐个按向量查询）
+
+    vectors 为与 questions 对应的查询向量
+    """
+    mode = mode or settings.RAG_RETRIEVAL_MODE
+    candidates = _vector_candidates(bm25, k, mode)
+    if isinstance(vectorstore, NumpyVectorIndex):
+        hits = vectorstore.similarity_search_by_vectors(vectors, k=candidates)
+    else:
+        hits = [vectorstore.similarity_search_by_vector(vector, k=candidates) for vector in vectors]
+    return [
+        search_documents(vectorstore, bm25, question, k=k, mode=mode, vector_hits=vector_hits)
+        for question, vector_hits in zip(questions, hits)
+    ]
 
 
 class AnesthesiaRAG:
-    def __init__(self):
+    def __init__(self, progress: Optional[Callable[[str], None]] = None):
         self.llm = None
         self.embedding = None
         self.vectorstore_en = None
-        self.vectorstore_zh = None
+        self.bm25_en = None
+        # 其他语言的 (向量库, BM25)，首次使用该语言时才加载
+        self.language_indexes = {}
+        self._documents_en = []
+        self.knowledge_version = None
+        self._ingest_lock = threading.Lock()
+        self._language_lock = threading.Lock()
+        self._backend = settings.RAG_VECTOR_BACKEND
+        self._persist_dir_en = None
+        self._knowledge_dir = None
+        self._progress = progress or (lambda stage: None)
 
         try:
             if Ollama is not None:
-                self.llm = Ollama(model="llama3:8b", temperature=0.3)
-                self.embedding = OllamaEmbeddings(model="llama3:8b")
+                self._progress("loading_llm")
+                self.llm = Ollama(model=settings.RAG_LLM_MODEL, base_url=settings.OLLAMA_URL, temperature=0.3)
+                self._progress("loading_embeddings")
+                # 专用的小型嵌入模型，按内容哈希缓存向量
+                self.embedding = create_embeddings()
+                self._progress("loading_vectorstore")
                 self.initialize_vectorstores()
             else:
                 print("⚠️  Ollama not available")
@@ -42,74 +198,202 @@ class AnesthesiaRAG:
     def initialize_vectorstores(self):
         """初始化向量数据库"""
         try:
-            from app.utils.knowledge_base_en import ANESTHESIA_KNOWLEDGE_EN
-
             # 创建数据目录
             base_dir = Path(__file__).parent.parent.parent.parent
-            persist_dir_en = base_dir / "data" / "chroma_db_en"
-            persist_dir_en.mkdir(parents=True, exist_ok=True)
-
-            persist_dir_en_str = str(persist_dir_en)
+            self._persist_dir_en = self._persist_dir("en")
+            self._knowledge_dir = Path(settings.RAG_KNOWLEDGE_DIR) if settings.RAG_KNOWLEDGE_DIR else base_dir / "data" / "knowledge"
 
             # 检查是否已存在向量数据库
-            if os.path.exists(persist_dir_en_str) and os.listdir(persist_dir_en_str):
-                try:
-                    self.vectorstore_en = Chroma(
-                        persist_directory=persist_dir_en_str,
-                        embedding_function=self.embedding
-                    )
-                    print("✅ 已加载现有向量数据库")
-                except:
-                    print("⚠️  加载现有数据库失败，将创建新的")
-                    self.vectorstore_en = None
+            self.vectorstore_en = self._load_vectorstore(self._backend, self._persist_dir_en)
 
-            if self.vectorstore_en is None:
-                # 创建新的向量数据库
-                text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=500,
-                    chunk_overlap=50,
-                    separators=["\n\n", "\n", ". ", " "]
-                )
-                texts_en = text_splitter.create_documents([ANESTHESIA_KNOWLEDGE_EN])
-                self.vectorstore_en = Chroma.from_documents(
-                    documents=texts_en,
-                    embedding=self.embedding,
-                    persist_directory=persist_dir_en_str
-                )
-                self.vectorstore_en.persist()
-                print("✅ 已创建新的向量数据库")
-
-            # 暂时只使用英文知识库
-            self.vectorstore_zh = self.vectorstore_en
+            # 与知识库对比，只嵌入新增或变更的片段
+            self._progress("building_index")
+            report = self.ingest_knowledge()
+            print(f"✅ 知识库已同步: +{report.added} -{report.removed} ={report.unchanged} chunks")
 
             print("✅ RAG 系统初始化成功")
         except Exception as e:
             print(f"⚠️  RAG 向量数据库初始化失败: {e}")
 
-    def answer_question(self, question: str, language: str = "en") -> dict:
-        """回答问题 - 支持多语言"""
+    def ingest_knowledge(self) -> IngestionReport:
+        """
+        增量导入知识库（启动时和管理接口调用）
 
-        # 如果 LLM 未初始化，返回错误信息
-        if not self.llm or not self.vectorstore_en:
-            return {
-                "answer": "RAG system is not available. Please make sure Ollama is running with llama3:8b model.",
-                "needs_doctor": True,
-                "category": "error",
-                "confidence": "low",
-                "source_documents": 0
-            }
+        新的向量库、BM25 索引和知识库版本构建完成后才替换，检索不会看到半成品
+        """
+        with self._ingest_lock:
+            start = time.perf_counter()
+            report = IngestionReport()
+            sources = collect_sources(self._knowledge_dir)
+            report.sources = [source for source, _ in sources]
+            documents = split_sources(sources)
 
+            if self.vectorstore_en is None:
+                # 创建新的向量数据库
+                vectorstore = self._build_vectorstore(self._backend, documents, self._persist_dir_en)
+                report.added = report.total_chunks = len(documents)
+                print("✅ 已创建新的向量数据库")
+            else:
+                vectorstore = sync_vectorstore(self.vectorstore_en, documents, report)
+
+            # 关键词索引在内存中预先计算，几十个片段只需几毫秒
+            bm25 = BM25Index(documents)
+            version = knowledge_version(documents, translations_fingerprint(settings.knowledge_languages))
+
+            self.vectorstore_en = vectorstore
+            self.bm25_en = bm25
+            self._documents_en = documents
+            # 其他语言的索引在下次使用时按新的片段重新同步
+            self.language_indexes = {}
+
+            # 知识库或模型变化时，已缓存的答案全部作废
+            if version != self.knowledge_version:
+                self.knowledge_version = version
+                answer_cache.set_version(version)
+                loaded = common_answers.load(version)
+                print(f"✅ 已加载 {loaded} 个预生成的常见问题答案")
+
+            report.elapsed_seconds = time.perf_counter() - start
+            return report
+
+    def _persist_dir(self, language: str) -> str:
+        # 每个语言、每个嵌入模型使用独立的向量库，切换模型不会混用不同维度的向量
+        store_name = "chroma_db" if self._backend == "chroma" else "numpy_index"
+        base_dir = Path(__file__).parent.parent.parent.parent
+        persist_dir = base_dir / "data" / f"{store_name}_{language_slug(language)}_{embedding_slug()}"
+        persist_dir.mkdir(parents=True, exist_ok=True)
+        return str(persist_dir)
+
+    def _language_index(self, language: str):
+        """
+        返回该语言的 (向量库, BM25 索引)
+
+        有译文的语言首次使用时加载（NumPy 索引为内存映射）并与当前片段同步；
+        没有译文的语言使用英文知识库（配合多语言嵌入模型时仍可跨语言检索）
+        """
+        if language == "en" or language not in settings.knowledge_languages:
+            return self.vectorstore_en, self.bm25_en
+        index = self.language_indexes.get(language)
+        if index is not None:
+            return index
+
+        with self._language_lock:
+            if language not in self.language_indexes:
+                self.language_indexes[language] = self._load_language_index(language)
+            return self.language_indexes[language]
+
+    def _load_language_index(self, language: str):
+        documents = translated_documents(self._documents_en, language)
+        translated = sum(1 for doc in documents if doc.metadata["language"] == language)
+        if not translated:
+            return self.vectorstore_en, self.bm25_en
+
+        persist_dir = self._persist_dir(language)
+        vectorstore = self._load_vectorstore(self._backend, persist_dir)
+        report = IngestionReport()
+        if vectorstore is None:
+            vectorstore = self._build_vectorstore(self._backend, documents, persist_dir)
+            report.added = len(documents)
+        else:
+            vectorstore = sync_vectorstore(vectorstore, documents, report)
+        print(f"✅ 已加载 {language} 知识库: {translated}/{len(documents)} chunks translated, +{report.added} -{report.removed}")
+        return vectorstore, BM25Index(documents)
+
+    def _load_vectorstore(self, backend: str, persist_dir: str):
+        """加载已存在的向量数据库，不存在或损坏时返回 None"""
         try:
-            # 检索相关文档
-            vectorstore = self.vectorstore_en if language == "en" else self.vectorstore_zh
-            docs = vectorstore.similarity_search(question, k=3)
-
-            # 构建上下文
-            context = "\n\n".join([doc.page_content for doc in docs])
-
-            # 构建提示词
-            if language == "en":
-                prompt = f"""You are a professional anesthesiologist. Answer the following question in English based on the provided context.
+            if backend == "chroma":
+                if os.path.exists(persist_dir) and os.listdir(persist_dir):
+                    store = Chroma(persist_directory=persist_dir, embedding_function=self.embedding)
+                    print("✅ 已加载现有向量数据库")
+                    return store
+            elif NumpyVectorIndex.exists(persist_dir):
+                store = NumpyVectorIndex.load(persist_dir, self.embedding)
+                print(f"✅ 已加载现有向量索引 ({len(store.documents)} chunks)")
+                return store
+        except Exception:
+            print("⚠️  加载现有数据库失败，将创建新的")
+        return None
+
+    def _build_vectorstore(self, backend: str, documents: list, persist_dir: str):
+        """嵌入文档并创建向量数据库"""
+        if backend == "chroma":
+            store = Chroma.from_documents(
+                documents=documents,
+                embedding=self.embedding,
+                ids=[doc.metadata["id"] for doc in documents],
+                persist_directory=persist_dir
+            )
+            store.persist()
+            return store
+        return NumpyVectorIndex.from_documents(
+            documents, self.embedding, persist_directory=persist_dir,
+            ids=[doc.metadata["id"] for doc in documents]
+        )
+
+    def is_available(self) -> bool:
+        """LLM 与向量数据库是否可用"""
+        return bool(self.llm and self.vectorstore_en)
+
+    def _unavailable_result(self) -> dict:
+        return {
+            "answer": f"RAG system is not available. Please make sure Ollama is running with {settings.RAG_LLM_MODEL} model.",
+            "needs_doctor": True,
+            "category": "error",
+            "confidence": "low",
+            "source_documents": 0
+        }
+
+    def _error_result(self, error: Exception) -> dict:
+        return {
+            "answer": f"Error processing question: {str(error)}",
+            "needs_doctor": True,
+            "category": "error",
+            "confidence": "low",
+            "source_documents": 0
+        }
+
+    def retrieve(self, question: str, language: str = "en", k: Optional[int] = None,
+                 mode: Optional[str] = None) -> list:
+        """
+        检索相关文档（按问题语言选择知识库）
+
+        先取 k 个候选（默认 RAG_CONTEXT_CANDIDATES），重排、合并重叠后按 token 预算返回
+        """
+        vectorstore, bm25 = self._language_index(language)
+        docs = search_documents(vectorstore, bm25, question, k=k or settings.RAG_CONTEXT_CANDIDATES, mode=mode)
+        return build_context(question, docs, bm25)
+
+    def retrieve_batch(self, items: List[Tuple[str, str]], vectors: list, k: Optional[int] = None,
+                       mode: Optional[str] = None) -> List[list]:
+        """批量检索 [(问题, 语言)]，同一语言的问题共用一次矩阵运算"""
+        by_language = {}
+        for position, (question, language) in enumerate(items):
+            by_language.setdefault(language, []).append(position)
+
+        results: List[list] = [[] for _ in items]
+        for language, positions in by_language.items():
+            vectorstore, bm25 = self._language_index(language)
+            docs = search_documents_batch(
+                vectorstore, bm25,
+                [items[position][0] for position in positions],
+                [vectors[position] for position in positions],
+                k=k or settings.RAG_CONTEXT_CANDIDATES, mode=mode
+            )
+            for position, found in zip(positions, docs):
+                results[position] = build_context(items[position][0], found, bm25)
+        return results
+
+    def build_prompt(self, question: str, docs: list, language: str = "en",
+                     history: Optional[List[Tuple[str, str]]] = None) -> str:
+        """根据检索结果（和追问时的对话历史）构建提示词"""
+        # 构建上下文
+        context = "\n\n".join([doc.page_content for doc in docs])
+        conversation = self._format_history(history, language)
+
+        # 构建提示词
+        if language == "en":
+            prompt = f"""You are a professional anesthesiologist. Answer the following question in English based on the provided context.
 
 Requirements:
 1. Use simple, clear language that patients can understand
@@ -118,108 +402,503 @@ Requirements:
 4. Base your answer on the provided context
 5. Keep answers concise (2-3 paragraphs maximum)
 
-Context:
+{conversation}Context:
 {context}
 
 Question: {question}
 
 Answer:"""
-            elif language == "es":
-                prompt = f"""You are a professional anesthesiologist. Answer the following question in Spanish based on the provided context.
+        elif language == "es":
+            prompt = f"""You are a professional anesthesiologist. Answer the following question in Spanish based on the provided context.
 
-Context:
+{conversation}Context:
 {context}
 
 Question: {question}
 
 Answer:"""
-            elif language == "fr":
-                prompt = f"""Vous êtes un anesthésiste professionnel. Répondez à la question suivante en français.
+        elif language == "fr":
+            prompt = f"""Vous êtes un anesthésiste professionnel. Répondez à la question suivante en français.
 
-Context:
+{conversation}Context:
 {context}
 
 Question: {question}
 
 Réponse:"""
-            else:  # zh-TW
-                prompt = f"""你是一位專業的麻醉醫師。請用繁體中文回答以下問題。
+        else:  # zh-TW
+            prompt = f"""你是一位專業的麻醉醫師。請用繁體中文回答以下問題。
 
-上下文：
+{conversation}上下文：
 {context}
 
 問題：{question}
 
 回答："""
 
-            # 获取答案
-            answer = self.llm.invoke(prompt)
+        return prompt
+
+    @staticmethod
+    def _format_history(history: Optional[List[Tuple[str, str]]], language: str) -> str:
+        if not history:
+            return ""
+        title, patient, assistant = HISTORY_LABELS.get(language, HISTORY_LABELS["en"])
+        lines = [f"{title}:"]
+        for question, answer in history:
+            lines += [f"{patient}: {question}", f"{assistant}: {answer}"]
+        return "\n".join(lines) + "\n\n"
+
+    def _start_turn(self, question: str, language: str, session_id: str):
+        """
+        取得会话并判断是否为追问
+
+        返回 (会话 id, 检索用的独立问题, 提示词中的对话历史)；
+        不是追问时历史为空，可以使用预生成答案和语义缓存
+        """
+        session_id, history, topic = chat_sessions.start_turn(session_id, language)
+        if history and is_follow_up(question, language):
+            return session_id, rewrite_follow_up(topic, question), history
+        return session_id, question, []
+
+    @staticmethod
+    def _finish_turn(session_id: str, question: str, language: str, query: str, history: list, result: dict) -> dict:
+        """记录这一轮问答（独立问题成为新的会话话题），返回带会话 id 的结果"""
+        if result.get("answer"):
+            chat_sessions.add_turn(session_id, language, question, result["answer"],
+                                   topic=None if history else query)
+        return {**result, "session_id": session_id}
+
+    def _build_result(self, answer: str, question: str, language: str, docs: list) -> dict:
+        """组装回答结果"""
+        # 一次扫描同时判断是否需要医师介入和问题分类
+        classification = classify_question(question, language)
+        needs_doctor = classification["needs_doctor"]
+        category = classification["category"]
+
+        # 计算信心度
+        confidence = "high" if len(docs) >= 2 else "medium"
+
+        return {
+            "answer": answer,
+            "needs_doctor": needs_doctor,
+            "category": category,
+            "confidence": confidence,
+            "source_documents": len(docs)
+        }
+
+    def answer_question(self, question: str, language: str = "en", retrieval_mode: Optional[str] = None,
+                        session_id: Optional[str] = None) -> dict:
+        """
+        回答问题 - 支持多语言（同步版本，供脚本使用）
+
+        session_id 为 None 时不使用会话；"" 开始新会话，结果中带 session_id
+        """
+
+        # 如果 LLM 未初始化，返回错误信息
+        if not self.is_available():
+            return self._unavailable_result()
 
-            # 判断是否需要医师介入
-            needs_doctor = self._check_needs_doctor(question, language)
+        try:
+            query, history = question, []
+            if session_id is not None:
+                session_id, query, history = self._start_turn(question, language, session_id)
+
+            # 近似问题已回答过时直接返回缓存（追问的回答依赖上文，不使用缓存）
+            vector, result = (None, None) if history else self.lookup_cached_answer(question, language, retrieval_mode)
+            if not result:
+                docs = self.retrieve(query, language, mode=retrieval_mode)
+                prompt = self.build_prompt(question, docs, language, history)
+
+                # 获取答案
+                answer = self.llm.invoke(prompt)
+
+                result = self._build_result(answer, query, language, docs)
+                self.store_answer(vector, question, language, retrieval_mode, result)
+            if session_id is None:
+                return result
+            return self._finish_turn(session_id, question, language, query, history, result)
+        except Exception as e:
+            return self._error_result(e)
 
-            # 分类问题
-            category = self._categorize_question(question, language)
+    async def aanswer_question(self, question: str, language: str = "en", retrieval_mode: Optional[str] = None,
+                               session_id: Optional[str] = None) -> dict:
+        """
+        回答问题 - 异步版本，检索和生成在有界线程池中执行，不阻塞事件循环
 
-            # 计算信心度
-            confidence = "high" if len(docs) >= 2 else "medium"
+        session_id 为 None 时不使用会话；"" 开始新会话，结果中带 session_id
+        """
+        if not self.is_available():
+            return self._unavailable_result()
 
-            return {
-                "answer": answer,
-                "needs_doctor": needs_doctor,
-                "category": category,
-                "confidence": confidence,
-                "source_documents": len(docs)
-            }
+        query, history = question, []
+        if session_id is not None:
+            session_id, query, history = self._start_turn(question, language, session_id)
+
+        def finish(result: dict) -> dict:
+            if session_id is None:
+                return result
+            return self._finish_turn(session_id, question, language, query, history, result)
+
+        # 常见问题直接返回预生成答案，不进入线程池（追问的回答依赖上文，不使用缓存）
+        precomputed = None if history else common_answers.get(language, question)
+        if precomputed:
+            return finish(precomputed)
+
+        try:
+            vector, cached = None, None
+            if not history:
+                vector, cached = await run_in_rag_pool(self.lookup_cached_answer, question, language, retrieval_mode)
+            if cached:
+                return finish(cached)
+
+            docs = await run_in_rag_pool(self.retrieve, query, language, mode=retrieval_mode)
+            prompt = self.build_prompt(question, docs, language, history)
+            answer = await run_in_rag_pool(self.llm.invoke, prompt)
+            result = self._build_result(answer, query, language, docs)
+            self.store_answer(vector, question, language, retrieval_mode, result)
+            return finish(result)
         except Exception as e:
+            return self._error_result(e)
+
+    async def astream_answer(self, question: str, language: str = "en", retrieval_mode: Optional[str] = None,
+                             session_id: Optional[str] = None) -> AsyncIterator[dict]:
+        """
+        流式回答
+
+        先返回检索元数据（分类、是否需要医师、来源数量、使用会话时的 session_id），再逐个返回 LLM token
+        """
+        if not self.is_available():
+            result = self._unavailable_result()
+            yield {"event": "meta", "data": self._result_meta(result)}
+            yield {"event": "token", "data": {"text": result["answer"]}}
+            yield {"event": "done", "data": {}}
+            return
+
+        try:
+            query, history = question, []
+            if session_id is not None:
+                session_id, query, history = self._start_turn(question, language, session_id)
+
+            cached = None if history else common_answers.get(language, question)
+            vector = None
+            if not cached and not history:
+                vector, cached = await run_in_rag_pool(self.lookup_cached_answer, question, language, retrieval_mode)
+            if cached:
+                if session_id is not None:
+                    cached = self._finish_turn(session_id, question, language, query, history, cached)
+                yield {"event": "meta", "data": self._result_meta(cached)}
+                yield {"event": "token", "data": {"text": cached["answer"]}}
+                yield {"event": "done", "data": {}}
+                return
+
+            docs = await run_in_rag_pool(self.retrieve, query, language, mode=retrieval_mode)
+            result = self._build_result("", query, language, docs)
+            meta = self._result_meta(result)
+            if session_id is not None:
+                meta["session_id"] = session_id
+            yield {"event": "meta", "data": meta}
+
+            prompt = self.build_prompt(question, docs, language, history)
+            chunks = []
+            async for chunk in iterate_in_rag_pool(self.llm.stream, prompt):
+                chunks.append(chunk)
+                yield {"event": "token", "data": {"text": chunk}}
+            yield {"event": "done", "data": {}}
+
+            # 只缓存完整生成的回答（客户端中途断开时不会执行到这里）
+            result["answer"] = "".join(chunks)
+            self.store_answer(vector, question, language, retrieval_mode, result)
+            if session_id is not None:
+                self._finish_turn(session_id, question, language, query, history, result)
+        except Exception as e:
+            yield {"event": "error", "data": {"message": f"Error processing question: {str(e)}"}}
+
+    def _prepare_batch(self, items: List[Tuple[str, str]], retrieval_mode: Optional[str]):
+        """
+        批量回答的准备阶段：一次计算全部问题的嵌入，查语义缓存，未命中的批量检索
+
+        返回每个问题的 (向量, 缓存结果或 None, 检索到的文档)
+        """
+        vectors = embed_queries(self.embedding, [question for question, _ in items])
+        bucket_mode = retrieval_mode or settings.RAG_RETRIEVAL_MODE
+        cached = [
+            self._reclassify(question, language, answer_cache.get((language, bucket_mode), vector))
+            if answer_cache.enabled else None
+            for (question, language), vector in zip(items, vectors)
+        ]
+        misses = [position for position, result in enumerate(cached) if result is None]
+        docs = self.retrieve_batch(
+            [items[position] for position in misses], [vectors[position] for position in misses], mode=retrieval_mode
+        )
+        retrieved = dict(zip(misses, docs))
+        return [(vector, cached[position], retrieved.get(position, [])) for position, vector in enumerate(vectors)]
+
+    async def abatch_answer(self, items: List[Tuple[str, str]], retrieval_mode: Optional[str] = None,
+                            concurrency: Optional[int] = None) -> AsyncIterator[dict]:
+        """
+        批量回答 [(问题, 语言)]，按完成顺序逐条返回
+
+        嵌入一次批量计算、检索每种语言一次矩阵运算，LLM 生成最多同时进行 concurrency 个
+        （默认 RAG_BATCH_CONCURRENCY）。每条结果带 index、source（precomputed / cache /
+        generated / error）与耗时；最后返回一条 summary
+        """
+        started = time.perf_counter()
+        counts = {"precomputed": 0, "cache": 0, "generated": 0, "error": 0}
+
+        def elapsed_ms(since: float) -> float:
+            return round((time.perf_counter() - since) * 1000, 1)
+
+        def item_result(index: int, source: str, result: dict, timing: dict) -> dict:
+            counts[source] += 1
+            question, language = items[index]
             return {
-                "answer": f"Error processing question: {str(e)}",
-                "needs_doctor": True,
-                "category": "error",
-                "confidence": "low",
-                "source_documents": 0
+                "type": "result", "index": index, "question": question, "language": language,
+                "source": source, **result, "timing": {**timing, "total_ms": elapsed_ms(started)}
             }
 
-    def _check_needs_doctor(self, question: str, language: str) -> bool:
-        """检查是否需要医师介入"""
-        try:
-            from app.utils.knowledge_base_en import DOCTOR_INTERVENTION_KEYWORDS_EN
-            keywords = DOCTOR_INTERVENTION_KEYWORDS_EN
-        except:
-            keywords = [
-                "allergic", "allergy", "heart", "pregnant", "medication",
-                "medical history", "worried", "concerned"
-            ]
-
-        question_lower = question.lower()
-        return any(keyword.lower() in question_lower for keyword in keywords)
-
-    def _categorize_question(self, question: str, language: str) -> str:
-        """分类问题"""
+        def summary() -> dict:
+            return {"type": "summary", "count": len(items), "sources": counts, "total_ms": elapsed_ms(started)}
+
+        if not self.is_available():
+            for index in range(len(items)):
+                yield item_result(index, "error", self._unavailable_result(), {})
+            yield summary()
+            return
+
+        # 常见问题直接返回预生成答案
+        pending = []
+        for index, (question, language) in enumerate(items):
+            precomputed = common_answers.get(language, question)
+            if precomputed:
+                yield item_result(index, "precomputed", precomputed, {})
+            else:
+                pending.append(index)
+        if not pending:
+            yield summary()
+            return
+
+        prepare_started = time.perf_counter()
         try:
-            from app.utils.knowledge_base_en import FAQ_CATEGORIES_EN
-            categories = FAQ_CATEGORIES_EN
-        except:
-            categories = {
-                "safety": ["safe", "risk", "danger"],
-                "pain": ["pain", "hurt"],
-                "side_effects": ["side effect", "nausea"],
-                "process": ["process", "how", "what happens"],
-            }
+            prepared = await run_in_rag_pool(self._prepare_batch, [items[index] for index in pending], retrieval_mode)
+        except Exception as e:
+            for index in pending:
+                yield item_result(index, "error", self._error_result(e), {})
+            yield summary()
+            return
+        retrieval_ms = elapsed_ms(prepare_started)
+
+        to_generate = []
+        for index, (vector, cached, docs) in zip(pending, prepared):
+            if cached:
+                yield item_result(index, "cache", cached, {"retrieval_ms": retrieval_ms})
+            else:
+                to_generate.append((index, vector, docs))
 
-        question_lower = question.lower()
-        for category, keywords in categories.items():
-            if any(keyword.lower() in question_lower for keyword in keywords):
-                return category
-        return "general"
+        semaphore = asyncio.Semaphore(max(1, concurrency or settings.RAG_BATCH_CONCURRENCY))
+
+        async def generate(index: int, vector, docs: list):
+            question, language = items[index]
+            queued = time.perf_counter()
+            async with semaphore:
+                generation_started = time.perf_counter()
+                try:
+                    prompt = self.build_prompt(question, docs, language)
+                    answer = await run_in_rag_pool(self.llm.invoke, prompt)
+                    result = self._build_result(answer, question, language, docs)
+                    self.store_answer(vector, question, language, retrieval_mode, result)
+                    source = "generated"
+                except Exception as e:
+                    result = self._error_result(e)
+                    source = "error"
+            return item_result(index, source, result, {
+                "retrieval_ms": retrieval_ms,
+                "queued_ms": round((generation_started - queued) * 1000, 1),
+                "generation_ms": elapsed_ms(generation_started),
+            })
+
+        tasks = [asyncio.ensure_future(generate(index, vector, docs)) for index, vector, docs in to_generate]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # 客户端断开时取消尚未开始的生成
+            for task in tasks:
+                task.cancel()
+        yield summary()
+
+    def lookup_cached_answer(self, question: str, language: str, retrieval_mode: Optional[str] = None):
+        """
+        查找预生成答案和语义缓存
+
+        返回 (问题向量, 缓存的结果或 None)；命中常见问题或缓存关闭时不计算嵌入
+        """
+        precomputed = common_answers.get(language, question)
+        if precomputed:
+            return None, self._reclassify(question, language, precomputed)
+        if not answer_cache.enabled:
+            return None, None
+        vector = self.embedding.embed_query(question)
+        bucket = (language, retrieval_mode or settings.RAG_RETRIEVAL_MODE)
+        return vector, self._reclassify(question, language, answer_cache.get(bucket, vector))
+
+    @staticmethod
+    def _reclassify(question: str, language: str, cached: Optional[dict]) -> Optional[dict]:
+        """
+        缓存命中的是另一个（相近的）问题：只沿用答案文本，
+        needs_doctor（安全标记）和 category 按当前问题重新判断
+        """
+        if cached is None:
+            return None
+        classification = classify_question(question, language)
+        cached["needs_doctor"] = classification["needs_doctor"]
+        cached["category"] = classification["category"]
+        return cached
+
+    def store_answer(self, vector, question: str, language: str, retrieval_mode: Optional[str], result: dict):
+        """缓存成功生成的回答"""
+        if vector is None or not result.get("answer"):
+            return
+        bucket = (language, retrieval_mode or settings.RAG_RETRIEVAL_MODE)
+        answer_cache.put(bucket, question, vector, result)
+
+    @staticmethod
+    def _result_meta(result: dict) -> dict:
+        return {key: value for key, value in result.items() if key != "answer"}
 
 
 # 全局实例
 rag_system = None
-
-def get_rag_system():
-    """获取 RAG 系统实例"""
+_rag_lock = threading.Lock()
+_warmup_task = None
+
+# 初始化状态: not_started -> loading -> ready / degraded / failed
+# degraded: 初始化完成但 LLM 或向量库不可用（如 Ollama 未启动）；degraded / failed 会定期重试
+rag_status = {
+    "state": "not_started",
+    "stage": None,
+    "error": None,
+    "attempts": 0,
+    "started_at": None,
+    "ready_at": None,
+    "finished_at": None,
+}
+# degraded / failed 之后两次重试之间至少间隔的秒数
+WARMUP_RETRY_SECONDS = 30
+
+
+def _set_stage(stage: str):
+    rag_status["stage"] = stage
+
+
+def get_rag_system(retry: bool = False):
+    """
+    获取 RAG 系统实例（首次调用时同步初始化）
+
+    retry=True 时，如果上次初始化结果为 degraded，会重新初始化
+    """
     global rag_system
-    if rag_system is None:
-        rag_system = AnesthesiaRAG()
+    if rag_system is None or (retry and rag_status["state"] == "degraded"):
+        with _rag_lock:
+            if rag_system is None or (retry and rag_status["state"] == "degraded"):
+                rag_status.update(
+                    state="loading", stage="starting", error=None, started_at=time.time(),
+                    finished_at=None, attempts=rag_status["attempts"] + 1
+                )
+                try:
+                    rag = AnesthesiaRAG(progress=_set_stage)
+                except Exception as e:
+                    rag_status.update(state="failed", stage=None, error=str(e), finished_at=time.time())
+                    raise
+                rag_system = rag
+                if rag.is_available():
+                    rag_status.update(state="ready", stage="ready", ready_at=time.time(), finished_at=time.time())
+                else:
+                    missing = [name for name, ok in (("LLM", rag.llm), ("vectorstore_en", rag.vectorstore_en)) if not ok]
+                    rag_status.update(
+                        state="degraded", stage=None, finished_at=time.time(),
+                        error=f"{', '.join(missing)} not available (is Ollama running with {settings.RAG_LLM_MODEL}?)"
+                    )
     return rag_system
+
+
+def is_rag_ready() -> bool:
+    """RAG 系统是否已初始化完成且可用"""
+    return rag_system is not None and rag_status["state"] == "ready"
+
+
+def get_rag_status() -> dict:
+    """返回初始化进度"""
+    status = dict(rag_status)
+    if status["started_at"]:
+        end = status["finished_at"] or time.time()
+        status["elapsed_seconds"] = round(end - status["started_at"], 1)
+    return status
+
+
+def refresh_common_answers(force: bool = False) -> int:
+    """为缺失或过期的常见问题生成答案（逐个生成，不占用多个 LLM 并发）"""
+    rag = get_rag_system()
+    if not rag.is_available():
+        return 0
+    return common_answers.build(rag.answer_question, force=force)
+
+
+def _schedule_common_answer_refresh():
+    if settings.RAG_PRECOMPUTE_COMMON_ANSWERS:
+        asyncio.get_running_loop().create_task(_refresh_common_answers_in_background())
+
+
+async def _refresh_common_answers_in_background():
+    try:
+        generated = await asyncio.to_thread(refresh_common_answers)
+        if generated:
+            print(f"✅ 已重新生成 {generated} 个常见问题答案")
+    except Exception as e:
+        print(f"⚠️  常见问题答案生成失败: {e}")
+
+
+async def reingest_knowledge() -> dict:
+    """重新导入知识库（不需要重启），知识库有变化时在后台重新生成常见问题答案"""
+    rag = get_rag_system()
+    if rag.embedding is None or rag._persist_dir_en is None:
+        raise RuntimeError("RAG system is not available")
+    previous_version = rag.knowledge_version
+    report = await run_in_rag_pool(rag.ingest_knowledge)
+    if rag.knowledge_version != previous_version:
+        _schedule_common_answer_refresh()
+    return {**report.to_dict(), "knowledge_version": rag.knowledge_version}
+
+
+async def warm_up_rag_system():
+    """在线程中初始化 RAG，不阻塞事件循环"""
+    try:
+        await asyncio.to_thread(get_rag_system, True)
+    except Exception as e:
+        print(f"⚠️  RAG 预热失败: {e}")
+        return
+    if rag_status["state"] != "ready":
+        print(f"⚠️  RAG 不可用，稍后重试: {rag_status['error']}")
+        return
+    print("✅ RAG 预热完成")
+
+    # 知识库或模型变化后，在后台重新生成常见问题答案
+    if settings.RAG_PRECOMPUTE_COMMON_ANSWERS:
+        await _refresh_common_answers_in_background()
+
+
+def start_rag_warmup():
+    """
+    启动后台预热（重复调用只会启动一次）
+
+    上次失败或不可用（degraded）时，距离上次结束超过 WARMUP_RETRY_SECONDS 才重试
+    """
+    global _warmup_task
+    if _warmup_task is not None and not _warmup_task.done():
+        return _warmup_task
+    state = rag_status["state"]
+    if state == "not_started" or (
+        state in ("failed", "degraded")
+        and time.time() - (rag_status["finished_at"] or 0) >= WARMUP_RETRY_SECONDS
+    ):
+        _warmup_task = asyncio.get_running_loop().create_task(warm_up_rag_system())
+    return _warmup_task
@@ -0,0 +1,325 @@
+"""
+字幕翻译后台任务
+把视频的 Subtitle 逐批送进 TranslationService.translate_batch（在线程中执行，
+不阻塞事件循环），按序号顺序批量写入 Translation（版本号递增），并记录进度。
+中断后再次启动会从最后一个已翻译的序号继续；重新翻译（retranslate）任务的进度
+保存在文件中，服务重启后也能继续。
+"""
+
+import asyncio
+import copy
+import json
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.video import Subtitle, Translation, Video
+from app.services.translation_service import TranslationService
+
+# TranslationService 出错时返回的占位文本，不能当作译文保存
+_ERROR_PREFIXES = ("[Translation Error:", "[Translation service not available]")
+
+# 未完成的重新翻译任务停在哪个序号（"视频 id:语言" -> 序号）
+RESUME_PATH = Path(__file__).parent.parent.parent.parent / "data" / "subtitle_translation_resume.json"
+
+_translation_service: Optional[TranslationService] = None
+_service_lock = threading.Lock()
+_resume_lock = threading.Lock()
+
+
+def get_translation_service() -> TranslationService:
+    """获取共用的翻译服务实例（只有 LLM 客户端，术语词典和翻译记忆由 load_job_translation_service 加载）"""
+    global _translation_service
+    if _translation_service is None:
+        with _service_lock:
+            if _translation_service is None:
+                _translation_service = TranslationService(model_name=settings.RAG_LLM_MODEL)
+    return _translation_service
+
+
+def load_job_translation_service() -> TranslationService:
+    """
+    为一个任务准备翻译服务：共用 LLM 客户端，重新加载术语词典和翻译记忆
+
+    每个任务使用自己的副本，之后审核通过的译文也能被重用，
+    同时运行的任务不会读到正在重建的术语自动机或翻译记忆
+    """
+    service = copy.copy(get_translation_service())
+    db = SessionLocal()
+    try:
+        service.load_terminology(db)
+        service.load_translation_memory(db)
+    finally:
+        db.close()
+    return service
+
+
+def _resume_key(video_id: int, language: str) -> str:
+    return f"{video_id}:{language}"
+
+
+def _load_resume_points() -> Dict[str, int]:
+    if not RESUME_PATH.exists():
+        return {}
+    try:
+        with open(RESUME_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  读取字幕翻译进度失败: {e}")
+        return {}
+
+
+def _save_resume_point(video_id: int, language: str, sequence: Optional[int]):
+    """记录（sequence 为 None 时清除）重新翻译任务的进度"""
+    with _resume_lock:
+        points = _load_resume_points()
+        key = _resume_key(video_id, language)
+        if sequence is None:
+            if key not in points:
+                return
+            points.pop(key)
+        else:
+            points[key] = sequence
+        RESUME_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = RESUME_PATH.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(points, f, indent=2)
+        tmp_path.replace(RESUME_PATH)
+
+
+def last_translated_sequence(db: Session, video_id: int, language: str) -> int:
+    """该视频在目标语言下已有译文的最大字幕序号（没有则为 0）"""
+    last = (
+        db.query(func.max(Subtitle.sequence))
+        .join(Translation, Translation.subtitle_id == Subtitle.id)
+        .filter(Subtitle.video_id == video_id, Translation.language == language)
+        .scalar()
+    )
+    return last or 0
+
+
+def pending_subtitles(db: Session, video_id: int, after_sequence: int) -> List[Tuple[int, int, str, str]]:
+    """序号大于 after_sequence 的字幕 (id, sequence, text, language)，按序号排列"""
+    return (
+        db.query(Subtitle.id, Subtitle.sequence, Subtitle.text, Subtitle.language)
+        .filter(Subtitle.video_id == video_id, Subtitle.sequence > after_sequence)
+        .order_by(Subtitle.sequence)
+        .all()
+    )
+
+
+def insert_translations(db: Session, language: str, rows: List[Tuple[int, dict]]) -> int:
+    """
+    批量写入译文草稿：每条字幕取该语言现有最大版本号 + 1
+
+    rows: [(subtitle_id, translate_segment 结果)]；由调用方提交事务
+    """
+    if not rows:
+        return 0
+    subtitle_ids = [subtitle_id for subtitle_id, _ in rows]
+    latest = dict(
+        db.query(Translation.subtitle_id, func.max(Translation.version))
+        .filter(Translation.subtitle_id.in_(subtitle_ids), Translation.language == language)
+        .group_by(Translation.subtitle_id)
+        .all()
+    )
+    db.execute(insert(Translation), [
+        {
+            "subtitle_id": subtitle_id,
+            "language": language,
+            "translated_text": result["text"],
+            "status": "draft",
+            "version": (latest.get(subtitle_id) or 0) + 1,
+            "notes": result.get("notes"),
+        }
+        for subtitle_id, result in rows
+    ])
+    return len(rows)
+
+
+class SubtitleTranslationJob:
+    """一个视频到一种语言的翻译任务及其进度"""
+
+    def __init__(self, video_id: int, target_language: str, retranslate: bool = False):
+        self.id = uuid.uuid4().hex
+        self.video_id = video_id
+        self.target_language = target_language
+        self.retranslate = retranslate
+        self.status = "queued"  # queued, running, completed, failed
+        self.total = 0
+        self.translated = 0
+        self.memory_hits = 0
+        self.resumed_from = 0
+        self.last_sequence = 0
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def to_dict(self) -> dict:
+        end = self.finished_at or time.time()
+        return {
+            "job_id": self.id,
+            "video_id": self.video_id,
+            "target_language": self.target_language,
+            "retranslate": self.retranslate,
+            "status": self.status,
+            "total": self.total,
+            "translated": self.translated,
+            "memory_hits": self.memory_hits,
+            "progress": round(self.translated / self.total, 4) if self.total else (1.0 if self.done else 0.0),
+            "resumed_from_sequence": self.resumed_from,
+            "last_sequence": self.last_sequence,
+            "error": self.error,
+            "elapsed_seconds": round(end - self.started_at, 1) if self.started_at else None,
+        }
+
+
+class SubtitleTranslationJobManager:
+    """
+    管理字幕翻译任务
+
+    同时运行的任务数由 max_jobs 限制，每个任务同时翻译 concurrency 批；
+    同一视频同一语言只保留一个进行中的任务，重复提交返回已有任务
+    """
+
+    def __init__(self, max_jobs: int = 1, concurrency: int = 2, max_finished: int = 100):
+        self.max_jobs = max(1, max_jobs)
+        self.concurrency = max(1, concurrency)
+        self.max_finished = max_finished
+        self._jobs: Dict[str, SubtitleTranslationJob] = {}
+        self._active: Dict[Tuple[int, str], SubtitleTranslationJob] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def get(self, job_id: str) -> Optional[SubtitleTranslationJob]:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self, video_id: Optional[int] = None) -> List[SubtitleTranslationJob]:
+        return [job for job in self._jobs.values() if video_id is None or job.video_id == video_id]
+
+    def start(self, video_id: int, target_language: str, retranslate: bool = False) -> SubtitleTranslationJob:
+        """提交任务（需要在事件循环中调用）"""
+        key = (video_id, target_language)
+        job = self._active.get(key)
+        if job is not None and not job.done:
+            return job
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_jobs)
+
+        job = SubtitleTranslationJob(video_id, target_language, retranslate)
+        self._jobs[job.id] = job
+        self._active[key] = job
+        self._prune()
+        job.task = asyncio.get_running_loop().create_task(self._run(job))
+        return job
+
+    def _prune(self):
+        finished = [job for job in self._jobs.values() if job.done]
+        for job in sorted(finished, key=lambda job: job.created_at)[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job.id]
+
+    async def _run(self, job: SubtitleTranslationJob):
+        async with self._semaphore:
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                await self._translate(job)
+                job.status = "completed"
+                if job.retranslate:
+                    await asyncio.to_thread(_save_resume_point, job.video_id, job.target_language, None)
+                print(f"✅ 视频 {job.video_id} 字幕翻译完成 ({job.target_language}): "
+                      f"{job.translated} 条，翻译记忆命中 {job.memory_hits} 条")
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)
+                print(f"❌ 视频 {job.video_id} 字幕翻译失败 ({job.target_language})，"
+                      f"停在序号 {job.last_sequence}: {e}")
+            finally:
+                job.finished_at = time.time()
+
+    async def _translate(self, job: SubtitleTranslationJob):
+        service = await asyncio.to_thread(load_job_translation_service)
+        subtitles = await asyncio.to_thread(self._load, job)
+        job.total = len(subtitles)
+        job.last_sequence = job.resumed_from
+
+        # 每批的大小与 translate_batch 的单个提示词一致；一轮并发翻译 concurrency 批，
+        # 按序号顺序提交，中断时已提交的部分都在 last_sequence 之前
+        size = max(1, settings.TRANSLATION_BATCH_SIZE)
+        chunks = [subtitles[start:start + size] for start in range(0, len(subtitles), size)]
+        for start in range(0, len(chunks), self.concurrency):
+            window = chunks[start:start + self.concurrency]
+            results = await asyncio.gather(
+                *(asyncio.to_thread(self._translate_chunk, service, chunk, job.target_language) for chunk in window),
+                return_exceptions=True
+            )
+            for chunk, result in zip(window, results):
+                if isinstance(result, BaseException):
+                    raise result
+                await asyncio.to_thread(self._save, job, chunk, result)
+
+    def _load(self, job: SubtitleTranslationJob):
+        db = SessionLocal()
+        try:
+            if db.query(Video.id).filter(Video.id == job.video_id).first() is None:
+                raise LookupError(f"Video {job.video_id} not found")
+            if job.retranslate:
+                job.resumed_from = _load_resume_points().get(_resume_key(job.video_id, job.target_language), 0)
+            else:
+                job.resumed_from = last_translated_sequence(db, job.video_id, job.target_language)
+            return pending_subtitles(db, job.video_id, job.resumed_from)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _translate_chunk(service: TranslationService, chunk, target_language: str) -> List[dict]:
+        # 同一视频的字幕通常是同一源语言，按源语言分组翻译
+        results: List[Optional[dict]] = [None] * len(chunk)
+        by_language: Dict[str, List[int]] = {}
+        for index, (_, _, _, language) in enumerate(chunk):
+            by_language.setdefault(language or "en", []).append(index)
+        for source_language, indexes in by_language.items():
+            translated = service.translate_batch(
+                [chunk[index][2] for index in indexes], target_language, source_language
+            )
+            for index, result in zip(indexes, translated):
+                if result["text"].startswith(_ERROR_PREFIXES):
+                    raise RuntimeError(f"Subtitle #{chunk[index][1]}: {result['text']}")
+                results[index] = result
+        return results
+
+    def _save(self, job: SubtitleTranslationJob, chunk, results: List[dict]):
+        db = SessionLocal()
+        try:
+            insert_translations(db, job.target_language, [
+                (subtitle_id, result) for (subtitle_id, _, _, _), result in zip(chunk, results)
+            ])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        job.translated += len(chunk)
+        job.memory_hits += sum(1 for result in results if result.get("origin") == "memory")
+        job.last_sequence = chunk[-1][1]
+        if job.retranslate:
+            _save_resume_point(job.video_id, job.target_language, job.last_sequence)
+
+
+subtitle_translation_jobs = SubtitleTranslationJobManager(
+    max_jobs=settings.TRANSLATION_MAX_JOBS,
+    concurrency=settings.TRANSLATION_JOB_CONCURRENCY
+)
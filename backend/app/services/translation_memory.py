@@ -0,0 +1,213 @@
+"""
+翻译记忆
+重复利用已审核通过的字幕译文：规范化文本或词序列完全相同时直接重用（跳过 LLM），
+字符三元组相似度（Dice）达到阈值的模糊匹配只作为待审核的建议——
+"do not eat" 与 "do eat" 字面很像，意思却相反，患者须知不能自动套用。
+"""
+
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.video import Subtitle, Translation
+
+_SPACE_RE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = " .,!?;:。，！？；：、…\"'「」『』()（）"
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)?")
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_segment(text: str) -> str:
+    """全半角统一、小写、合并空白、去掉首尾标点"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    return _SPACE_RE.sub(" ", text).strip(_EDGE_PUNCTUATION)
+
+
+def _key(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def _words_key(normalized: str) -> str:
+    """只保留词（忽略大小写和标点）"""
+    return " ".join(_WORD_RE.findall(normalized))
+
+
+def _trigrams(normalized: str) -> Counter:
+    padded = f"  {normalized} "
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class MemoryMatch:
+    """
+    一次翻译记忆命中
+
+    reusable 为 True（原文的词完全相同）时可直接使用译文；
+    否则只是模糊匹配的建议，需要人工审核
+    """
+
+    __slots__ = ("text", "score", "reusable", "translation_id", "subtitle_id", "version")
+
+    def __init__(self, text: str, score: float, reusable: bool, translation_id: Optional[int],
+                 subtitle_id: Optional[int], version: Optional[int]):
+        self.text = text
+        self.score = score
+        self.reusable = reusable
+        self.translation_id = translation_id
+        self.subtitle_id = subtitle_id
+        self.version = version
+
+    @property
+    def exact(self) -> bool:
+        return self.score >= 1.0
+
+    def note(self) -> str:
+        """写入 Translation.notes 的来源说明"""
+        source = f"translation #{self.translation_id}" if self.translation_id else "memory entry"
+        if self.subtitle_id:
+            source += f" (subtitle #{self.subtitle_id}, v{self.version})"
+        if self.exact:
+            return f"Translation memory: exact match of {source}"
+        if self.reusable:
+            return f"Translation memory: same wording as {source}"
+        return (f"Translation memory suggestion (review required): fuzzy match {self.score:.2f} "
+                f"of {source}: {self.text}")
+
+
+class _Entry:
+    __slots__ = ("key", "words", "grams", "size", "numbers", "text", "translation_id", "subtitle_id", "version")
+
+
+class TranslationMemory:
+    """
+    按 (源语言, 目标语言) 分桶的内存翻译记忆（线程安全）
+
+    模糊匹配通过三元组倒排索引（前缀过滤）只比较可能达到阈值的条目；
+    数字（剂量、时间）不同的句子不会被视为匹配，模糊匹配只作为建议
+    """
+
+    def __init__(self, threshold: float = 0.92):
+        self.threshold = threshold
+        self._exact: Dict[Tuple[str, str], Dict[str, _Entry]] = defaultdict(dict)
+        self._by_words: Dict[Tuple[str, str], Dict[str, _Entry]] = defaultdict(dict)
+        self._postings: Dict[Tuple[str, str], Dict[str, List[_Entry]]] = defaultdict(lambda: defaultdict(list))
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._exact.values())
+
+    def clear(self):
+        with self._lock:
+            self._exact.clear()
+            self._by_words.clear()
+            self._postings.clear()
+
+    def add(self, source_text: str, source_language: str, target_language: str, translated_text: str,
+            translation_id: Optional[int] = None, subtitle_id: Optional[int] = None, version: Optional[int] = None):
+        """加入一条译文；同一原文的新译文覆盖旧的"""
+        normalized = normalize_segment(source_text)
+        if not normalized or not translated_text:
+            return
+        bucket = (source_language, target_language)
+        key = _key(normalized)
+        with self._lock:
+            entry = self._exact[bucket].get(key)
+            if entry is None:
+                entry = _Entry()
+                entry.key = key
+                entry.words = _words_key(normalized)
+                entry.grams = _trigrams(normalized)
+                entry.size = sum(entry.grams.values())
+                entry.numbers = _NUMBER_RE.findall(normalized)
+                self._exact[bucket][key] = entry
+                self._by_words[bucket][entry.words] = entry
+                postings = self._postings[bucket]
+                for gram in entry.grams:
+                    postings[gram].append(entry)
+            entry.text = translated_text
+            entry.translation_id = translation_id
+            entry.subtitle_id = subtitle_id
+            entry.version = version
+
+    def load(self, db: Session) -> int:
+        """从数据库加载已审核通过（approved）的译文，同一字幕同一语言取最新版本"""
+        rows = (
+            db.query(Translation, Subtitle.text, Subtitle.language)
+            .join(Subtitle, Translation.subtitle_id == Subtitle.id)
+            .filter(Translation.status == 'approved')
+            .order_by(Translation.subtitle_id, Translation.language, Translation.version)
+            .all()
+        )
+        self.clear()
+        for translation, source_text, source_language in rows:
+            self.add(
+                source_text, source_language or 'en', translation.language, translation.translated_text,
+                translation_id=translation.id, subtitle_id=translation.subtitle_id, version=translation.version
+            )
+        return len(self)
+
+    def lookup(self, text: str, source_language: str, target_language: str) -> Optional[MemoryMatch]:
+        """
+        精确匹配（或词序列相同）时返回可直接使用的译文；
+        否则返回相似度不低于阈值的最相近译文作为建议（reusable=False）
+        """
+        normalized = normalize_segment(text)
+        if not normalized:
+            return None
+        bucket = (source_language, target_language)
+        key = _key(normalized)
+
+        with self._lock:
+            exact = self._exact.get(bucket)
+            if not exact:
+                return None
+            entry = exact.get(key)
+            if entry is not None:
+                return MemoryMatch(entry.text, 1.0, True, entry.translation_id, entry.subtitle_id, entry.version)
+
+            grams = _trigrams(normalized)
+            size = sum(grams.values())
+            # 只差在标点（如句中逗号）时，词序列相同，也可直接重用
+            words = _words_key(normalized)
+            entry = self._by_words[bucket].get(words) if words else None
+            if entry is not None:
+                overlap = sum(min(count, entry.grams[gram]) for gram, count in grams.items())
+                score = round(2 * overlap / (size + entry.size), 4)
+                return MemoryMatch(entry.text, score, True, entry.translation_id, entry.subtitle_id, entry.version)
+            if self.threshold >= 1.0:
+                return None
+
+            numbers = _NUMBER_RE.findall(normalized)
+            postings = self._postings[bucket]
+
+            # 前缀过滤：达到阈值至少要共享 min_overlap 个三元组，
+            # 因此只需从最少见的若干三元组中找候选，再逐个精确计算
+            min_overlap = self.threshold * size / (2 - self.threshold)
+            ordered = sorted(grams, key=lambda gram: len(postings.get(gram, ())))
+            remaining = size
+            candidates: Dict[str, _Entry] = {}
+            for gram in ordered:
+                if remaining < min_overlap:
+                    break
+                remaining -= grams[gram]
+                for candidate in postings.get(gram, ()):
+                    # 长度相差太大时 Dice 系数不可能达到阈值
+                    if 2 * min(size, candidate.size) >= self.threshold * (size + candidate.size):
+                        candidates[candidate.key] = candidate
+
+            best, best_score = None, 0.0
+            for candidate in candidates.values():
+                if candidate.numbers != numbers:
+                    continue
+                overlap = sum(min(count, candidate.grams[gram]) for gram, count in grams.items())
+                score = 2 * overlap / (size + candidate.size)
+                if score > best_score:
+                    best, best_score = candidate, score
+
+        if best is None or best_score < self.threshold:
+            return None
+        return MemoryMatch(best.text, round(best_score, 4), False, best.translation_id, best.subtitle_id, best.version)
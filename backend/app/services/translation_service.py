@@ -5,8 +5,28 @@
 
 from langchain_community.llms import Ollama
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.models.video import Terminology
+from app.services.context_builder import estimate_tokens
+from app.services.translation_memory import TranslationMemory, normalize_segment
+from app.utils.aho_corasick import AhoCorasick
 import re
+from typing import Dict, List, Optional
+
+
+TARGET_LANGUAGE_NAMES = {
+    'zh-TW': 'Traditional Chinese (繁體中文)',
+    'zh': 'Simplified Chinese (简体中文)',
+    'es': 'Spanish (Español)',
+    'ja': 'Japanese (日本語)',
+    'fr': 'French (Français)',
+}
+
+# 批量翻译输出的编号行，如 "3. 譯文" / "[3] 譯文"
+_NUMBERED_LINE_RE = re.compile(r'^\s*\[?(\d+)\s*[\].):：、]\s*(.*)$')
+_PLACEHOLDER_RE = re.compile(r'\[TERM_\d+\]')
+# 字幕中的换行在批量提示词中用标记代替，保证一段一行
+_LINE_BREAK = ' <br> '
 
 
 class TranslationService:
@@ -20,23 +40,90 @@ class TranslationService:
             self.llm = None
 
         self.terminology_cache = {}
+        # 术语自动机（加载术语时构建一次）与有术语译文的语言
+        self.terminology_matcher = None
+        self.terminology_languages = set()
+        # 已审核译文的翻译记忆（load_translation_memory 后启用）
+        self.translation_memory = None
 
     def load_terminology(self, db: Session):
         """加载医学术语词典"""
         try:
             terms = db.query(Terminology).all()
-            for term in terms:
-                self.terminology_cache[term.term_en.lower()] = {
+            # 建新字典再替换，不修改其他副本可能正在读取的旧字典
+            self.terminology_cache = {
+                term.term_en.lower(): {
                     'en': term.term_en,
                     'zh': term.term_zh,
                     'es': term.term_es,
                     'ja': term.term_ja,
                     'fr': term.term_fr,
                 }
+                for term in terms
+            }
+            self.build_terminology_matcher()
             print(f"✅ 已加载 {len(self.terminology_cache)} 条医学术语")
         except Exception as e:
             print(f"⚠️  加载术语词典失败: {e}")
 
+    def load_translation_memory(self, db: Session):
+        """加载已审核通过的译文作为翻译记忆"""
+        try:
+            memory = TranslationMemory(threshold=settings.TRANSLATION_MEMORY_THRESHOLD)
+            count = memory.load(db)
+            self.translation_memory = memory
+            print(f"✅ 已加载 {count} 条翻译记忆")
+        except Exception as e:
+            print(f"⚠️  加载翻译记忆失败: {e}")
+
+    def build_terminology_matcher(self):
+        """
+        根据 terminology_cache 构建术语自动机
+
+        一次扫描即可找出文本中的所有术语（不区分大小写、整词匹配、重叠时取最长的术语），
+        每次翻译的耗时与术语数量无关
+        """
+        self.terminology_matcher = AhoCorasick(
+            (term_en, term_en) for term_en in self.terminology_cache
+        )
+        self.terminology_languages = {
+            lang_code
+            for translations in self.terminology_cache.values()
+            for lang_code, translation in translations.items()
+            if translation
+        }
+
+    def apply_terminology(self, text: str, lang_code: str, terms_found: list = None):
+        """
+        把文本中的术语替换为 [TERM_X] 占位符
+
+        terms_found: 批量翻译时多段共用的术语列表（占位符编号接续）
+
+        Returns:
+            (带占位符的文本, 术语列表 [{'en', 'translation'}])，同一术语共用一个占位符
+        """
+        if terms_found is None:
+            terms_found = []
+        if not self.terminology_matcher or lang_code not in self.terminology_languages:
+            return text, terms_found
+
+        placeholders = {term['en']: f"[TERM_{idx}]" for idx, term in enumerate(terms_found)}
+        parts = []
+        position = 0
+        for start, end, values in self.terminology_matcher.find_longest(text, boundary="word"):
+            term_en = values[0]
+            if term_en not in placeholders:
+                placeholders[term_en] = f"[TERM_{len(terms_found)}]"
+                terms_found.append({
+                    'en': term_en,
+                    'translation': self.terminology_cache[term_en].get(lang_code)
+                })
+            parts.append(text[position:start])
+            parts.append(placeholders[term_en])
+            position = end
+        parts.append(text[position:])
+        return "".join(parts), terms_found
+
     def translate(
         self,
         text: str,
@@ -56,6 +143,42 @@ class TranslationService:
         Returns:
             翻译后的文本
         """
+        return self.translate_segment(text, target_language, source_language, use_terminology)['text']
+
+    def translate_segment(
+        self,
+        text: str,
+        target_language: str,
+        source_language: str = 'en',
+        use_terminology: bool = True
+    ) -> dict:
+        """
+        翻译一段字幕，先查翻译记忆
+
+        只有可直接重用的命中才跳过 LLM；模糊匹配作为待审核建议写进 notes
+
+        Returns:
+            {'text': 译文, 'origin': 'memory' 或 'llm', 'notes': 翻译记忆来源或建议}
+        """
+        suggestion = None
+        if self.translation_memory is not None:
+            match = self.translation_memory.lookup(text, source_language, target_language)
+            if match and match.reusable:
+                return {'text': match.text, 'origin': 'memory', 'notes': match.note()}
+            if match:
+                suggestion = match.note()
+
+        translated = self._translate_with_llm(text, target_language, source_language, use_terminology)
+        return {'text': translated, 'origin': 'llm', 'notes': suggestion}
+
+    def _translate_with_llm(
+        self,
+        text: str,
+        target_language: str,
+        source_language: str = 'en',
+        use_terminology: bool = True
+    ) -> str:
+        """用 LLM 翻译（术语替换为占位符，翻译后还原）"""
         if not self.llm:
             return f"[Translation service not available]"
 
@@ -64,35 +187,11 @@ class TranslationService:
         text_with_placeholders = text
         lang_code = target_language.split('-')[0]  # zh-TW -> zh
 
-        # 检查该语言是否有术语表
-        has_terminology = False
-        if use_terminology and self.terminology_cache:
-            for term_en, translations in self.terminology_cache.items():
-                if translations.get(lang_code):
-                    has_terminology = True
-                    break
-
-        if use_terminology and has_terminology:
-            for term_en, translations in self.terminology_cache.items():
-                pattern = re.compile(re.escape(term_en), re.IGNORECASE)
-                if pattern.search(text.lower()):
-                    placeholder = f"[TERM_{len(terms_found)}]"
-                    terms_found.append({
-                        'en': term_en,
-                        'translation': translations.get(lang_code)
-                    })
-                    text_with_placeholders = pattern.sub(placeholder, text_with_placeholders)
+        if use_terminology:
+            text_with_placeholders, terms_found = self.apply_terminology(text, lang_code)
 
         # 构建翻译提示词
-        lang_map = {
-            'zh-TW': 'Traditional Chinese (繁體中文)',
-            'zh': 'Simplified Chinese (简体中文)',
-            'es': 'Spanish (Español)',
-            'ja': 'Japanese (日本語)',
-            'fr': 'French (Français)',
-        }
-
-        target_lang_name = lang_map.get(target_language, target_language)
+        target_lang_name = TARGET_LANGUAGE_NAMES.get(target_language, target_language)
         prompt = self._build_translation_prompt(
             text_with_placeholders,
             target_lang_name,
@@ -101,30 +200,197 @@ class TranslationService:
 
         # 调用LLM翻译
         try:
-            translated = self.llm.invoke(prompt)
-            translated = translated.strip()
-
-            # 清除 AI 可能加入的注释和多余文本
-            translated = re.sub(r'\(Note:.*?\)', '', translated, flags=re.IGNORECASE | re.DOTALL)
-            translated = re.sub(r'\n\n.*?Note:.*', '', translated, flags=re.IGNORECASE | re.DOTALL)
-            translated = re.sub(r'^Output:\s*', '', translated, flags=re.IGNORECASE)
-            translated = re.sub(r'\n+Output:\s*', '\n', translated, flags=re.IGNORECASE)
-            translated = translated.strip()
+            translated = self._clean_output(self.llm.invoke(prompt))
 
             # 替换回术语
-            for idx, term_info in enumerate(terms_found):
-                placeholder = f"[TERM_{idx}]"
-                if term_info['translation']:
-                    translated = translated.replace(placeholder, term_info['translation'])
-                else:
-                    translated = translated.replace(placeholder, term_info['en'])
-
-            return translated
+            return self._restore_terms(translated, terms_found)
 
         except Exception as e:
             print(f"❌ 翻译失败: {e}")
             return f"[Translation Error: {str(e)}]"
 
+    @staticmethod
+    def _clean_output(translated: str) -> str:
+        """清除 AI 可能加入的注释和多余文本"""
+        translated = translated.strip()
+        translated = re.sub(r'\(Note:.*?\)', '', translated, flags=re.IGNORECASE | re.DOTALL)
+        translated = re.sub(r'\n\n.*?Note:.*', '', translated, flags=re.IGNORECASE | re.DOTALL)
+        translated = re.sub(r'^Output:\s*', '', translated, flags=re.IGNORECASE)
+        translated = re.sub(r'\n+Output:\s*', '\n', translated, flags=re.IGNORECASE)
+        return translated.strip()
+
+    @staticmethod
+    def _restore_terms(translated: str, terms_found: list) -> str:
+        for idx, term_info in enumerate(terms_found):
+            placeholder = f"[TERM_{idx}]"
+            translated = translated.replace(placeholder, term_info['translation'] or term_info['en'])
+        return translated
+
+    def translate_batch(
+        self,
+        texts: List[str],
+        target_language: str,
+        source_language: str = 'en',
+        use_terminology: bool = True,
+        token_budget: Optional[int] = None,
+        max_segments: Optional[int] = None
+    ) -> List[dict]:
+        """
+        批量翻译字幕：多段编号后放进同一个提示词（不超过 token 预算），再按编号解析
+
+        先查翻译记忆，批内相同的句子只翻译一次；编号缺失、重复或术语占位符
+        对不上的段落单独重试。返回与 texts 对应的 translate_segment 结果
+        """
+        results: List[Optional[dict]] = [None] * len(texts)
+        pending: Dict[str, List[int]] = {}
+        suggestions: Dict[int, str] = {}
+        for index, text in enumerate(texts):
+            if self.translation_memory is not None:
+                match = self.translation_memory.lookup(text, source_language, target_language)
+                if match and match.reusable:
+                    results[index] = {'text': match.text, 'origin': 'memory', 'notes': match.note()}
+                    continue
+                if match:
+                    suggestions[index] = match.note()
+            pending.setdefault(normalize_segment(text), []).append(index)
+
+        if pending and not self.llm:
+            for indexes in pending.values():
+                for index in indexes:
+                    results[index] = {'text': "[Translation service not available]", 'origin': 'llm', 'notes': None}
+            return results
+
+        token_budget = token_budget or settings.TRANSLATION_BATCH_TOKENS
+        max_segments = max_segments or settings.TRANSLATION_BATCH_SIZE
+        unique = [indexes[0] for indexes in pending.values()]
+
+        batch: List[int] = []
+        used = 0
+        for index in unique:
+            tokens = estimate_tokens(texts[index])
+            if batch and (used + tokens > token_budget or len(batch) >= max_segments):
+                self._translate_numbered(texts, batch, results, target_language, source_language, use_terminology)
+                batch, used = [], 0
+            batch.append(index)
+            used += tokens
+        if batch:
+            self._translate_numbered(texts, batch, results, target_language, source_language, use_terminology)
+
+        # 批内重复的句子共用译文
+        for indexes in pending.values():
+            for index in indexes[1:]:
+                results[index] = dict(results[indexes[0]])
+        # 模糊匹配的建议留给审核人员
+        for index, note in suggestions.items():
+            results[index]['notes'] = note
+        return results
+
+    def _translate_numbered(
+        self,
+        texts: List[str],
+        batch: List[int],
+        results: List[Optional[dict]],
+        target_language: str,
+        source_language: str,
+        use_terminology: bool
+    ):
+        """翻译一批编号段落，结果写入 results；对不上的段落单独重试"""
+        if len(batch) == 1:
+            index = batch[0]
+            translated = self._translate_with_llm(texts[index], target_language, source_language, use_terminology)
+            results[index] = {'text': translated, 'origin': 'llm', 'notes': None}
+            return
+
+        lang_code = target_language.split('-')[0]
+        terms_found = []
+        segments = []
+        for index in batch:
+            text = texts[index].replace('\r\n', '\n').replace('\n', _LINE_BREAK)
+            if use_terminology:
+                text, terms_found = self.apply_terminology(text, lang_code, terms_found)
+            segments.append(text)
+
+        target_lang_name = TARGET_LANGUAGE_NAMES.get(target_language, target_language)
+        prompt = self._build_batch_prompt(segments, target_lang_name, terms_found)
+        try:
+            parsed = self._parse_numbered_output(self.llm.invoke(prompt), len(segments))
+        except Exception as e:
+            print(f"❌ 批量翻译失败，逐段重试: {e}")
+            parsed = {}
+
+        retries = 0
+        for number, (index, segment) in enumerate(zip(batch, segments), start=1):
+            translated = parsed.get(number)
+            if translated and set(_PLACEHOLDER_RE.findall(translated)) == set(_PLACEHOLDER_RE.findall(segment)):
+                translated = self._restore_terms(translated, terms_found)
+                translated = translated.replace(_LINE_BREAK, '\n').replace(_LINE_BREAK.strip(), '\n')
+                results[index] = {'text': translated, 'origin': 'llm', 'notes': None}
+            else:
+                retries += 1
+                translated = self._translate_with_llm(texts[index], target_language, source_language, use_terminology)
+                results[index] = {'text': translated, 'origin': 'llm', 'notes': None}
+        if retries:
+            print(f"⚠️  批量翻译 {len(batch)} 段中有 {retries} 段未对齐，已单独重试")
+
+    def _parse_numbered_output(self, output: str, count: int) -> Dict[int, str]:
+        """
+        解析 "编号. 译文" 格式的输出
+
+        没有编号的行接在上一段后面；超出范围或重复的编号视为对不上（不采用）
+        """
+        parsed: Dict[int, List[str]] = {}
+        duplicates = set()
+        current = None
+        for line in output.strip().splitlines():
+            match = _NUMBERED_LINE_RE.match(line)
+            if match and 1 <= int(match.group(1)) <= count:
+                current = int(match.group(1))
+                if current in parsed:
+                    duplicates.add(current)
+                parsed[current] = [match.group(2)]
+            elif match:
+                current = None
+            elif current is not None and line.strip() and not re.match(r'^\s*(Note|Output):', line, re.IGNORECASE):
+                parsed[current].append(line.strip())
+        return {
+            number: self._clean_output(" ".join(lines))
+            for number, lines in parsed.items()
+            if number not in duplicates
+        }
+
+    def _build_batch_prompt(self, segments: List[str], target_language: str, terms: list) -> str:
+        """构建批量翻译提示词（编号段落，每段一行）"""
+        terms_info = ""
+        if terms:
+            terms_list = "\n".join([
+                f"  - [TERM_{idx}]: {term['en']}"
+                for idx, term in enumerate(terms)
+            ])
+            terms_info = f"""
+Important medical terms (keep as placeholders):
+{terms_list}
+"""
+        numbered = "\n".join(f"{number}. {segment}" for number, segment in enumerate(segments, start=1))
+
+        return f"""You are a professional medical translator specializing in anesthesia content.
+
+Task: Translate each numbered English subtitle line below to {target_language}.
+
+Requirements:
+1. Translate to {target_language} language ONLY
+2. Use clear, simple language suitable for patients
+3. Maintain a warm and reassuring tone
+4. Keep medical terminology accurate
+5. Do NOT translate the [TERM_X] placeholders or <br> markers - keep them exactly as they are
+6. Output exactly {len(segments)} lines, one per subtitle, in the same order and with the same numbers: "<number>. <translation>"
+7. Do NOT merge or split lines, and do NOT include any notes, explanations, or comments
+
+{terms_info}
+English subtitles:
+{numbered}
+
+{target_language} translation:"""
+
     def _build_translation_prompt(
         self,
         text: str,
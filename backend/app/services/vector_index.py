@@ -0,0 +1,171 @@
+"""
+NumPy 向量索引
+知识库只有几十个片段，用一个归一化的 float32 矩阵做点积 top-k 即可，
+不需要 Chroma 的持久化服务。索引保存为可内存映射的 .npy 文件 + 元数据 JSON。
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from langchain_core.documents import Document
+    from langchain_core.embeddings import Embeddings
+except ImportError:
+    from langchain.schema import Document
+    from langchain.embeddings.base import Embeddings
+
+VECTORS_FILE = "vectors.npy"
+METADATA_FILE = "metadata.json"
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class NumpyVectorIndex:
+    """
+    与 Chroma 相同检索接口的内存向量索引
+
+    向量归一化后存储，余弦相似度即为一次矩阵-向量点积。
+    """
+
+    def __init__(self, vectors: np.ndarray, documents: List[Document], embedding: Embeddings,
+                 persist_directory: Optional[str] = None, ids: Optional[List[str]] = None):
+        if len(vectors) != len(documents):
+            raise ValueError("Number of vectors and documents must match")
+        self.vectors = vectors
+        self.documents = documents
+        self.embedding = embedding
+        self.persist_directory = persist_directory
+        self.ids = list(ids) if ids is not None else [str(i) for i in range(len(documents))]
+
+    @staticmethod
+    def _embed(documents: List[Document], embedding: Embeddings) -> np.ndarray:
+        if not documents:
+            # 空知识库（或空的译文集）：维度要等第一次 add_documents 才知道
+            return np.empty((0, 0), dtype=np.float32)
+        vectors = embedding.embed_documents([doc.page_content for doc in documents])
+        return _normalize(np.asarray(vectors, dtype=np.float32).reshape(len(documents), -1))
+
+    @classmethod
+    def from_documents(cls, documents: List[Document], embedding: Embeddings,
+                       persist_directory: Optional[str] = None, ids: Optional[List[str]] = None) -> "NumpyVectorIndex":
+        """嵌入文档并建立索引（提供 persist_directory 时同时保存）"""
+        index = cls(cls._embed(documents, embedding), list(documents), embedding, persist_directory, ids)
+        if persist_directory:
+            index.persist()
+        return index
+
+    @classmethod
+    def load(cls, persist_directory: str, embedding: Embeddings) -> "NumpyVectorIndex":
+        """以内存映射方式加载已保存的索引"""
+        directory = Path(persist_directory)
+        vectors = np.load(directory / VECTORS_FILE, mmap_mode="r")
+        with open(directory / METADATA_FILE, encoding="utf-8") as f:
+            metadata = json.load(f)
+        documents = [
+            Document(page_content=item["page_content"], metadata=item.get("metadata", {}))
+            for item in metadata["documents"]
+        ]
+        return cls(vectors, documents, embedding, persist_directory, metadata.get("ids"))
+
+    @staticmethod
+    def exists(persist_directory: str) -> bool:
+        directory = Path(persist_directory)
+        return (directory / VECTORS_FILE).exists() and (directory / METADATA_FILE).exists()
+
+    def persist(self):
+        """保存索引到 persist_directory"""
+        if not self.persist_directory:
+            return
+        directory = Path(self.persist_directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        # 先写临时文件再替换：正在被内存映射的旧文件不能被原地截断
+        tmp_vectors = directory / (VECTORS_FILE + ".tmp")
+        with open(tmp_vectors, "wb") as f:
+            np.save(f, np.ascontiguousarray(self.vectors, dtype=np.float32))
+        metadata = {
+            "dimension": int(self.vectors.shape[1]) if len(self.vectors) else 0,
+            "ids": self.ids,
+            "documents": [
+                {"page_content": doc.page_content, "metadata": doc.metadata}
+                for doc in self.documents
+            ],
+        }
+        tmp_metadata = directory / (METADATA_FILE + ".tmp")
+        with open(tmp_metadata, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False)
+        os.replace(tmp_vectors, directory / VECTORS_FILE)
+        os.replace(tmp_metadata, directory / METADATA_FILE)
+
+    def copy(self) -> "NumpyVectorIndex":
+        """浅拷贝，修改副本不影响正在检索的索引"""
+        return NumpyVectorIndex(self.vectors, list(self.documents), self.embedding, self.persist_directory, self.ids)
+
+    def add_documents(self, documents: List[Document], ids: Optional[List[str]] = None):
+        """追加文档（只嵌入新文档），与 Chroma.add_documents 相同的接口"""
+        if not documents:
+            return
+        ids = list(ids) if ids is not None else [str(len(self.ids) + i) for i in range(len(documents))]
+        vectors = self._embed(documents, self.embedding)
+        # 内存映射的数组是只读的，合并后得到新的内存数组
+        self.vectors = np.vstack([self.vectors, vectors]) if len(self.vectors) else vectors
+        self.documents += documents
+        self.ids += ids
+
+    def delete(self, ids: List[str]):
+        """按 id 删除文档"""
+        removed = set(ids)
+        keep = [i for i, doc_id in enumerate(self.ids) if doc_id not in removed]
+        if len(keep) == len(self.ids):
+            return
+        self.vectors = np.asarray(self.vectors)[keep]
+        self.documents = [self.documents[i] for i in keep]
+        self.ids = [self.ids[i] for i in keep]
+
+    def _top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        # argpartition 取前 k 个，再只对这 k 个排序
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top])]
+
+    def similarity_search_by_vector_with_score(self, embedding: List[float], k: int = 4) -> List[Tuple[Document, float]]:
+        if not len(self.vectors):
+            return []
+        query = _normalize(np.asarray(embedding, dtype=np.float32))
+        scores = self.vectors @ query
+        return [(self.documents[i], float(scores[i])) for i in self._top_k(scores, k)]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k)]
+
+    def similarity_search_by_vectors(self, embeddings: List[List[float]], k: int = 4) -> List[List[Document]]:
+        """批量检索：所有查询向量与索引做一次矩阵乘法"""
+        if not len(embeddings):
+            return []
+        if not len(self.vectors):
+            return [[] for _ in embeddings]
+        queries = _normalize(np.asarray(embeddings, dtype=np.float32))
+        scores = queries @ np.asarray(self.vectors).T
+        k = min(k, scores.shape[1])
+        if k <= 0:
+            return [[] for _ in embeddings]
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(scores, top, axis=1).argsort(axis=1)[:, ::-1]
+        top = np.take_along_axis(top, order, axis=1)
+        return [[self.documents[i] for i in row] for row in top]
+
+    def similarity_search_with_score(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(self.embedding.embed_query(query), k)
+
+    def similarity_search(self, query: str, k: int = 4) -> List[Document]:
+        """与 Chroma.similarity_search 相同的接口"""
+        return self.similarity_search_by_vector(self.embedding.embed_query(query), k)
@@ -0,0 +1,123 @@
+"""
+Aho-Corasick 多模式匹配
+一次扫描文本即可找出所有关键词 / 术语（不区分大小写，可选单词边界）
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def _lower(text: str) -> str:
+    # 逐字符转小写且保持长度不变，匹配位置可直接对应原文
+    return "".join(ch if len(ch.lower()) != 1 else ch.lower() for ch in text)
+
+
+def _is_cjk(ch: str) -> bool:
+    return "぀" <= ch <= "ヿ" or "㐀" <= ch <= "鿿" or "가" <= ch <= "힯"
+
+
+def _is_word_char(ch: str) -> bool:
+    # 中日韩文字之间没有空格，不作为单词字符处理
+    return (ch.isalnum() or ch == "_") and not _is_cjk(ch)
+
+
+class AhoCorasick:
+    """
+    关键词自动机，构建一次后可重复使用（只读，线程安全）
+
+    同一关键词可以对应多个值（例如同时属于某个分类和需要医师的关键词）
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]], ignore_case: bool = True):
+        self.ignore_case = ignore_case
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 每个状态结束的关键词：(长度, 关键词编号)
+        self._output: List[List[Tuple[int, int]]] = [[]]
+        self._values: List[List[Any]] = []
+        self._keys: Dict[str, int] = {}
+
+        for pattern, value in patterns:
+            key = _lower(pattern) if ignore_case else pattern
+            if not key:
+                continue
+            if key in self._keys:
+                self._values[self._keys[key]].append(value)
+                continue
+            self._keys[key] = len(self._values)
+            self._values.append([value])
+            state = 0
+            for ch in key:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append((len(key), self._keys[key]))
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(ch, 0)
+                # 合并失败链上的输出，匹配时不用再沿失败链查找
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def iter_matches(self, text: str) -> Iterable[Tuple[int, int, int]]:
+        """逐个返回 (起始位置, 结束位置, 关键词编号)，包括重叠的匹配"""
+        haystack = _lower(text) if self.ignore_case else text
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for index, ch in enumerate(haystack):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, pattern_id in output[state]:
+                yield index + 1 - length, index + 1, pattern_id
+
+    @staticmethod
+    def _at_boundary(text: str, start: int, end: int, boundary: Optional[str]) -> bool:
+        if boundary is None:
+            return True
+        if _is_word_char(text[start]) and start > 0 and _is_word_char(text[start - 1]):
+            return False
+        if boundary == "word" and _is_word_char(text[end - 1]) and end < len(text) and _is_word_char(text[end]):
+            return False
+        return True
+
+    def find_all(self, text: str, boundary: Optional[str] = None) -> List[Tuple[int, int, List[Any]]]:
+        """
+        所有匹配 (起始, 结束, 值列表)
+
+        boundary: None 子串匹配；"start" 关键词须从单词开头匹配（允许 allerg → allergies）；
+        "word" 前后都须是单词边界
+        """
+        return [
+            (start, end, self._values[pattern_id])
+            for start, end, pattern_id in self.iter_matches(text)
+            if self._at_boundary(text, start, end, boundary)
+        ]
+
+    def find_longest(self, text: str, boundary: Optional[str] = "word") -> List[Tuple[int, int, List[Any]]]:
+        """不重叠的匹配，同一位置取最长的关键词（从左到右）"""
+        matches = sorted(self.find_all(text, boundary), key=lambda match: (match[0], -match[1]))
+        selected = []
+        position = 0
+        for start, end, values in matches:
+            if start >= position:
+                selected.append((start, end, values))
+                position = end
+        return selected
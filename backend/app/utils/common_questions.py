@@ -0,0 +1,47 @@
+"""
+常见问题列表
+供 /qa/common-questions 接口和离线检索评估使用
+"""
+
+COMMON_QUESTIONS = {
+    "en": [
+        "Is general anesthesia safe?",
+        "Will I wake up during surgery?",
+        "What are the side effects of anesthesia?",
+        "How long should I fast before surgery?",
+        "How long does it take to wake up?",
+        "Will anesthesia affect my memory?",
+        "Can I have anesthesia if I have allergies?",
+        "What's the difference between spinal and epidural?",
+        "Will I feel pain during surgery?",
+        "What happens in the recovery room?"
+    ],
+    "es": [
+        "¿Es segura la anestesia general?",
+        "¿Me despertaré durante la cirugía?",
+        "¿Cuáles son los efectos secundarios?",
+        "¿Cuánto tiempo debo ayunar?",
+        "¿Cuánto tiempo tarda en despertar?",
+        "¿Qué es la anestesia espinal?",
+        "¿Puedo tener anestesia si tengo alergias?",
+        "¿Sentiré dolor durante la cirugía?"
+    ],
+    "fr": [
+        "L'anesthésie générale est-elle sûre?",
+        "Vais-je me réveiller pendant la chirurgie?",
+        "Quels sont les effets secondaires?",
+        "Combien de temps dois-je jeûner?",
+        "Combien de temps faut-il pour se réveiller?",
+        "L'anesthésie affectera-t-elle ma mémoire?"
+    ],
+    "zh-TW": [
+        "全身麻醉安全嗎？",
+        "我會在手術中醒來嗎？",
+        "麻醉後會有什麼副作用？",
+        "麻醉前需要禁食多久？",
+        "醒來需要多長時間？",
+        "麻醉會影響記憶嗎？",
+        "脊髓麻醉和硬膜外麻醉有什麼區別？",
+        "什麼情況下不能使用全身麻醉？"
+    ]
+}
@@ -0,0 +1,106 @@
+"""
+问题分类器
+每种语言的关键词（该语言 + 英文）在导入时编译为一个按前缀树展开的组合正则表达式，
+一次扫描即可得到所有关键词命中：是否需要医师介入 + 问题分类
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Set, Tuple
+
+from app.utils.question_keywords import FAQ_CATEGORIES, DOCTOR_INTERVENTION_KEYWORDS
+
+DOCTOR = "__doctor__"
+# 多个分类都命中时按此顺序取第一个
+CATEGORY_ORDER = list(FAQ_CATEGORIES["en"])
+# 拉丁字母关键词须从单词开头匹配（allerg 可匹配 allergies，eat 不匹配 great）；中文不需要
+_WORD_START = r"(?<![0-9a-z_])"
+
+
+def fold(text: str) -> str:
+    """小写并去掉重音符号（anestesia / anestésia 视为相同）"""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def keyword_labels(language: str) -> Dict[str, Set[str]]:
+    """关键词 -> 标签（分类名或 DOCTOR）"""
+    labels: Dict[str, Set[str]] = {}
+    # 患者常在母语问题中夹杂英文术语，非英文语言同时匹配英文关键词
+    for lang in dict.fromkeys([language, "en"]):
+        for keyword in DOCTOR_INTERVENTION_KEYWORDS[lang]:
+            labels.setdefault(fold(keyword), set()).add(DOCTOR)
+        for category, keywords in FAQ_CATEGORIES[lang].items():
+            for keyword in keywords:
+                labels.setdefault(fold(keyword), set()).add(category)
+    return labels
+
+
+def _trie_pattern(node: dict) -> str:
+    """前缀树 -> 正则，每个位置只需按一个字符分支，不用逐个尝试所有关键词"""
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    is_end = "" in node
+    if len(branches) == 1 and not is_end:
+        return branches[0]
+    group = "(?:" + "|".join(branches) + ")"
+    # 可选的后缀是贪婪的，同一位置总是命中最长的关键词
+    return group + "?" if is_end else group
+
+
+def _keyword_pattern(keywords: List[str]) -> str:
+    trie: dict = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    return _trie_pattern(trie)
+
+
+def _compile(language: str) -> Tuple[re.Pattern, Dict[str, Set[str]]]:
+    labels = keyword_labels(language)
+    # 同一位置只会命中最长的关键词，把作为其前缀的较短关键词的标签并入，结果与逐个匹配一致
+    merged = {
+        keyword: set().union(*(labels[other] for other in labels if keyword.startswith(other)))
+        for keyword in labels
+    }
+    latin = [keyword for keyword in labels if re.match(r"[0-9a-z_]", keyword)]
+    others = [keyword for keyword in labels if keyword not in latin]
+    alternatives = []
+    if latin:
+        alternatives.append(_WORD_START + "(?:" + _keyword_pattern(latin) + ")")
+    if others:
+        alternatives.append(_keyword_pattern(others))
+    # 零宽前瞻：每个起始位置都尝试匹配，关键词之间可以重叠
+    return re.compile("(?=(" + "|".join(alternatives) + "))"), merged
+
+
+_MATCHERS: Dict[str, Tuple[re.Pattern, Dict[str, Set[str]]]] = {
+    language: _compile(language) for language in FAQ_CATEGORIES
+}
+
+
+def classify_question(question: str, language: str = "en") -> dict:
+    """返回 needs_doctor、category 以及命中的关键词"""
+    pattern, labels = _MATCHERS.get(language, _MATCHERS["en"])
+
+    doctor_keywords: List[str] = []
+    categories: Set[str] = set()
+    for match in pattern.finditer(fold(question)):
+        keyword = match.group(1)
+        for label in labels[keyword]:
+            if label == DOCTOR:
+                doctor_keywords.append(keyword)
+            else:
+                categories.add(label)
+
+    return {
+        "needs_doctor": bool(doctor_keywords),
+        "category": next((category for category in CATEGORY_ORDER if category in categories), "general"),
+        "doctor_keywords": doctor_keywords,
+        "categories": [category for category in CATEGORY_ORDER if category in categories],
+    }
@@ -0,0 +1,86 @@
+"""
+问题分类关键词（多语言）
+英文关键词来自 knowledge_base_en；关键词匹配前会去掉重音符号并转小写
+"""
+
+from app.utils.knowledge_base_en import FAQ_CATEGORIES_EN, DOCTOR_INTERVENTION_KEYWORDS_EN
+
+FAQ_CATEGORIES = {
+    "en": FAQ_CATEGORIES_EN,
+    "es": {
+        "safety": ["seguro", "segura", "riesgo", "peligro", "muerte", "complicación"],
+        "pain": ["dolor", "duele", "doler", "molestia", "incómodo"],
+        "side_effects": ["efecto secundario", "efectos secundarios", "náusea", "vómito", "mareo", "dolor de cabeza"],
+        "process": ["proceso", "cómo", "qué pasa", "procedimiento", "paso"],
+        "wake_up": ["despertar", "despierto", "despertaré", "consciente", "recuperación", "alerta"],
+        "eating": ["comer", "beber", "comida", "ayuno", "ayunar", "hambre"],
+        "duration": ["cuánto tiempo", "duración", "tiempo", "cuándo"],
+        "preparation": ["preparar", "antes", "listo"],
+        "anxiety": ["preocupa", "miedo", "asustado", "nervioso", "ansioso", "ansiedad"],
+        "medication": ["medicina", "medicamento", "fármaco", "pastilla"],
+    },
+    "fr": {
+        "safety": ["sûr", "sûre", "sécurité", "risque", "danger", "mort", "décès", "complication"],
+        "pain": ["douleur", "douloureux", "avoir mal", "inconfortable"],
+        "side_effects": ["effet secondaire", "effets secondaires", "nausée", "vomi", "vertige", "étourdi", "mal de tête"],
+        "process": ["processus", "comment", "que se passe", "procédure", "étape"],
+        "wake_up": ["réveil", "réveiller", "éveillé", "conscient", "récupération", "alerte"],
+        "eating": ["manger", "boire", "nourriture", "jeûne", "jeûner", "faim"],
+        "duration": ["combien de temps", "durée", "temps", "quand"],
+        "preparation": ["préparer", "préparation", "avant", "prêt"],
+        "anxiety": ["inquiet", "inquiète", "peur", "effrayé", "nerveux", "anxieux", "angoisse"],
+        "medication": ["médicament", "pilule", "comprimé", "traitement"],
+    },
+    "zh-TW": {
+        "safety": ["安全", "風險", "危險", "死亡", "併發症"],
+        "pain": ["痛", "疼", "不舒服"],
+        "side_effects": ["副作用", "噁心", "嘔吐", "頭暈", "頭痛"],
+        "process": ["過程", "流程", "怎麼", "如何", "步驟", "會發生什麼"],
+        "wake_up": ["醒", "清醒", "意識", "恢復"],
+        "eating": ["吃", "喝", "食物", "禁食", "餓"],
+        "duration": ["多久", "多長時間", "時間", "什麼時候"],
+        "preparation": ["準備", "之前", "術前"],
+        "anxiety": ["擔心", "害怕", "緊張", "焦慮"],
+        "medication": ["藥", "藥物", "用藥"],
+    },
+}
+
+DOCTOR_INTERVENTION_KEYWORDS = {
+    "en": DOCTOR_INTERVENTION_KEYWORDS_EN,
+    "es": [
+        "alérgico", "alérgica", "alergia", "reacción",
+        "corazón", "cardíaco", "dolor de pecho",
+        "medicamento", "tomando", "interacción",
+        "historial médico", "condición", "enfermedad",
+        "embarazada", "embarazo", "bebé",
+        "especial", "inusual", "complicado",
+        "preocupado", "preocupada", "miedo", "asustado",
+        "problema anterior", "la última vez", "antes",
+        "antecedentes familiares", "familiar",
+        "asma", "diabetes", "presión arterial",
+    ],
+    "fr": [
+        "allergique", "allergie", "réaction",
+        "cœur", "cardiaque", "douleur thoracique",
+        "médicament", "je prends", "interaction",
+        "antécédents médicaux", "maladie",
+        "enceinte", "grossesse", "bébé",
+        "spécial", "inhabituel", "compliqué",
+        "inquiet", "inquiète", "peur",
+        "problème précédent", "la dernière fois", "avant",
+        "antécédents familiaux",
+        "asthme", "diabète", "tension artérielle", "hypertension",
+    ],
+    "zh-TW": [
+        "過敏", "反應",
+        "心臟", "胸痛",
+        "正在服用", "藥物交互作用",
+        "病史", "疾病",
+        "懷孕", "孕婦", "寶寶",
+        "特殊", "異常", "複雜",
+        "擔心", "害怕",
+        "上次", "以前",
+        "家族史",
+        "氣喘", "哮喘", "糖尿病", "血壓",
+    ],
+}
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""
+Batch Question Answering
+Answers many questions at once: all questions are embedded in one batch call,
+retrieval runs as a single matrix operation per language and LLM generations
+run under a bounded concurrency limit. Results are written as NDJSON (one
+line per question in completion order, with per-item timing, then a summary).
+
+Input is a text file (one question per line) or a JSONL file with
+{"question": ..., "language": ...} objects; "-" reads standard input.
+
+Usage:
+    python scripts/batch_ask.py questions.txt --language fr
+    python scripts/batch_ask.py questions.jsonl -o answers.ndjson --concurrency 4
+    python scripts/batch_ask.py --common-questions
+    python scripts/batch_ask.py questions.txt --url http://localhost:8000/api/v1
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import os
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.common_questions import COMMON_QUESTIONS
+
+
+def read_questions(path, default_language):
+    """Return [(question, language)] from a text or JSONL file"""
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    items = []
+    with f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                record = json.loads(line)
+                items.append((record["question"], record.get("language") or default_language))
+            else:
+                items.append((line, default_language))
+    return items
+
+
+async def answer_locally(items, retrieval_mode, concurrency):
+    from app.services.rag_service import get_rag_system
+
+    rag = get_rag_system()
+    if not rag.is_available():
+        print("❌ RAG system is not available. Make sure Ollama is running.", file=sys.stderr)
+        sys.exit(1)
+    async for line in rag.abatch_answer(items, retrieval_mode, concurrency):
+        yield line
+
+
+async def answer_remotely(items, retrieval_mode, concurrency, url):
+    import httpx
+
+    payload = {
+        "questions": [{"question": question, "language": language} for question, language in items],
+        "retrieval_mode": retrieval_mode,
+        "concurrency": concurrency,
+    }
+    async with httpx.AsyncClient(timeout=None) as client:
+        async with client.stream("POST", f"{url.rstrip('/')}/qa/ask/batch", json=payload) as response:
+            if response.status_code != 200:
+                await response.aread()
+                print(f"❌ {response.status_code}: {response.text}", file=sys.stderr)
+                sys.exit(1)
+            async for line in response.aiter_lines():
+                if line:
+                    yield json.loads(line)
+
+
+async def run(args, items):
+    if args.url:
+        lines = answer_remotely(items, args.retrieval_mode, args.concurrency, args.url)
+    else:
+        lines = answer_locally(items, args.retrieval_mode, args.concurrency)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        async for line in lines:
+            out.write(json.dumps(line, ensure_ascii=False) + "\n")
+            out.flush()
+            if line["type"] == "summary":
+                print(f"✅ {line['count']} questions in {line['total_ms'] / 1000:.1f}s {line['sources']}",
+                      file=sys.stderr)
+            elif out is not sys.stdout:
+                timing = line["timing"]
+                print(f"  [{line['index']}] {line['source']:<11} {timing['total_ms']:8.1f} ms  {line['question'][:60]}",
+                      file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer a batch of questions, streaming NDJSON results")
+    parser.add_argument("input", nargs="?", help="Text or JSONL file with questions ('-' for stdin)")
+    parser.add_argument("--common-questions", action="store_true", help="Ask every /qa/common-questions entry")
+    parser.add_argument("--language", default="en", help="Language for questions without one")
+    parser.add_argument("--retrieval-mode", choices=["vector", "bm25", "hybrid"])
+    parser.add_argument("--concurrency", type=int, help="Concurrent LLM generations (default RAG_BATCH_CONCURRENCY)")
+    parser.add_argument("--url", help="API base URL (e.g. http://localhost:8000/api/v1); runs in-process if omitted")
+    parser.add_argument("-o", "--output", help="Write NDJSON here instead of stdout")
+    args = parser.parse_args()
+
+    if args.common_questions:
+        items = [(question, language) for language, questions in COMMON_QUESTIONS.items() for question in questions]
+    elif args.input:
+        items = read_questions(args.input, args.language)
+    else:
+        parser.error("give an input file or --common-questions")
+
+    if not items:
+        print("⚠️  No questions found", file=sys.stderr)
+        return
+    asyncio.run(run(args, items))
+
+
+if __name__ == "__main__":
+    main()
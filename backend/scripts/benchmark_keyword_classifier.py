@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Keyword Classifier Benchmark
+Compares the previous per-keyword scan (re-import + `in` per keyword, one
+category at a time), a pure-Python Aho-Corasick automaton and the compiled
+combined-regex classifier used by the RAG service, on the common questions
+of every language.
+"""
+
+import sys
+import os
+import time
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.common_questions import COMMON_QUESTIONS
+from app.utils.aho_corasick import AhoCorasick
+from app.utils.question_classifier import CATEGORY_ORDER, DOCTOR, classify_question, fold, keyword_labels
+
+ROUNDS = 2000
+
+
+def previous_classifier(question, language):
+    """The former RAGSystem needs-doctor and category checks (one substring scan per keyword)"""
+    try:
+        from app.utils.knowledge_base_en import DOCTOR_INTERVENTION_KEYWORDS_EN
+        keywords = DOCTOR_INTERVENTION_KEYWORDS_EN
+    except ImportError:
+        keywords = []
+    question_lower = question.lower()
+    needs_doctor = any(keyword.lower() in question_lower for keyword in keywords)
+
+    try:
+        from app.utils.knowledge_base_en import FAQ_CATEGORIES_EN
+        categories = FAQ_CATEGORIES_EN
+    except ImportError:
+        categories = {}
+    question_lower = question.lower()
+    category = "general"
+    for name, category_keywords in categories.items():
+        if any(keyword.lower() in question_lower for keyword in category_keywords):
+            category = name
+            break
+    return needs_doctor, category
+
+
+AUTOMATA = {
+    language: AhoCorasick((keyword, labels) for keyword, labels in keyword_labels(language).items())
+    for language in COMMON_QUESTIONS
+}
+
+
+def automaton_classifier(question, language):
+    labels = set()
+    for _, _, values in AUTOMATA[language].find_all(fold(question), boundary="start"):
+        for value in values:
+            labels |= value
+    category = next((category for category in CATEGORY_ORDER if category in labels), "general")
+    return DOCTOR in labels, category
+
+
+def compiled_classifier(question, language):
+    result = classify_question(question, language)
+    return result["needs_doctor"], result["category"]
+
+
+def measure(func, questions):
+    """Mean microseconds per question"""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for language, question in questions:
+            func(question, language)
+    return (time.perf_counter() - start) / (ROUNDS * len(questions)) * 1e6
+
+
+def main():
+    questions = [(language, question) for language, items in COMMON_QUESTIONS.items() for question in items]
+    print("📊 Keyword classifier benchmark")
+    print("=" * 60)
+    print(f"{len(questions)} questions x {ROUNDS} rounds\n")
+    classifiers = (
+        ("previous scan", previous_classifier),
+        ("aho-corasick", automaton_classifier),
+        ("combined regex", compiled_classifier),
+    )
+    for name, func in classifiers:
+        categorized = sum(1 for language, question in questions if func(question, language)[1] != "general")
+        print(f"  {name:<15} {measure(func, questions):7.2f} µs / question   "
+              f"categorized {categorized}/{len(questions)}")
+
+    # Both compiled classifiers implement the same matching rules
+    assert all(
+        automaton_classifier(question, language) == compiled_classifier(question, language)
+        for language, question in questions
+    )
+
+
+if __name__ == "__main__":
+    main()
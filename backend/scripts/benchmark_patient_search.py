@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Patient Name Search Benchmark
+Seeds a temporary SQLite database with synthetic patients (1M by default),
+builds the FTS5 name index and reports p50/p95 latency of
+search_patients_by_name for prefix, typo and accent-insensitive queries.
+
+Usage:
+    python scripts/benchmark_patient_search.py
+    python scripts/benchmark_patient_search.py --rows 200000 --rounds 50
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.models.patient import Patient
+from app.services.patient_search_service import init_patient_search_index, search_patients_by_name
+
+FIRST_NAMES = [
+    "John", "Jonathan", "Joan", "José", "Josée", "Johanna", "Mary", "Marie", "Maria", "María",
+    "Michael", "Michelle", "Chloé", "Zoë", "François", "Françoise", "Søren", "Björn", "Renée", "Anaïs",
+    "David", "Daniel", "Danielle", "Sarah", "Sara", "Thomas", "Tomás", "Andrew", "Andrés", "Noémie",
+    "Wei", "Ming", "Hiroshi", "Yuki", "Ahmed", "Fatima", "Olivia", "Oliver", "Emma", "Emil",
+]
+LAST_NAMES = [
+    "Smith", "Smyth", "Smithers", "García", "Garcia", "Gómez", "Müller", "Mueller", "Martin", "Martínez",
+    "Johnson", "Johansson", "Jones", "Brown", "Braun", "Lefèvre", "Lefebvre", "Núñez", "Peña", "Öztürk",
+    "Williams", "Wilson", "Taylor", "Thompson", "Dubois", "Durand", "Lambert", "Rossi", "Russo", "Kowalski",
+    "Chen", "Cheng", "Wang", "Tanaka", "Nakamura", "Nguyen", "Kim", "Park", "O'Brien", "Da Silva",
+]
+MIDDLE_NAMES = ["", "", "", "Ann", "Lee", "Marie", "James", "Luis", "Élise", "Paul"]
+
+QUERIES = {
+    "prefix": ["joh smi", "mar garc", "fran lef", "dav", "chen wei"],
+    "typo": ["jonh smith", "maria garsia", "francois lefevbre", "micheal brwn", "sarah tompson"],
+    "accent": ["jose garcia", "zoe muller", "renee ozturk", "anais nunez", "chloe pena"],
+}
+
+
+def seed(engine, rows: int, batch_size: int = 50000):
+    """Insert synthetic patients, then build the search index over them in one pass"""
+    Patient.__table__.create(bind=engine)
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        for start in range(0, rows, batch_size):
+            conn.execute(insert(Patient.__table__), [
+                {
+                    "health_insurance_number": f"{index:010d}",
+                    "full_name": " ".join(part for part in (
+                        rng.choice(FIRST_NAMES), rng.choice(MIDDLE_NAMES), rng.choice(LAST_NAMES)
+                    ) if part),
+                    "date_of_birth": date(1940 + index % 70, 1 + index % 12, 1 + index % 28),
+                    "gender": "MFO"[index % 3],
+                }
+                for index in range(start, min(rows, start + batch_size))
+            ])
+    init_patient_search_index(engine)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark patient name search on a large table")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Synthetic patients to seed")
+    parser.add_argument("--rounds", type=int, default=20, help="Timed runs per query")
+    parser.add_argument("--limit", type=int, default=20, help="Results per search")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'patients.db')}")
+        start = time.perf_counter()
+        seed(engine, args.rows)
+        print(f"📦 Seeded {args.rows:,} patients and built the index in {time.perf_counter() - start:.1f}s")
+
+        db = sessionmaker(bind=engine)()
+        try:
+            print("=" * 72)
+            print(f"{'kind':<8} {'query':<20} {'p50 ms':>8} {'p95 ms':>8}  top result")
+            totals = {}
+            for kind, queries in QUERIES.items():
+                for query in queries:
+                    top = search_patients_by_name(db, query, args.limit)  # warm the page cache
+                    timings = []
+                    for _ in range(args.rounds):
+                        begin = time.perf_counter()
+                        search_patients_by_name(db, query, args.limit)
+                        timings.append((time.perf_counter() - begin) * 1000)
+                    totals.setdefault(kind, []).extend(timings)
+                    best = top[0].full_name if top else "-"
+                    print(f"{kind:<8} {query:<20} {statistics.median(timings):>8.2f} "
+                          f"{percentile(timings, 0.95):>8.2f}  {best}")
+
+            print("=" * 72)
+            for kind, timings in totals.items():
+                print(f"{kind:<8} p50 {statistics.median(timings):.2f} ms, p95 {percentile(timings, 0.95):.2f} ms")
+        finally:
+            db.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
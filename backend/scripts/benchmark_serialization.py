@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Serialization Benchmark - list endpoint responses
+Compares the default Pydantic + json path with the orjson fast path
+for 100 and 1000 item guideline pages.
+"""
+
+import json
+import sys
+import os
+import time
+import tracemalloc
+from datetime import date, datetime
+from types import SimpleNamespace
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.responses import FastJSONResponse, serialize_rows, paginated_content
+from app.schemas.anesthesia import AnesthesiaGuidelineResponse
+from app.schemas.patient import PaginatedResponse
+
+SECTION_TEXT = "Please follow your anesthesiologist's instructions carefully. " * 20
+ROUNDS = 20
+
+
+def make_rows(count):
+    """Build fake guideline rows shaped like the ORM objects"""
+    now = datetime.now()
+    return [
+        SimpleNamespace(
+            id=i,
+            patient_id=i % 50 + 1,
+            language="en",
+            group_id=i // 3,
+            surgery_name="Laparoscopic Cholecystectomy",
+            anesthesia_type="general",
+            surgery_date=date(2024, 1, 15),
+            surgeon_name="Dr. Smith",
+            anesthesiologist_name="Dr. Johnson",
+            anesthesia_type_info=SECTION_TEXT,
+            surgery_process=SECTION_TEXT,
+            expected_sensations=SECTION_TEXT,
+            potential_risks=SECTION_TEXT,
+            pre_surgery_instructions=SECTION_TEXT,
+            fasting_instructions=SECTION_TEXT,
+            medication_instructions=SECTION_TEXT,
+            common_questions=SECTION_TEXT,
+            post_surgery_care=SECTION_TEXT,
+            additional_notes=None,
+            is_generated=True,
+            generation_notes=None,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def default_path(rows):
+    """What FastAPI does for response_model=PaginatedResponse[...]"""
+    model = PaginatedResponse[AnesthesiaGuidelineResponse](
+        items=[AnesthesiaGuidelineResponse.model_validate(row) for row in rows],
+        total=len(rows), page=1, size=len(rows), pages=1
+    )
+    content = jsonable_encoder(model)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(rows):
+    """serialize_rows + FastJSONResponse rendering"""
+    items = serialize_rows(rows, AnesthesiaGuidelineResponse)
+    return FastJSONResponse(paginated_content(items, len(rows), 1, len(rows), 1)).body
+
+
+def measure(func, rows):
+    """Return (mean ms, peak KiB, payload bytes)"""
+    body = func(rows)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func(rows)
+    elapsed = (time.perf_counter() - start) / ROUNDS * 1000
+
+    tracemalloc.start()
+    func(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024, len(body)
+
+
+def main():
+    print("📊 List response serialization benchmark")
+    print("=" * 60)
+    for count in (100, 1000):
+        rows = make_rows(count)
+        print(f"\n{count} items")
+        for name, func in (("pydantic + json", default_path), ("orjson fast path", fast_path)):
+            elapsed, peak, size = measure(func, rows)
+            print(f"  {name:<18} {elapsed:8.2f} ms   peak {peak:9.1f} KiB   body {size / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Subtitle Batching Benchmark
+Counts the prompts and estimated prompt tokens needed to translate a video's
+subtitles one segment per prompt (TranslationService.translate) versus the
+numbered batches built by TranslationService.translate_batch. No LLM calls are
+made; output tokens are the same either way and are not counted.
+
+Usage:
+    python scripts/benchmark_subtitle_batching.py
+    python scripts/benchmark_subtitle_batching.py --lines 45 --budget 800 --size 40
+"""
+
+import argparse
+import sys
+import os
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.context_builder import estimate_tokens
+from app.services.translation_service import TranslationService, TARGET_LANGUAGE_NAMES
+
+SUBTITLES = [
+    "Before general anesthesia, please do not eat after midnight.",
+    "Your anesthesiologist will review your medical history and allergies.",
+    "Spinal anesthesia numbs the lower half of your body for the operation.",
+    "Some patients feel nausea after waking up; tell the nurse right away.",
+    "An epidural can be used for pain control during and after surgery.",
+    "Intubation is done after you are asleep, so you will not feel it.",
+    "Light sedation keeps you relaxed while you breathe on your own.",
+    "Fasting guidelines keep your stomach empty and protect your lungs.",
+    "Please bring a list of every medication you take to the appointment.",
+]
+
+TERMS = {
+    "general anesthesia": "全身麻醉",
+    "spinal anesthesia": "脊椎麻醉",
+    "anesthesiologist": "麻醉科醫師",
+    "epidural": "硬膜外",
+    "intubation": "插管",
+    "sedation": "鎮靜",
+    "nausea": "噁心",
+}
+
+
+def build_service():
+    service = TranslationService.__new__(TranslationService)
+    service.llm = None
+    service.translation_memory = None
+    service.terminology_cache = {
+        term: {'en': term, 'zh': translation, 'es': None, 'ja': None, 'fr': None}
+        for term, translation in TERMS.items()
+    }
+    service.build_terminology_matcher()
+    return service
+
+
+def single_prompts(service, texts, language):
+    for text in texts:
+        text, terms = service.apply_terminology(text, language.split('-')[0])
+        yield service._build_translation_prompt(text, TARGET_LANGUAGE_NAMES[language], terms)
+
+
+def batched_prompts(service, texts, language, budget, size):
+    batch, used = [], 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if batch and (used + tokens > budget or len(batch) >= size):
+            yield batch_prompt(service, batch, language)
+            batch, used = [], 0
+        batch.append(text)
+        used += tokens
+    if batch:
+        yield batch_prompt(service, batch, language)
+
+
+def batch_prompt(service, texts, language):
+    terms = []
+    segments = []
+    for text in texts:
+        text, terms = service.apply_terminology(text, language.split('-')[0], terms)
+        segments.append(text)
+    return service._build_batch_prompt(segments, TARGET_LANGUAGE_NAMES[language], terms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-segment and batched subtitle prompts")
+    parser.add_argument("--lines", type=int, nargs="+", default=[45, 200, 1000], help="Subtitle lines per video")
+    parser.add_argument("--budget", type=int, default=800, help="Source tokens per batch prompt")
+    parser.add_argument("--size", type=int, default=40, help="Segments per batch prompt")
+    parser.add_argument("--language", default="zh-TW", choices=sorted(TARGET_LANGUAGE_NAMES))
+    args = parser.parse_args()
+
+    service = build_service()
+
+    print("📊 Subtitle batching benchmark")
+    print("=" * 72)
+    print(f"Target {args.language}, batch budget {args.budget} tokens / {args.size} segments")
+    print(f"{'lines':>6} {'single prompts':>15} {'single tokens':>14} {'batches':>8} {'batch tokens':>13} {'saved':>6}")
+
+    for lines in args.lines:
+        # Distinct lines so translate_batch would not de-duplicate them
+        texts = [f"{SUBTITLES[i % len(SUBTITLES)]} ({i + 1})" for i in range(lines)]
+        single = [estimate_tokens(prompt) for prompt in single_prompts(service, texts, args.language)]
+        batched = [estimate_tokens(prompt) for prompt in batched_prompts(service, texts, args.language, args.budget, args.size)]
+        saved = 1 - sum(batched) / sum(single)
+        print(f"{lines:>6} {len(single):>15} {sum(single):>14} {len(batched):>8} {sum(batched):>13} {saved:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
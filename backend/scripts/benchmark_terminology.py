@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+Terminology Matcher Benchmark
+Compares the previous per-term regex loop of TranslationService.translate
+(compile + search + sub for every dictionary term) with the Aho-Corasick
+matcher built once in load_terminology, for growing synthetic dictionaries.
+The matcher's per-subtitle cost should stay flat as the dictionary grows.
+
+Usage:
+    python scripts/benchmark_terminology.py
+    python scripts/benchmark_terminology.py --sizes 1000 10000 50000
+"""
+
+import argparse
+import itertools
+import random
+import re
+import statistics
+import sys
+import os
+import time
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.translation_service import TranslationService
+
+REAL_TERMS = {
+    "general anesthesia": "全身麻醉",
+    "spinal anesthesia": "脊椎麻醉",
+    "anesthesia": "麻醉",
+    "epidural": "硬膜外",
+    "anesthesiologist": "麻醉科醫師",
+    "intubation": "插管",
+    "sedation": "鎮靜",
+    "malignant hyperthermia": "惡性高熱",
+    "nausea": "噁心",
+    "fasting": "禁食",
+}
+
+SUBTITLES = [
+    "Before general anesthesia, please do not eat after midnight.",
+    "Your anesthesiologist will review your medical history and allergies.",
+    "Spinal anesthesia numbs the lower half of your body for the operation.",
+    "Some patients feel nausea after waking up; tell the nurse right away.",
+    "An epidural can be used for pain control during and after surgery.",
+    "Intubation is done after you are asleep, so you will not feel it.",
+    "Malignant hyperthermia is rare but your team is trained to treat it.",
+    "Light sedation keeps you relaxed while you breathe on your own.",
+    "Fasting guidelines keep your stomach empty and protect your lungs.",
+    "Please bring a list of every medication you take to the appointment.",
+]
+
+PREFIXES = ["hyper", "hypo", "neuro", "cardio", "pulmo", "gastro", "hepato", "nephro", "myo", "osteo",
+            "angio", "dermato", "hemato", "immuno", "endo", "peri", "intra", "sub", "trans", "retro"]
+ROOTS = ["tension", "thermia", "glycemia", "kalemia", "natremia", "plasia", "trophy", "pathy", "algia", "tomy",
+         "scopy", "plasty", "ectomy", "itis", "oma", "emia", "uria", "pnea", "cardia", "stasis"]
+QUALIFIERS = ["acute", "chronic", "post-operative", "pre-operative", "refractory", "idiopathic", "congenital",
+              "secondary", "primary", "transient", "severe", "mild", "recurrent", "bilateral", "focal"]
+
+
+def synthetic_terms(count):
+    """Real anesthesia terms plus generated multi-word medical-looking terms"""
+    rng = random.Random(42)
+    terms = dict(REAL_TERMS)
+    words = [prefix + root for prefix, root in itertools.product(PREFIXES, ROOTS)]
+    while len(terms) < count:
+        size = rng.choice([1, 2, 2, 3])
+        parts = rng.sample(QUALIFIERS, size - 1) + [rng.choice(words)]
+        term = " ".join(parts)
+        terms.setdefault(term, f"術語{len(terms)}")
+    return terms
+
+
+def build_service(terms):
+    service = TranslationService.__new__(TranslationService)
+    service.llm = None
+    service.terminology_cache = {
+        term: {'en': term, 'zh': translation, 'es': None, 'ja': None, 'fr': None}
+        for term, translation in terms.items()
+    }
+    start = time.perf_counter()
+    service.build_terminology_matcher()
+    return service, (time.perf_counter() - start) * 1000
+
+
+def previous_apply(service, text, lang_code):
+    """The former loop from TranslationService.translate"""
+    terms_found = []
+    text_with_placeholders = text
+    has_terminology = False
+    for term_en, translations in service.terminology_cache.items():
+        if translations.get(lang_code):
+            has_terminology = True
+            break
+    if has_terminology:
+        for term_en, translations in service.terminology_cache.items():
+            pattern = re.compile(re.escape(term_en), re.IGNORECASE)
+            if pattern.search(text.lower()):
+                placeholder = f"[TERM_{len(terms_found)}]"
+                terms_found.append({'en': term_en, 'translation': translations.get(lang_code)})
+                text_with_placeholders = pattern.sub(placeholder, text_with_placeholders)
+    return text_with_placeholders, terms_found
+
+
+def time_per_subtitle(func, rounds):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for subtitle in SUBTITLES:
+            func(subtitle)
+        timings.append((time.perf_counter() - start) * 1e6 / len(SUBTITLES))
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark terminology matching per subtitle")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 20000],
+                        help="Dictionary sizes to test")
+    parser.add_argument("--rounds", type=int, default=50, help="Rounds over the sample subtitles")
+    args = parser.parse_args()
+
+    print("📊 Terminology matcher benchmark")
+    print("=" * 72)
+    print(f"{len(SUBTITLES)} subtitles, median µs per subtitle")
+    print(f"{'terms':>7} {'build ms':>9} {'previous µs':>12} {'matcher µs':>11} {'speedup':>8}")
+
+    for size in args.sizes:
+        service, build_ms = build_service(synthetic_terms(size))
+        # The previous loop is O(terms) per subtitle, so fewer rounds for large dictionaries
+        previous_rounds = max(1, min(args.rounds, 2000 // size))
+        previous_us = time_per_subtitle(lambda text: previous_apply(service, text, 'zh'), previous_rounds)
+        matcher_us = time_per_subtitle(lambda text: service.apply_terminology(text, 'zh'), args.rounds)
+        print(f"{size:>7} {build_ms:>9.1f} {previous_us:>12.1f} {matcher_us:>11.1f} {previous_us / matcher_us:>7.0f}x")
+
+    service, _ = build_service(synthetic_terms(args.sizes[-1]))
+    text, terms = service.apply_terminology(SUBTITLES[0], 'zh')
+    print(f"\nExample: {text}")
+    print(f"         {[(term['en'], term['translation']) for term in terms]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Vector Index Benchmark - NumPy index vs Chroma
+Builds both indexes over the English knowledge base chunks and compares
+build time, load time (cold start) and top-k query latency.
+
+By default a deterministic hashing embedding is used so the numbers measure
+the index itself rather than the embedding model; pass --real-embeddings to
+use the configured embedding backend.
+
+Usage:
+    python scripts/benchmark_vector_index.py
+    python scripts/benchmark_vector_index.py --real-embeddings --queries 50
+"""
+
+import argparse
+import sys
+import os
+import tempfile
+import time
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import chromadb  # noqa: F401  (the LangChain wrapper imports without it)
+    from langchain_community.vectorstores import Chroma
+except ImportError:
+    Chroma = None
+
+from app.services.knowledge_ingestion import create_text_splitter
+from app.services.embedding_service import HashingEmbeddings, create_embeddings
+from app.services.vector_index import NumpyVectorIndex
+from app.utils.knowledge_base_en import ANESTHESIA_KNOWLEDGE_EN
+
+QUESTIONS = [
+    "Is anesthesia safe?",
+    "Will I feel pain during surgery?",
+    "Why can't I eat before surgery?",
+    "What is malignant hyperthermia?",
+    "How long does an epidural last?",
+    "What are the side effects of general anesthesia?",
+]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def query_latency(store, query_vectors, k):
+    """Mean ms per top-k search, excluding the query embedding"""
+    start = time.perf_counter()
+    for vector in query_vectors:
+        store.similarity_search_by_vector(vector, k=k)
+    return (time.perf_counter() - start) / len(query_vectors) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the NumPy vector index with Chroma")
+    parser.add_argument("--real-embeddings", action="store_true", help="Use the configured embedding backend")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries to time")
+    parser.add_argument("-k", type=int, default=3, help="Top-k documents per query")
+    args = parser.parse_args()
+
+    embedding = create_embeddings() if args.real_embeddings else HashingEmbeddings()
+    splitter = create_text_splitter()
+    documents = splitter.create_documents([ANESTHESIA_KNOWLEDGE_EN])
+    questions = (QUESTIONS * (args.queries // len(QUESTIONS) + 1))[:args.queries]
+    query_vectors = [embedding.embed_query(question) for question in questions]
+
+    print("📊 Vector index benchmark")
+    print("=" * 60)
+    print(f"{len(documents)} chunks, {args.queries} queries, k={args.k}\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        numpy_dir = os.path.join(tmp, "numpy")
+        _, build_ms = timed(lambda: NumpyVectorIndex.from_documents(documents, embedding, persist_directory=numpy_dir))
+        store, load_ms = timed(lambda: NumpyVectorIndex.load(numpy_dir, embedding))
+        search_ms = query_latency(store, query_vectors, args.k)
+        print(f"  {'numpy':<8} build {build_ms:9.1f} ms   load {load_ms:8.2f} ms   query {search_ms:8.3f} ms")
+
+        if Chroma is None:
+            print("  chroma   skipped (langchain_community / chromadb not installed)")
+            return
+
+        chroma_dir = os.path.join(tmp, "chroma")
+        _, build_ms = timed(lambda: Chroma.from_documents(documents=documents, embedding=embedding, persist_directory=chroma_dir))
+        store, load_ms = timed(lambda: Chroma(persist_directory=chroma_dir, embedding_function=embedding))
+        search_ms = query_latency(store, query_vectors, args.k)
+        print(f"  {'chroma':<8} build {build_ms:9.1f} ms   load {load_ms:8.2f} ms   query {search_ms:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
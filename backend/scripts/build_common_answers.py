@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+Build Common Question Answers
+Pre-generates answers for every /qa/common-questions entry in every language.
+Only missing or stale answers (knowledge base or model changed) are generated
+unless --force is given.
+
+Usage:
+    python scripts/build_common_answers.py
+    python scripts/build_common_answers.py --language zh-TW --force
+"""
+
+import argparse
+import sys
+import os
+import time
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.rag_service import get_rag_system, common_answers
+from app.utils.common_questions import COMMON_QUESTIONS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate answers for the common questions")
+    parser.add_argument("--language", choices=list(COMMON_QUESTIONS), action="append",
+                        help="Only this language (repeatable, all by default)")
+    parser.add_argument("--force", action="store_true", help="Regenerate answers that are still current")
+    args = parser.parse_args()
+
+    rag = get_rag_system()
+    if not rag.is_available():
+        print("❌ RAG system is not available. Make sure Ollama is running.")
+        sys.exit(1)
+
+    languages = args.language or list(COMMON_QUESTIONS)
+    pending = sum(len(questions) for questions in common_answers.missing(languages).values())
+    print(f"📝 Knowledge version {rag.knowledge_version}: {len(common_answers)} answers current, {pending} to generate")
+
+    start = time.perf_counter()
+    generated = common_answers.build(rag.answer_question, languages, force=args.force)
+    print(f"✅ Generated {generated} answers in {time.perf_counter() - start:.1f}s -> {common_answers.path}")
+
+
+if __name__ == "__main__":
+    main()
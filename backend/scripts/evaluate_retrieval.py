@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+"""
+Retrieval Evaluation - vector vs BM25 vs hybrid
+Runs the /qa/common-questions sets against the knowledge base chunks and
+reports recall@k, hit rate and retrieval latency for each retrieval mode,
+plus the hit rate and size of the packed prompt context (RAG_CONTEXT_*),
+and checks which chat questions are treated as follow-ups of the previous topic.
+
+A chunk counts as relevant when it contains one of the reference phrases
+listed for the question below.
+
+Usage:
+    python scripts/evaluate_retrieval.py
+    python scripts/evaluate_retrieval.py --language all -k 5
+    python scripts/evaluate_retrieval.py --embeddings hashing
+"""
+
+import argparse
+import statistics
+import sys
+import os
+import time
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.bm25_index import BM25Index
+from app.services.chat_sessions import is_follow_up
+from app.core.config import settings
+from app.services.context_builder import build_context, estimate_tokens
+from app.services.knowledge_ingestion import create_text_splitter
+from app.services.embedding_service import HashingEmbeddings, create_embeddings
+from app.services.rag_service import search_documents
+from app.services.vector_index import NumpyVectorIndex
+from app.utils.common_questions import COMMON_QUESTIONS
+from app.utils.knowledge_base_en import ANESTHESIA_KNOWLEDGE_EN
+
+MODES = ["vector", "bm25", "hybrid"]
+
+# Reference phrases for each English common question
+SAFETY = ["How safe is general anesthesia?"]
+WAKE_DURING = ["Will I wake up during surgery?", "I'll wake up during surgery"]
+SIDE_EFFECTS = ["Common Side Effects", "Common Post-Anesthesia Effects"]
+FASTING = ["Fasting Guidelines"]
+WAKE_TIME = ["How long does it take to wake up?"]
+MEMORY = ["Will anesthesia affect my memory?", "permanent memory loss"]
+ALLERGIES = ["Can I be allergic?", "Severe allergies to anesthetic drugs"]
+SPINAL_VS_EPIDURAL = ["Difference from Spinal Anesthesia"]
+PAIN = ["Will I feel pain?"]
+RECOVERY_ROOM = ["In the Recovery Room"]
+SPINAL = ["# Spinal Anesthesia"]
+CONTRAINDICATIONS = ["Who Cannot Have General Anesthesia"]
+
+RELEVANT_PHRASES = {
+    "en": [SAFETY, WAKE_DURING, SIDE_EFFECTS, FASTING, WAKE_TIME, MEMORY, ALLERGIES, SPINAL_VS_EPIDURAL, PAIN, RECOVERY_ROOM],
+    "es": [SAFETY, WAKE_DURING, SIDE_EFFECTS, FASTING, WAKE_TIME, SPINAL, ALLERGIES, PAIN],
+    "fr": [SAFETY, WAKE_DURING, SIDE_EFFECTS, FASTING, WAKE_TIME, MEMORY],
+    "zh-TW": [SAFETY, WAKE_DURING, SIDE_EFFECTS, FASTING, WAKE_TIME, MEMORY, SPINAL_VS_EPIDURAL, CONTRAINDICATIONS],
+}
+
+# (question, language, expected is_follow_up): follow-ups get the session topic prepended
+FOLLOW_UP_CASES = [
+    ("How long?", "en", True),
+    ("Is it safe?", "en", True),
+    ("And after the operation?", "en", True),
+    ("What about children?", "en", True),
+    ("How long does it last?", "en", True),
+    ("Is it safe to drink water before surgery?", "en", False),
+    ("Is it normal to feel nausea after general anesthesia?", "en", False),
+    ("Can I take my blood pressure pills with it in the morning?", "en", False),
+    ("How long does it take to wake up after general anesthesia?", "en", False),
+    ("Will I feel pain during the operation?", "en", False),
+    ("¿Es seguro beber agua antes de la cirugía?", "es", False),
+    ("¿Y eso duele?", "es", True),
+    ("那會痛嗎？", "zh-TW", True),
+    ("手術前可以喝水嗎？", "zh-TW", False),
+]
+
+
+def relevant_chunks(chunks, phrases):
+    return {i for i, chunk in enumerate(chunks) if any(phrase in chunk.page_content for phrase in phrases)}
+
+
+def evaluate(vectorstore, bm25, chunks, language, mode, k):
+    """Return (mean recall@k, hit rate, mean ms, p95 ms) for one language and mode"""
+    positions = {chunk.page_content: i for i, chunk in enumerate(chunks)}
+    recalls, hits, latencies = [], [], []
+    for question, phrases in zip(COMMON_QUESTIONS[language], RELEVANT_PHRASES[language]):
+        relevant = relevant_chunks(chunks, phrases)
+        start = time.perf_counter()
+        docs = search_documents(vectorstore, bm25, question, k=k, mode=mode)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        retrieved = {positions[doc.page_content] for doc in docs}
+        found = len(retrieved & relevant)
+        recalls.append(found / min(k, len(relevant)) if relevant else 0.0)
+        hits.append(1.0 if found else 0.0)
+
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return statistics.mean(recalls), statistics.mean(hits), statistics.mean(latencies), p95
+
+
+def evaluate_context(vectorstore, bm25, language, k):
+    """Return (hit rate, mean tokens) of the top-k chunks vs the packed prompt context"""
+    top_hits, top_tokens, packed_hits, packed_tokens = [], [], [], []
+    for question, phrases in zip(COMMON_QUESTIONS[language], RELEVANT_PHRASES[language]):
+        top = search_documents(vectorstore, bm25, question, k=k)
+        candidates = search_documents(vectorstore, bm25, question, k=settings.RAG_CONTEXT_CANDIDATES)
+        packed = build_context(question, candidates, bm25)
+        for docs, hits, tokens in ((top, top_hits, top_tokens), (packed, packed_hits, packed_tokens)):
+            hits.append(1.0 if any(phrase in doc.page_content for doc in docs for phrase in phrases) else 0.0)
+            tokens.append(sum(estimate_tokens(doc.page_content) for doc in docs))
+    return (statistics.mean(top_hits), statistics.mean(top_tokens),
+            statistics.mean(packed_hits), statistics.mean(packed_tokens))
+
+
+def evaluate_follow_ups():
+    """Return the FOLLOW_UP_CASES that is_follow_up gets wrong"""
+    return [
+        (question, language, expected)
+        for question, language, expected in FOLLOW_UP_CASES
+        if is_follow_up(question, language) != expected
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate retrieval quality on the common questions")
+    parser.add_argument("--language", default="en", choices=list(COMMON_QUESTIONS) + ["all"])
+    parser.add_argument("-k", type=int, default=3, help="Documents retrieved per question")
+    parser.add_argument("--embeddings", choices=["configured", "hashing"], default="configured",
+                        help="Configured embedding backend, or an offline hashing embedding")
+    args = parser.parse_args()
+
+    splitter = create_text_splitter()
+    chunks = splitter.create_documents([ANESTHESIA_KNOWLEDGE_EN])
+    embedding = HashingEmbeddings() if args.embeddings == "hashing" else create_embeddings()
+
+    print("📊 Retrieval evaluation")
+    print("=" * 60)
+    print(f"{len(chunks)} chunks, k={args.k}, embeddings={args.embeddings}")
+    vectorstore = NumpyVectorIndex.from_documents(chunks, embedding)
+    bm25 = BM25Index(chunks)
+
+    languages = list(COMMON_QUESTIONS) if args.language == "all" else [args.language]
+    for language in languages:
+        print(f"\n{language} ({len(COMMON_QUESTIONS[language])} questions)")
+        for mode in MODES:
+            recall, hit_rate, mean_ms, p95_ms = evaluate(vectorstore, bm25, chunks, language, mode, args.k)
+            print(f"  {mode:<7} recall@{args.k} {recall:5.2f}   hit {hit_rate:5.2f}   "
+                  f"mean {mean_ms:7.2f} ms   p95 {p95_ms:7.2f} ms")
+        top_hit, top_tokens, packed_hit, packed_tokens = evaluate_context(vectorstore, bm25, language, args.k)
+        print(f"  context top-{args.k} hit {top_hit:5.2f} {top_tokens:6.1f} tokens -> "
+              f"packed hit {packed_hit:5.2f} {packed_tokens:6.1f} tokens (budget {settings.RAG_CONTEXT_TOKENS})")
+
+    wrong = evaluate_follow_ups()
+    print(f"\nfollow-up detection {len(FOLLOW_UP_CASES) - len(wrong)}/{len(FOLLOW_UP_CASES)} correct")
+    for question, language, expected in wrong:
+        print(f"  ❌ [{language}] {question!r}: expected {'follow-up' if expected else 'standalone'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""
+Bulk Export Script
+Streams patients, medical histories, surgery records or guidelines to NDJSON/CSV
+
+Usage:
+    python scripts/export_data.py patients --out patients.ndjson
+    python scripts/export_data.py guidelines --format csv --updated-since 2024-01-01 --out guidelines.csv
+"""
+
+import argparse
+import sys
+import os
+from datetime import datetime
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.export_service import EXPORT_MODELS, EXPORT_FORMATS, DEFAULT_BATCH_SIZE, export_stream
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream table exports as NDJSON or CSV")
+    parser.add_argument("entity", choices=list(EXPORT_MODELS), help="What to export")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson", help="Output format")
+    parser.add_argument("--out", help="Output file (stdout by default)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows fetched per round trip")
+    parser.add_argument("--updated-since", type=datetime.fromisoformat, help="Only rows updated at or after this time")
+    args = parser.parse_args()
+
+    out = open(args.out, "w", encoding="utf-8", newline="") if args.out else sys.stdout
+    try:
+        for chunk in export_stream(args.entity, args.format, args.batch_size, args.updated_since):
+            out.write(chunk)
+    finally:
+        if args.out:
+            out.close()
+            print(f"✅ Exported {args.entity} to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
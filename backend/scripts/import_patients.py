@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Bulk Patient Import Script
+Streams a CSV or NDJSON file into the patients table in batches
+
+Usage:
+    python scripts/import_patients.py patients.csv
+    python scripts/import_patients.py patients.ndjson --batch-size 2000 --errors-out errors.ndjson
+"""
+
+import argparse
+import json
+import sys
+import os
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.services.patient_import_service import (
+    SUPPORTED_FORMATS, DEFAULT_BATCH_SIZE, detect_format, iter_records, import_patients
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import patients from CSV or NDJSON")
+    parser.add_argument("path", help="Input file")
+    parser.add_argument("--format", choices=SUPPORTED_FORMATS, help="Input format (detected from extension by default)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per insert batch")
+    parser.add_argument("--errors-out", help="Write rejected rows to this NDJSON file")
+    args = parser.parse_args()
+
+    import_format = args.format or detect_format(args.path)
+    if import_format is None:
+        print(f"❌ Cannot detect format of {args.path}, please pass --format")
+        sys.exit(1)
+
+    print(f"📥 Importing {args.path} ({import_format}, batch size {args.batch_size})...")
+
+    db = SessionLocal()
+    try:
+        with open(args.path, encoding="utf-8-sig", newline="") as stream:
+            report = import_patients(db, iter_records(stream, import_format), batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    result = report.to_dict()
+    print(f"✅ Rows read:   {result['total_rows']}")
+    print(f"✅ Created:     {result['created']}")
+    print(f"⚠️  Duplicates: {result['duplicates']}")
+    print(f"❌ Failed:      {result['failed']}")
+
+    if args.errors_out and result["errors"]:
+        with open(args.errors_out, "w", encoding="utf-8") as out:
+            for error in result["errors"]:
+                out.write(json.dumps(error, ensure_ascii=False) + "\n")
+        suffix = " (truncated)" if result["errors_truncated"] else ""
+        print(f"📝 Errors written to {args.errors_out}{suffix}")
+
+
+if __name__ == "__main__":
+    main()
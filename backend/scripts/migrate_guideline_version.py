@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add the version column to anesthesia guidelines
+(bumped on every update; used to version cached guideline responses)
+"""
+
+import sys
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, inspect, text
+from app.core.config import settings
+from loguru import logger
+
+
+def migrate_database():
+    """Add version column to anesthesia_guidelines table"""
+    try:
+        engine = create_engine(settings.DATABASE_URL)
+        columns = {column["name"] for column in inspect(engine).get_columns("anesthesia_guidelines")}
+
+        if "version" in columns:
+            logger.info("Version column already exists in anesthesia_guidelines table")
+            return
+
+        with engine.begin() as conn:
+            logger.info("Adding version column to anesthesia_guidelines table...")
+            conn.execute(text("""
+                ALTER TABLE anesthesia_guidelines
+                ADD COLUMN version INTEGER NOT NULL DEFAULT 1
+            """))
+        logger.info("Successfully added version column to anesthesia_guidelines table")
+
+    except Exception as e:
+        logger.error(f"Error during migration: {str(e)}")
+        raise
+
+
+def rollback_migration():
+    """Rollback the version column addition"""
+    try:
+        engine = create_engine(settings.DATABASE_URL)
+
+        with engine.begin() as conn:
+            logger.info("Rolling back version column from anesthesia_guidelines table...")
+            conn.execute(text("ALTER TABLE anesthesia_guidelines DROP COLUMN version"))
+        logger.info("Successfully rolled back version column from anesthesia_guidelines table")
+
+    except Exception as e:
+        logger.error(f"Error during rollback: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Database migration for guideline versions")
+    parser.add_argument("--rollback", action="store_true", help="Rollback the migration")
+
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        migrate_database()
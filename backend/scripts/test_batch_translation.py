@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+Batched Subtitle Translation Check
+Asserts TranslationService._parse_numbered_output and translate_batch on
+model outputs that do not line up with the prompt: missing, duplicate and
+out-of-range numbers, segments spread over several lines, <br> line-break
+markers and lost [TERM_X] placeholders. A scripted stand-in returns the model
+output, so no LLM or database is needed.
+
+Usage:
+    python scripts/test_batch_translation.py
+"""
+
+import os
+import sys
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.translation_service import TranslationService
+
+failures = 0
+
+
+def check(label, actual, expected):
+    global failures
+    ok = actual == expected
+    failures += not ok
+    print(f"{'✅' if ok else '❌'} {label}: {actual!r}" + ("" if ok else f" (expected {expected!r})"))
+
+
+class ScriptedLLM:
+    """Returns the given outputs in order and records every prompt"""
+
+    def __init__(self, *outputs: str):
+        self.outputs = list(outputs)
+        self.prompts = []
+
+    def invoke(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return self.outputs.pop(0)
+
+
+def build_service(llm=None):
+    service = TranslationService.__new__(TranslationService)
+    service.llm = llm
+    service.translation_memory = None
+    service.terminology_cache = {
+        "epidural": {'en': "epidural", 'zh': "硬膜外", 'es': None, 'ja': None, 'fr': None},
+    }
+    service.build_terminology_matcher()
+    return service
+
+
+def check_parse():
+    print("🔍 _parse_numbered_output")
+    parse = build_service()._parse_numbered_output
+
+    check("aligned", parse("1. 一\n2. 二\n3. 三", 3), {1: "一", 2: "二", 3: "三"})
+    check("number formats", parse("[1] 一\n2) 二\n3：三\n4、四", 4), {1: "一", 2: "二", 3: "三", 4: "四"})
+    check("preamble before the first number ignored", parse("Here is the translation:\n1. 一\n2. 二", 2), {1: "一", 2: "二"})
+    check("multi-line segment joined", parse("1. 第一行\n  第二行\n\n2. 二", 2), {1: "第一行 第二行", 2: "二"})
+    check("missing number left out", parse("1. 一\n3. 三", 3), {1: "一", 3: "三"})
+    check("duplicate number dropped", parse("1. 一\n1. 又一\n2. 二", 2), {2: "二"})
+    check("out-of-range number and its continuation dropped", parse("1. 一\n2. 二\n3. 多餘\n續行", 2), {1: "一", 2: "二"})
+    check("note and output lines skipped", parse("1. 一\nNote: kept literal\n2. 二\nOutput: x", 2), {1: "一", 2: "二"})
+    check("inline note removed", parse("1. 一 (Note: polite form)\n2. 二", 2), {1: "一", 2: "二"})
+    check("digits inside a segment kept", parse("1. 2 顆藥\n2. 10 分鐘", 2), {1: "2 顆藥", 2: "10 分鐘"})
+    check("<br> marker kept for the caller", parse("1. 一 <br> 二", 1), {1: "一 <br> 二"})
+    check("empty output", parse("", 2), {})
+
+
+def check_translate_batch():
+    print("\n🔍 translate_batch")
+
+    llm = ScriptedLLM("1. 第一行 <br> 第二行\n2. 不要吃東西。")
+    results = build_service(llm).translate_batch(["Line one\nline two", "Do not eat."], "zh-TW")
+    check("one prompt for the batch", len(llm.prompts), 1)
+    check("segment kept on one prompt line", "1. Line one <br> line two" in llm.prompts[0], True)
+    check("<br> restored to a line break", [result['text'] for result in results], ["第一行\n第二行", "不要吃東西。"])
+
+    llm = ScriptedLLM("1. 第一行<br>第二行\n2. 二")
+    results = build_service(llm).translate_batch(["Line one\nline two", "Two"], "zh-TW")
+    check("<br> without spaces restored", results[0]['text'], "第一行\n第二行")
+
+    llm = ScriptedLLM("1. 一\n3. 三", "二")
+    results = build_service(llm).translate_batch(["One", "Two", "Three"], "zh-TW")
+    check("missing segment retried alone", [result['text'] for result in results], ["一", "二", "三"])
+    check("retry prompt holds only that segment", "Two" in llm.prompts[1] and "Three" not in llm.prompts[1], True)
+
+    llm = ScriptedLLM("1. [TERM_0] 有幫助\n2. 二")
+    results = build_service(llm).translate_batch(["An epidural helps.", "Two"], "zh-TW")
+    check("placeholder restored", results[0]['text'], "硬膜外 有幫助")
+
+    llm = ScriptedLLM("1. 這很有幫助\n2. 二", "[TERM_0] 有幫助")
+    results = build_service(llm).translate_batch(["An epidural helps.", "Two"], "zh-TW")
+    check("lost placeholder retried alone", (results[0]['text'], len(llm.prompts)), ("硬膜外 有幫助", 2))
+
+    llm = ScriptedLLM("1. 你好\n2. 再見")
+    results = build_service(llm).translate_batch(["Hello", "hello ", "Bye"], "zh-TW")
+    check("repeated segment translated once", [result['text'] for result in results], ["你好", "你好", "再見"])
+    check("repeated segment sent once", "Output exactly 2 lines" in llm.prompts[0], True)
+
+    llm = ScriptedLLM("1. 一\n2. 二", "三")
+    results = build_service(llm).translate_batch(["One", "Two", "Three"], "zh-TW", max_segments=2)
+    check("batches split by max_segments", ([result['text'] for result in results], len(llm.prompts)), (["一", "二", "三"], 2))
+
+    results = build_service().translate_batch(["One"], "zh-TW")
+    check("no LLM", results[0]['text'], "[Translation service not available]")
+
+
+def main():
+    check_parse()
+    check_translate_batch()
+    print("=" * 50)
+    print(f"{'✅ All checks passed' if not failures else f'❌ {failures} check(s) failed'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Guideline Cache Regression Check
+Updates a guideline twice within the same second and checks that both
+GET /guidelines/{id} and GET /guidelines/{id}/group return the new content
+instead of a stale precompressed response. Runs in-process against a
+temporary SQLite database; no server or LLM is needed.
+
+Usage:
+    python scripts/test_guideline_cache.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date
+
+# Point the app at a throwaway database before it is imported
+DB_PATH = os.path.join(tempfile.mkdtemp(), "guideline_cache.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("RAG_WARMUP_ON_STARTUP", "false")
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.core.database import Base, engine, SessionLocal
+from app.main import app
+from app.models.anesthesia import AnesthesiaGuideline
+from app.models.patient import Patient
+
+BASE_URL = "/api/v1/anesthesia/guidelines"
+
+CONTENT = {
+    "anesthesia_type": "general",
+    "surgery_date": date(2024, 1, 15),
+    "anesthesia_type_info": "General anesthesia",
+    "surgery_process": "Process",
+    "expected_sensations": "Sensations",
+    "potential_risks": "Risks",
+    "pre_surgery_instructions": "Before surgery",
+    "fasting_instructions": "Fasting",
+    "medication_instructions": "Medication",
+    "common_questions": "Questions",
+    "post_surgery_care": "After surgery",
+}
+
+
+def seed_group():
+    """Create one patient with an English guideline and its Chinese translation"""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        patient = Patient(
+            health_insurance_number="1234567890",
+            full_name="John Smith",
+            date_of_birth=date(1985, 5, 15),
+            gender="male"
+        )
+        db.add(patient)
+        db.commit()
+
+        english = AnesthesiaGuideline(patient_id=patient.id, language="en", surgery_name="Sen", **CONTENT)
+        db.add(english)
+        db.commit()
+        english.group_id = english.id
+        chinese = AnesthesiaGuideline(
+            patient_id=patient.id, language="zh", surgery_name="Szh", group_id=english.id, **CONTENT
+        )
+        db.add(chinese)
+        db.commit()
+        return english.id, chinese.id
+    finally:
+        db.close()
+
+
+def main():
+    english_id, chinese_id = seed_group()
+    client = TestClient(app)
+    failures = 0
+
+    def check(label, actual, expected):
+        nonlocal failures
+        ok = actual == expected
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {label}: {actual!r} (expected {expected!r})")
+
+    # Warm the precompressed cache with the original content
+    check("single before update", client.get(f"{BASE_URL}/{chinese_id}").json()["surgery_name"], "Szh")
+    check("group before update", client.get(f"{BASE_URL}/{english_id}/group").json()["translations"]["zh"]["surgery_name"], "Szh")
+
+    # Both updates normally land within the same second as the cached reads
+    for name in ("NEW", "NEWER"):
+        response = client.put(f"{BASE_URL}/{chinese_id}", json={"surgery_name": name})
+        check(f"PUT {name}", response.status_code, 200)
+        check(f"single after {name}", client.get(f"{BASE_URL}/{chinese_id}").json()["surgery_name"], name)
+        group = client.get(f"{BASE_URL}/{english_id}/group").json()
+        check(f"group after {name}", group["translations"]["zh"]["surgery_name"], name)
+
+    # Deleting a translation drops it from the group document
+    check("DELETE zh", client.delete(f"{BASE_URL}/{chinese_id}").status_code, 204)
+    group = client.get(f"{BASE_URL}/{english_id}/group").json()
+    check("group after delete", sorted(group["translations"]), ["en"])
+
+    print("=" * 50)
+    print(f"{'✅ All checks passed' if not failures else f'❌ {failures} check(s) failed'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""
+Terminology Matching Check
+Asserts the Aho-Corasick matcher (app.utils.aho_corasick) and
+TranslationService.apply_terminology on their edge cases: overlapping
+patterns, leftmost-longest selection, whole-word / word-start boundaries,
+case folding, CJK text and shared placeholders. No LLM or database is needed.
+
+Usage:
+    python scripts/test_terminology_matching.py
+"""
+
+import os
+import sys
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.translation_service import TranslationService
+from app.utils.aho_corasick import AhoCorasick
+
+TERMS = {
+    "anesthesia": "麻醉",
+    "general anesthesia": "全身麻醉",
+    "epidural": "硬膜外",
+    "epidural anesthesia": "硬膜外麻醉",
+    "nausea": "噁心",
+    "iv": "靜脈注射",
+}
+
+failures = 0
+
+
+def check(label, actual, expected):
+    global failures
+    ok = actual == expected
+    failures += not ok
+    print(f"{'✅' if ok else '❌'} {label}: {actual!r}" + ("" if ok else f" (expected {expected!r})"))
+
+
+def spans(text, matches):
+    return [text[start:end] for start, end, _ in matches]
+
+
+def build_service():
+    service = TranslationService.__new__(TranslationService)
+    service.llm = None
+    service.translation_memory = None
+    service.terminology_cache = {
+        term: {'en': term, 'zh': translation, 'es': None, 'ja': None, 'fr': None}
+        for term, translation in TERMS.items()
+    }
+    service.build_terminology_matcher()
+    return service
+
+
+def check_matcher():
+    print("🔍 AhoCorasick")
+    classic = AhoCorasick((word, word) for word in ("he", "she", "his", "hers"))
+    text = "ushers"
+    check("overlapping matches", sorted(spans(text, classic.find_all(text))), ["he", "hers", "she"])
+
+    matcher = AhoCorasick((term, term) for term in TERMS)
+    text = "General anesthesia or epidural anesthesia?"
+    check("leftmost-longest", spans(text, matcher.find_longest(text)), ["General anesthesia", "epidural anesthesia"])
+    check("all overlapping terms", sorted(spans(text, matcher.find_all(text, boundary="word"))),
+          sorted(["General anesthesia", "anesthesia", "epidural", "epidural anesthesia", "anesthesia"]))
+
+    chained = AhoCorasick((term, term) for term in ("spinal block", "block anesthesia"))
+    text = "spinal block anesthesia"
+    check("leftmost match wins over a longer later one", spans(text, chained.find_longest(text)), ["spinal block"])
+
+    text = "Feeling nauseated, not nausea."
+    check("whole word only", spans(text, matcher.find_longest(text, boundary="word")), ["nausea"])
+    text = "Give the IV drip via an ivory line"
+    check("short term not inside words", spans(text, matcher.find_longest(text)), ["IV"])
+
+    prefixes = AhoCorasick([("allerg", "allergy")])
+    text = "Any allergies? hyperallergic"
+    check("word-start boundary", spans(text, prefixes.find_all(text, boundary="start")), ["allerg"])
+    check("substring without boundary", len(prefixes.find_all(text)), 2)
+
+    text = "EPIDURAL, then Epidural."
+    check("case-insensitive, original offsets", spans(text, matcher.find_longest(text)), ["EPIDURAL", "Epidural"])
+    cased = AhoCorasick([("IV", "iv")], ignore_case=False)
+    check("case-sensitive mode", spans("iv IV", cased.find_all("iv IV", boundary="word")), ["IV"])
+
+    cjk = AhoCorasick([("麻醉", "anesthesia")])
+    text = "全身麻醉很安全"
+    check("CJK has no word boundaries", spans(text, cjk.find_longest(text, boundary="word")), ["麻醉"])
+
+    shared = AhoCorasick([("pain", "category"), ("PAIN", "doctor")])
+    check("one keyword, several values", shared.find_all("pain")[0][2], ["category", "doctor"])
+    check("empty pattern ignored", len(AhoCorasick([("", "x"), ("a", "a")])), 1)
+    check("no match", matcher.find_longest("Nothing to see here"), [])
+
+
+def check_apply_terminology():
+    print("\n🔍 TranslationService.apply_terminology")
+    service = build_service()
+
+    text, terms = service.apply_terminology("Epidural anesthesia or an epidural.", "zh")
+    check("longest term replaced", text, "[TERM_0] or an [TERM_1].")
+    check("terms and translations", terms, [
+        {'en': "epidural anesthesia", 'translation': "硬膜外麻醉"},
+        {'en': "epidural", 'translation': "硬膜外"},
+    ])
+
+    text, terms = service.apply_terminology("Nausea after anesthesia; nausea again.", "zh")
+    check("same term shares a placeholder", text, "[TERM_0] after [TERM_1]; [TERM_0] again.")
+
+    text, shared = service.apply_terminology("Nausea is common.", "zh")
+    text, shared = service.apply_terminology("Anesthesia and nausea.", "zh", shared)
+    check("batch numbering continues", text, "[TERM_1] and [TERM_0].")
+    check("batch term list", [term['en'] for term in shared], ["nausea", "anesthesia"])
+
+    text, terms = service.apply_terminology("An epidural helps.", "ja")
+    check("language without translations untouched", (text, terms), ("An epidural helps.", []))
+
+
+def main():
+    check_matcher()
+    check_apply_terminology()
+    print("=" * 50)
+    print(f"{'✅ All checks passed' if not failures else f'❌ {failures} check(s) failed'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Translate Knowledge Base
+Translates the knowledge chunks (built-in knowledge base + knowledge directory)
+into the languages that get their own vector store. Only chunks without a
+translation are sent to the LLM; translations of removed chunks are dropped.
+
+Run POST /api/v1/qa/admin/reingest (or restart) afterwards to load the new
+translations.
+
+Usage:
+    python scripts/translate_knowledge.py
+    python scripts/translate_knowledge.py --language fr
+"""
+
+import argparse
+import sys
+import os
+import time
+from pathlib import Path
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.knowledge_ingestion import collect_sources, split_sources
+from app.services.knowledge_translation import translate_missing, translations_path
+from app.services.translation_service import TranslationService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Translate knowledge chunks for per-language vector stores")
+    parser.add_argument("--language", action="append", choices=settings.knowledge_languages,
+                        help="Only this language (repeatable, all RAG_KNOWLEDGE_LANGUAGES by default)")
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).parent.parent.parent
+    knowledge_dir = Path(settings.RAG_KNOWLEDGE_DIR) if settings.RAG_KNOWLEDGE_DIR else base_dir / "data" / "knowledge"
+    documents = split_sources(collect_sources(knowledge_dir))
+
+    service = TranslationService(model_name=settings.RAG_LLM_MODEL)
+    if not service.llm:
+        print("❌ Translation service is not available. Make sure Ollama is running.")
+        sys.exit(1)
+    db = SessionLocal()
+    try:
+        service.load_terminology(db)
+    finally:
+        db.close()
+
+    for language in args.language or settings.knowledge_languages:
+        print(f"\n🌐 {language}: {len(documents)} chunks")
+        start = time.perf_counter()
+        translated = translate_missing(
+            documents, language,
+            lambda text, lang: service.translate(text, lang),
+            progress=lambda done, total: print(f"  {done}/{total}", end="\r")
+        )
+        print(f"✅ Translated {translated} chunks in {time.perf_counter() - start:.1f}s -> {translations_path(language)}")
+
+
+if __name__ == "__main__":
+    main()
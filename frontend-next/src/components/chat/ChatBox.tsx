@@ -39,9 +39,12 @@ export default function ChatBox({ language }: ChatBoxProps) {
   const [loading, setLoading] = useState(false);
   const [commonQuestions, setCommonQuestions] = useState<string[]>([]);
   const messagesEndRef = useRef<HTMLDivElement>(null);
+  // Server-side chat session, so follow-up questions keep their context
+  const sessionIdRef = useRef<string | null>(null);
 
   useEffect(() => {
     loadCommonQuestions();
+    sessionIdRef.current = null;
   }, [language]);
 
   useEffect(() => {
@@ -75,48 +78,92 @@ export default function ChatBox({ language }: ChatBoxProps) {
     setInput('');
     setLoading(true);
 
+    const assistantId = (Date.now() + 1).toString();
+    const updateAssistant = (patch: Partial<Message>) => {
+      setMessages((prev) =>
+        prev.map((m) => (m.id === assistantId ? { ...m, ...patch } : m))
+      );
+    };
+
     try {
-      const response = await fetch(`${API_BASE}/api/qa/ask`, {
+      const response = await fetch(`${API_BASE}/api/qa/ask/stream`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          Accept: 'text/event-stream',
         },
         body: JSON.stringify({
           question,
           language,
+          // An empty id starts a new session
+          session_id: sessionIdRef.current ?? '',
         }),
       });
 
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         throw new Error('Failed to get answer');
       }
 
-      const data = await response.json();
+      // Show the assistant bubble right away and fill it as tokens arrive
+      setMessages((prev) => [
+        ...prev,
+        { id: assistantId, type: 'assistant', content: '' },
+      ]);
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let content = '';
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
 
-      const assistantMessage: Message = {
-        id: (Date.now() + 1).toString(),
-        type: 'assistant',
-        content: data.answer,
-        needsDoctor: data.needs_doctor,
-        category: data.category,
-        confidence: data.confidence,
-        suggestedAction: data.suggested_action,
-      };
-
-      setMessages((prev) => [...prev, assistantMessage]);
+        // Server-Sent Events are separated by a blank line
+        const events = buffer.split('\n\n');
+        buffer = events.pop() || '';
+
+        for (const raw of events) {
+          const eventLine = raw.split('\n').find((l) => l.startsWith('event: '));
+          const dataLine = raw.split('\n').find((l) => l.startsWith('data: '));
+          if (!eventLine || !dataLine) continue;
+          const event = eventLine.slice('event: '.length);
+          const data = JSON.parse(dataLine.slice('data: '.length));
+
+          if (event === 'meta') {
+            if (data.session_id) {
+              sessionIdRef.current = data.session_id;
+            }
+            updateAssistant({
+              needsDoctor: data.needs_doctor,
+              category: data.category,
+              confidence: data.confidence,
+              suggestedAction: data.suggested_action,
+            });
+          } else if (event === 'token') {
+            content += data.text;
+            updateAssistant({ content });
+          } else if (event === 'error') {
+            throw new Error(data.message);
+          }
+        }
+      }
     } catch (error) {
       console.error('Error sending message:', error);
-      const errorMessage: Message = {
-        id: (Date.now() + 1).toString(),
-        type: 'assistant',
-        content: 'Sorry, I encountered an error. Please try again.',
-      };
-      setMessages((prev) => [...prev, errorMessage]);
+      const errorContent = 'Sorry, I encountered an error. Please try again.';
+      setMessages((prev) =>
+        prev.some((m) => m.id === assistantId)
+          ? prev.map((m) => (m.id === assistantId ? { ...m, content: errorContent } : m))
+          : [...prev, { id: assistantId, type: 'assistant', content: errorContent }]
+      );
     } finally {
       setLoading(false);
     }
   };
 
+  const lastMessage = messages[messages.length - 1];
+
   const handleSubmit = (e: React.FormEvent) => {
     e.preventDefault();
     sendMessage(input);
@@ -198,7 +245,7 @@ export default function ChatBox({ language }: ChatBoxProps) {
               </div>
             </div>
           ))}
-          {loading && (
+          {loading && !(lastMessage?.type === 'assistant' && lastMessage.content) && (
             <div className="flex justify-start">
               <div className="bg-muted rounded-lg px-4 py-2">
                 <Loader2 className="h-4 w-4 animate-spin" />
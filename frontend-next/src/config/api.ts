@@ -14,6 +14,7 @@ export const QUERY_KEYS = {
     all: ['guidelines'] as const,
     list: (page?: number) => ['guidelines', 'list', page] as const,
     detail: (id: number, language?: string) => ['guidelines', 'detail', id, language] as const,
+    group: (id: number) => ['guidelines', 'group', id] as const,
     byPatient: (patientId: number, language?: string) => ['guidelines', 'patient', patientId, language] as const,
   },
   medicalHistory: {
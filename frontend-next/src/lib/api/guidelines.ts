@@ -1,6 +1,7 @@
 import { apiClient } from './client';
 import type {
   AnesthesiaGuideline,
+  AnesthesiaGuidelineGroup,
   GuidelineGenerateRequest,
   AnesthesiaTemplate,
   PaginatedResponse,
@@ -38,6 +39,14 @@ export const guidelinesApi = {
     return data;
   },
 
+  // Get every language version of a guideline in one request
+  getGroup: async (id: number) => {
+    const { data } = await apiClient.get<AnesthesiaGuidelineGroup>(
+      `/anesthesia/guidelines/${id}/group`
+    );
+    return data;
+  },
+
   // Update guideline
   update: async (id: number, guideline: Partial<AnesthesiaGuideline>) => {
     const { data } = await apiClient.put<AnesthesiaGuideline>(
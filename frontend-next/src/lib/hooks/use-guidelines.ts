@@ -1,7 +1,11 @@
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { guidelinesApi } from '@/lib/api/guidelines';
 import { QUERY_KEYS } from '@/config/api';
-import type { GuidelineGenerateRequest } from '@/types';
+import type {
+  AnesthesiaGuideline,
+  AnesthesiaGuidelineGroup,
+  GuidelineGenerateRequest,
+} from '@/types';
 
 // Guidelines
 export const useGuidelines = (page = 1, size = 100) => {
@@ -11,10 +15,23 @@ export const useGuidelines = (page = 1, size = 100) => {
   });
 };
 
+// Pick one language out of a guideline group
+const selectTranslation = (
+  group: AnesthesiaGuidelineGroup,
+  language?: string
+): AnesthesiaGuideline | undefined => {
+  const { translations, requested_language, ...shared } = group;
+  const translation = translations[language ?? requested_language];
+  if (!translation) return undefined;
+  return { ...shared, ...translation };
+};
+
+// All languages are fetched once; switching language is resolved client-side
 export const useGuideline = (id: number, language?: string) => {
   return useQuery({
-    queryKey: QUERY_KEYS.guidelines.detail(id, language),
-    queryFn: () => guidelinesApi.getById(id, language),
+    queryKey: QUERY_KEYS.guidelines.group(id),
+    queryFn: () => guidelinesApi.getGroup(id),
+    select: (group) => selectTranslation(group, language),
     enabled: !!id,
   });
 };
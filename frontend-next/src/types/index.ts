@@ -78,6 +78,39 @@ export interface AnesthesiaGuideline {
   patient?: Patient;
 }
 
+export type AnesthesiaGuidelineTranslation = Pick<
+  AnesthesiaGuideline,
+  | 'id'
+  | 'language'
+  | 'surgery_name'
+  | 'anesthesia_type_info'
+  | 'surgery_process'
+  | 'expected_sensations'
+  | 'potential_risks'
+  | 'pre_surgery_instructions'
+  | 'fasting_instructions'
+  | 'medication_instructions'
+  | 'common_questions'
+  | 'post_surgery_care'
+  | 'additional_notes'
+  | 'is_generated'
+  | 'generation_notes'
+  | 'created_at'
+  | 'updated_at'
+>;
+
+export interface AnesthesiaGuidelineGroup {
+  group_id?: number;
+  requested_id: number;
+  requested_language: string;
+  patient_id: number;
+  anesthesia_type: string;
+  surgery_date: string;
+  surgeon_name: string;
+  anesthesiologist_name: string;
+  translations: Record<string, AnesthesiaGuidelineTranslation>;
+}
+
 export interface AnesthesiaTemplate {
   id: number;
   template_name: string;